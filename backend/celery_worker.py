@@ -1,14 +1,19 @@
 """
 Celery worker configuration for background task processing.
 """
+import logging
 import os
+import sys
 from celery import Celery
+from celery.signals import task_postrun, worker_init
 from dotenv import load_dotenv
-from src.lib.database import DatabaseManager
+from src.lib.database import DatabaseManager, ScopedSession
 
 # Load environment variables from .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Redis connection configuration
 REDIS_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/1")
 
@@ -21,6 +26,7 @@ celery_app = Celery(
         "src.tasks.trending_tasks",
         "src.tasks.script_tasks",
         "src.tasks.media_tasks",
+        "src.tasks.cleanup_tasks",
     ]
 )
 
@@ -33,16 +39,24 @@ celery_app.conf.update(
     timezone='UTC',
     enable_utc=True,
 
-    # Task routing and queues
+    # Task routing and queues, matched against the names tasks are registered under.
+    # Script and trending tasks only wait on Gemini/YouTube HTTP calls, Redis and the
+    # database, so their queues can run on a gevent pool with high concurrency:
+    #   celery -A celery_worker worker -Q script,trending -P gevent --concurrency=200
+    # Media tasks render with FFmpeg and PIL and stay on the prefork pool (see below)
     task_routes={
-        'src.tasks.trending_tasks.*': {'queue': 'trending'},
-        'src.tasks.script_tasks.*': {'queue': 'script'},
-        'src.tasks.media_tasks.*': {'queue': 'media'},
+        'trending_tasks.*': {'queue': 'trending'},
+        'script_tasks.*': {'queue': 'script'},
+        'media_tasks.*': {'queue': 'media'},
     },
 
     # Worker settings
+    # Media and cleanup tasks run for seconds to minutes, so each worker process reserves
+    # only the task it is running; start workers with -Ofair so idle processes get work:
+    #   celery -A celery_worker worker -Q media,celery -Ofair --concurrency=N
     worker_prefetch_multiplier=1,
     task_acks_late=True,
+    task_reject_on_worker_lost=True,
     worker_max_tasks_per_child=50,
 
     # Result backend settings
@@ -85,6 +99,29 @@ def setup_periodic_tasks(sender, **kwargs):
         name='cleanup expired tasks'
     )
 
+@worker_init.connect
+def make_database_driver_cooperative(**kwargs):
+    """On a gevent pool, let psycopg2 queries yield to other tasks instead of blocking the worker"""
+    if "gevent" not in sys.modules:
+        return
+
+    from gevent import monkey
+    if not monkey.is_module_patched("socket"):
+        return
+
+    try:
+        from psycogreen.gevent import patch_psycopg
+    except ImportError:
+        logger.warning("psycogreen is not installed; database calls will block the gevent pool")
+        return
+
+    patch_psycopg()
+
+@task_postrun.connect
+def release_scoped_session(**kwargs):
+    """Return the task's scoped database session to the pool"""
+    ScopedSession.remove()
+
 @celery_app.task
 def cleanup_expired_tasks():
     """Clean up expired task results and session data"""
@@ -11,7 +11,7 @@ from src.api import trending, scripts, media, videos, sessions, tasks, websocket
 from src.api import video_generation, video_serving, job_management, media_assets
 from src.api import content_planning, media_browsing
 from src.lib.middleware import setup_middleware
-from src.lib.database import DatabaseManager
+from src.lib.database import DatabaseManager, session_scope
 from src.lib.tasks import task_manager
 from src.lib.storage import storage_manager
 from src.config.static_files import configure_static_file_serving
@@ -41,6 +41,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def release_scoped_session(request, call_next):
+    """Scope standalone service sessions to the request and return them to the pool afterwards"""
+    with session_scope():
+        return await call_next(request)
+
+
 # Include API routers
 app.include_router(trending.router, tags=["trending"])
 app.include_router(scripts.router, tags=["scripts"])
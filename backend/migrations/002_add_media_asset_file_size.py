@@ -0,0 +1,26 @@
+"""
+Add file_size to media_assets
+
+Revision ID: 002_media_asset_file_size
+Revises: 001_video_generation
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '002_media_asset_file_size'
+down_revision = '001_video_generation'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the recorded on-disk size of each media asset file."""
+    op.add_column('media_assets', sa.Column('file_size', sa.BigInteger(), nullable=True))
+
+
+def downgrade():
+    """Remove media asset file sizes."""
+    op.drop_column('media_assets', 'file_size')
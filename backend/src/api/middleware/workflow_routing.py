@@ -1,6 +1,7 @@
 from fastapi import Request, HTTPException
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 import logging
+import time
 
 from ...services.workflow_engine import WorkflowEngine
 from ...services.workflow_mode_service import WorkflowModeService
@@ -8,6 +9,13 @@ from ...models.workflow import WorkflowModeEnum
 
 logger = logging.getLogger(__name__)
 
+# Bursts of requests for one workflow reuse its routing state for a few seconds
+ROUTING_STATE_TTL = 5
+ROUTING_STATE_CACHE_SIZE = 1024
+
+# workflow_id -> (monotonic read time, mode/status/skip flags row)
+_routing_state_cache: Dict[str, Tuple[float, Any]] = {}
+
 
 class WorkflowRoutingMiddleware:
     """Middleware for handling workflow-based routing and access control"""
@@ -31,8 +39,8 @@ class WorkflowRoutingMiddleware:
             return None
 
         try:
-            # Get workflow information
-            workflow = self.workflow_service.get_workflow(workflow_id)
+            # Get workflow routing state
+            workflow = self._get_routing_state(workflow_id)
             if not workflow:
                 logger.warning(f"Workflow not found: {workflow_id}")
                 return None
@@ -63,6 +71,22 @@ class WorkflowRoutingMiddleware:
             # Don't block request on middleware errors
             return None
 
+    def _get_routing_state(self, workflow_id: str):
+        """Mode, status and skip flags of a workflow, reused while younger than ROUTING_STATE_TTL"""
+        now = time.monotonic()
+        cached = _routing_state_cache.get(workflow_id)
+        if cached and now - cached[0] < ROUTING_STATE_TTL:
+            return cached[1]
+
+        state = self.workflow_service.get_routing_state(workflow_id)
+        if state is not None:
+            if len(_routing_state_cache) >= ROUTING_STATE_CACHE_SIZE:
+                # Evict the oldest entry
+                _routing_state_cache.pop(next(iter(_routing_state_cache)), None)
+            _routing_state_cache.pop(workflow_id, None)
+            _routing_state_cache[workflow_id] = (now, state)
+        return state
+
     def _extract_workflow_context(self, request: Request) -> Optional[Dict[str, Any]]:
         """Extract workflow context from request"""
 
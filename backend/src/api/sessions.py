@@ -5,7 +5,12 @@ import uuid
 import logging
 
 from ..services.session_service import SessionService, get_session_service
-from ..services.ui_state_service import UIStateService, get_ui_state_service
+from ..services.ui_state_service import (
+    UIStateService,
+    AsyncUIStateService,
+    get_ui_state_service,
+    get_async_ui_state_service
+)
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +74,10 @@ def get_ui_state_service_dependency() -> UIStateService:
     return get_ui_state_service()
 
 
+def get_async_ui_state_service_dependency() -> AsyncUIStateService:
+    return get_async_ui_state_service()
+
+
 # Session Management Endpoints
 @router.post("/api/sessions", response_model=CreateSessionResponse, status_code=201)
 async def create_session(
@@ -285,7 +294,7 @@ async def update_workflow_state(
 async def get_ui_state(
     session_id: str,
     component_name: str,
-    ui_state_service: UIStateService = Depends(get_ui_state_service_dependency)
+    ui_state_service: AsyncUIStateService = Depends(get_async_ui_state_service_dependency)
 ):
     """
     Get UI state for a specific component in session
@@ -297,7 +306,7 @@ async def get_ui_state(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-        ui_state = ui_state_service.get_component_state(session_id, component_name)
+        ui_state = await ui_state_service.get_component_state(session_id, component_name)
 
         if not ui_state:
             raise HTTPException(status_code=404, detail="UI state not found")
@@ -318,7 +327,7 @@ async def update_ui_state(
     session_id: str,
     component_name: str,
     request: UpdateUIStateRequest,
-    ui_state_service: UIStateService = Depends(get_ui_state_service_dependency)
+    ui_state_service: AsyncUIStateService = Depends(get_async_ui_state_service_dependency)
 ):
     """
     Update UI state for a specific component in session
@@ -331,11 +340,11 @@ async def update_ui_state(
             raise HTTPException(status_code=400, detail="Invalid session ID format")
 
         # Check if UI state exists, if not create it
-        existing_state = ui_state_service.get_component_state(session_id, component_name)
+        existing_state = await ui_state_service.get_component_state(session_id, component_name)
 
         if existing_state:
             # Update existing state
-            success = ui_state_service.update_component_state(
+            success = await ui_state_service.update_component_state(
                 session_id,
                 component_name,
                 state_updates=request.ui_state,
@@ -343,7 +352,7 @@ async def update_ui_state(
             )
         else:
             # Create new state
-            success = ui_state_service.save_component_state(
+            success = await ui_state_service.save_component_state(
                 session_id,
                 component_name,
                 state_data=request.ui_state or {},
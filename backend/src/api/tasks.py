@@ -11,7 +11,9 @@ import os
 
 from ..services.task_queue_service import (
     TaskQueueService,
+    AsyncTaskQueueService,
     get_task_queue_service,
+    get_async_task_queue_service,
     TaskStatus,
     TaskType,
     TaskPriority
@@ -67,6 +69,10 @@ def get_task_queue_service_dependency() -> TaskQueueService:
     return get_task_queue_service()
 
 
+def get_async_task_queue_service_dependency() -> AsyncTaskQueueService:
+    return get_async_task_queue_service()
+
+
 # Task Management Endpoints
 @router.get("/api/tasks", response_model=TaskListResponse)
 async def list_tasks(
@@ -74,7 +80,7 @@ async def list_tasks(
     status: Optional[str] = Query(None, description="Filter by task status"),
     task_type: Optional[str] = Query(None, description="Filter by task type"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of tasks to return"),
-    task_service: TaskQueueService = Depends(get_task_queue_service_dependency)
+    task_service: AsyncTaskQueueService = Depends(get_async_task_queue_service_dependency)
 ):
     """
     List tasks with optional filtering
@@ -102,7 +108,7 @@ async def list_tasks(
             except ValueError:
                 raise HTTPException(status_code=400, detail="Invalid session ID format")
 
-        tasks = task_service.list_tasks(
+        tasks = await task_service.list_tasks(
             session_id=session_id,
             status=task_status,
             task_type=task_type_enum,
@@ -128,7 +134,7 @@ async def list_tasks(
 @router.get("/api/tasks/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: str,
-    task_service: TaskQueueService = Depends(get_task_queue_service_dependency)
+    task_service: AsyncTaskQueueService = Depends(get_async_task_queue_service_dependency)
 ):
     """
     Get task by ID
@@ -140,7 +146,7 @@ async def get_task(
         except ValueError:
             raise HTTPException(status_code=400, detail="Invalid task ID format")
 
-        task_data = task_service.get_task(task_id)
+        task_data = await task_service.get_task(task_id)
 
         if not task_data:
             raise HTTPException(status_code=404, detail="Task not found")
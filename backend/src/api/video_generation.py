@@ -8,12 +8,13 @@ from typing import Dict, Any, Optional
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
 from pydantic import BaseModel, Field
 from datetime import datetime
+from sqlalchemy import select, union_all
 
 from ..services.video_generation_service import VideoGenerationService, VideoGenerationServiceError
 from ..lib.database import get_db_session
 from ..models.generated_video import GeneratedVideo
 from ..models.video_generation_job import VideoGenerationJob
-from ..tasks.media_tasks import generate_media_from_script, compose_video
+from ..tasks.media_tasks import generate_and_compose
 
 logger = logging.getLogger(__name__)
 
@@ -95,16 +96,15 @@ async def generate_video(
 
             script_uuid = uuid.UUID(request.script_id)
 
-            # Check if script exists
-            uploaded_script = db.query(UploadedScript).filter(
-                UploadedScript.id == script_uuid
+            # Check if script exists, probing uploaded and generated scripts in one round trip
+            script_found = db.execute(
+                union_all(
+                    select(UploadedScript.id).where(UploadedScript.id == script_uuid),
+                    select(VideoScript.id).where(VideoScript.id == script_uuid)
+                ).limit(1)
             ).first()
 
-            video_script = db.query(VideoScript).filter(
-                VideoScript.id == script_uuid
-            ).first()
-
-            if not uploaded_script and not video_script:
+            if script_found is None:
                 raise HTTPException(
                     status_code=404,
                     detail=f"Script {request.script_id} not found"
@@ -268,27 +268,15 @@ async def _execute_video_generation_workflow(
 ):
     """Execute the video generation workflow in background."""
     try:
-        # Step 1: Generate media assets
-        media_result = generate_media_from_script.delay(
+        # Assets are generated into this job and composed in the same worker task
+        generate_and_compose.delay(
             session_id=session_id,
             script_id=script_id,
-            media_options=options
-        )
-
-        # Wait for media generation to complete
-        media_assets = media_result.get()
-
-        if media_assets["status"] != "success":
-            raise Exception(f"Media generation failed: {media_assets}")
-
-        # Step 2: Compose video
-        video_result = compose_video.delay(
-            session_id=session_id,
-            job_id=str(job_id),
-            composition_options=options
+            options=options,
+            job_id=str(job_id)
         )
 
-        # Video composition will complete in background
+        # Video generation will complete in background
         logger.info(f"Video generation workflow initiated for job {job_id}")
 
     except Exception as e:
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Response
 from pydantic import BaseModel
 from typing import Optional
 import logging
 from datetime import datetime
 
+import orjson
+
 from ..services.workflow_mode_service import WorkflowModeService
+from ..services.workflow_engine import WorkflowEngine
 from ..models.workflow import WorkflowModeEnum
 from ..lib.database import get_db
 from sqlalchemy.orm import Session
@@ -59,8 +62,13 @@ def get_workflow_service(db: Session = Depends(get_db)) -> WorkflowModeService:
     return WorkflowModeService(db_session=db)
 
 
+def get_workflow_engine(db: Session = Depends(get_db)) -> WorkflowEngine:
+    """Dependency to get WorkflowEngine"""
+    return WorkflowEngine(db_session=db)
+
+
 @router.post("/api/v1/workflows", response_model=WorkflowCreateResponse, status_code=201)
-async def create_workflow(
+def create_workflow(
     request: WorkflowCreateRequest,
     workflow_service: WorkflowModeService = Depends(get_workflow_service)
 ):
@@ -102,8 +110,37 @@ async def create_workflow(
         )
 
 
+@router.get("/api/v1/workflows")
+def list_workflows(
+    user_id: Optional[str] = None,
+    workflow_engine: WorkflowEngine = Depends(get_workflow_engine)
+):
+    """List the 50 most recent workflows, optionally for a single user"""
+    if user_id:
+        import uuid
+        try:
+            uuid.UUID(user_id)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "error": "invalid_user_id",
+                    "message": "Invalid user ID format",
+                    "timestamp": datetime.utcnow().isoformat()
+                }
+            )
+
+    workflows = workflow_engine.get_available_workflows(user_id)
+
+    # orjson writes the UUIDs and datetimes natively, with no per-row str()/isoformat() or stdlib encoder pass
+    return Response(
+        orjson.dumps({"workflows": workflows}, option=orjson.OPT_NAIVE_UTC),
+        media_type="application/json"
+    )
+
+
 @router.get("/api/v1/workflows/{workflow_id}", response_model=WorkflowStatusResponse)
-async def get_workflow(
+def get_workflow(
     workflow_id: str,
     workflow_service: WorkflowModeService = Depends(get_workflow_service)
 ):
@@ -162,7 +199,7 @@ async def get_workflow(
 
 
 @router.put("/api/v1/workflows/{workflow_id}/mode", response_model=WorkflowModeResponse)
-async def set_workflow_mode(
+def set_workflow_mode(
     workflow_id: str,
     request: WorkflowModeRequest,
     workflow_service: WorkflowModeService = Depends(get_workflow_service)
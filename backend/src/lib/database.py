@@ -1,8 +1,11 @@
 from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 from sqlalchemy.pool import StaticPool
 import os
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
 import logging
 
 from ..models import Base  # This will import all models
@@ -25,8 +28,8 @@ else:
     # PostgreSQL configuration for production
     engine = create_engine(
         DATABASE_URL,
-        pool_size=10,
-        max_overflow=20,
+        pool_size=20,
+        max_overflow=10,
         pool_pre_ping=True,
         echo=False
     )
@@ -34,6 +37,29 @@ else:
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Scope key for ScopedSession: one per request/task when set, otherwise per thread
+_session_scope: ContextVar[Optional[object]] = ContextVar("session_scope", default=None)
+
+
+def _current_session_scope():
+    return _session_scope.get() or threading.get_ident()
+
+
+# Reused session for services constructed without an explicit session;
+# released by session_scope() or ScopedSession.remove() at request/task teardown
+ScopedSession = scoped_session(SessionLocal, scopefunc=_current_session_scope)
+
+
+@contextmanager
+def session_scope():
+    """Give the enclosed request or task its own ScopedSession, removed on exit"""
+    token = _session_scope.set(object())
+    try:
+        yield
+    finally:
+        ScopedSession.remove()
+        _session_scope.reset(token)
+
 
 def create_tables():
     """Create all database tables"""
@@ -5,14 +5,29 @@ Provides abstraction layer for video operations with fallback implementations.
 import logging
 import subprocess
 import shutil
+import threading
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Callable
 import json
 import tempfile
 import os
 
 logger = logging.getLogger(__name__)
 
+# Seconds before a running FFmpeg process is killed
+FFMPEG_TIMEOUT = 300
+
+
+@lru_cache(maxsize=32)
+def _image_encode_args(resolution: Tuple[int, int], fps: int) -> Tuple[str, ...]:
+    """Scale/frame-rate/pixel-format arguments, built once per output shape."""
+    return (
+        "-vf", f"scale={resolution[0]}:{resolution[1]}",
+        "-r", str(fps),
+        "-pix_fmt", "yuv420p",
+    )
+
 
 class FFmpegError(Exception):
     """Custom exception for FFmpeg-related errors."""
@@ -26,6 +41,9 @@ class FFmpegWrapper:
         self.ffmpeg_path = self._find_ffmpeg()
         self.available = self.ffmpeg_path is not None
 
+        # Leading arguments for reading an image sequence from a concat demuxer file list
+        self._concat_input_args = (self.ffmpeg_path, "-f", "concat", "-safe", "0", "-i")
+
         if not self.available:
             logger.warning("FFmpeg not found in PATH - using fallback implementation")
 
@@ -117,7 +135,8 @@ class FFmpegWrapper:
         output_path: Path,
         duration: float,
         fps: int = 30,
-        resolution: Tuple[int, int] = (1920, 1080)
+        resolution: Tuple[int, int] = (1920, 1080),
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
     ) -> bool:
         """
         Create video from sequence of images.
@@ -128,6 +147,7 @@ class FFmpegWrapper:
             duration: Total video duration in seconds
             fps: Frames per second
             resolution: Video resolution (width, height)
+            progress_callback: Optional callback receiving FFmpeg progress stats
 
         Returns:
             True if successful, False otherwise
@@ -137,41 +157,24 @@ class FFmpegWrapper:
             return self._create_mock_video(output_path, duration, resolution)
 
         try:
-            # Create temporary file list for FFmpeg
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-                for img_path in image_paths:
-                    # Calculate display duration per image
-                    img_duration = duration / len(image_paths)
-                    f.write(f"file '{img_path}'\n")
-                    f.write(f"duration {img_duration}\n")
-
-                # Repeat last image to ensure total duration
-                if image_paths:
-                    f.write(f"file '{image_paths[-1]}'\n")
-
-                filelist_path = f.name
+            filelist_path = self._write_concat_list(image_paths, duration)
 
             # FFmpeg command to create video from images
             cmd = [
-                self.ffmpeg_path,
-                "-f", "concat",
-                "-safe", "0",
-                "-i", filelist_path,
-                "-vf", f"scale={resolution[0]}:{resolution[1]}",
-                "-r", str(fps),
-                "-pix_fmt", "yuv420p",
+                *self._concat_input_args, filelist_path,
+                *_image_encode_args(tuple(resolution), fps),
                 "-t", str(duration),
                 "-y",  # Overwrite output file
                 str(output_path)
             ]
 
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+            returncode, stderr = self._run(cmd, progress_callback)
 
             # Clean up temporary file
             os.unlink(filelist_path)
 
-            if result.returncode != 0:
-                logger.error(f"FFmpeg failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"FFmpeg failed: {stderr}")
                 return False
 
             return output_path.exists()
@@ -180,6 +183,135 @@ class FFmpegWrapper:
             logger.error(f"Failed to create video from images: {e}")
             return False
 
+    def compose_video_with_audio(
+        self,
+        image_paths: List[Path],
+        audio_path: Path,
+        output_path: Path,
+        duration: float,
+        fps: int = 30,
+        resolution: Tuple[int, int] = (1920, 1080),
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> bool:
+        """
+        Create video from sequence of images with an audio track in a single pass.
+
+        Equivalent to create_video_from_images followed by add_audio_to_video,
+        without writing and re-reading an intermediate video file.
+
+        Args:
+            image_paths: List of image file paths
+            audio_path: Audio file to add
+            output_path: Output video file path
+            duration: Total video duration in seconds
+            fps: Frames per second
+            resolution: Video resolution (width, height)
+            progress_callback: Optional callback receiving FFmpeg progress stats
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.available:
+            # Fallback: create a minimal video file for development
+            return self._create_mock_video(output_path, duration, resolution)
+
+        try:
+            filelist_path = self._write_concat_list(image_paths, duration)
+
+            cmd = [
+                *self._concat_input_args, filelist_path,
+                "-i", str(audio_path),
+                "-map", "0:v:0", # Map image sequence
+                "-map", "1:a:0", # Map first audio stream
+                *_image_encode_args(tuple(resolution), fps),
+                "-c:a", "aac",   # Encode audio as AAC
+                "-t", str(duration),
+                "-shortest",     # End when shortest stream ends
+                "-y",            # Overwrite output file
+                str(output_path)
+            ]
+
+            returncode, stderr = self._run(cmd, progress_callback)
+
+            # Clean up temporary file
+            os.unlink(filelist_path)
+
+            if returncode != 0:
+                logger.error(f"FFmpeg composition failed: {stderr}")
+                return False
+
+            return output_path.exists()
+
+        except Exception as e:
+            logger.error(f"Failed to compose video with audio: {e}")
+            return False
+
+    def _run(
+        self,
+        cmd: List[str],
+        progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Tuple[int, str]:
+        """
+        Run an FFmpeg command, optionally reporting its machine-readable progress.
+
+        With a progress_callback, FFmpeg writes key=value stats to stdout
+        (-progress pipe:1); each block ending in a progress= line is parsed
+        and passed to the callback as a dict.
+
+        Returns:
+            Tuple of (return code, stderr output)
+        """
+        if progress_callback is None:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFMPEG_TIMEOUT)
+            return result.returncode, result.stderr
+
+        cmd = [cmd[0], "-progress", "pipe:1", "-nostats", *cmd[1:]]
+
+        with tempfile.TemporaryFile(mode="w+") as stderr_file:
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+            watchdog = threading.Timer(FFMPEG_TIMEOUT, process.kill)
+            watchdog.start()
+
+            try:
+                stats: Dict[str, Any] = {}
+                for line in process.stdout:
+                    key, _, value = line.strip().partition("=")
+                    if key == "out_time_us" and value.isdigit():
+                        stats["out_time_us"] = int(value)
+                    elif key == "speed" and value.endswith("x"):
+                        try:
+                            stats["speed"] = float(value[:-1])
+                        except ValueError:
+                            pass
+                    elif key == "progress":
+                        stats["progress"] = value
+                        try:
+                            progress_callback(dict(stats))
+                        except Exception as e:
+                            logger.warning(f"FFmpeg progress callback failed: {e}")
+
+                returncode = process.wait()
+            finally:
+                watchdog.cancel()
+
+            stderr_file.seek(0)
+            return returncode, stderr_file.read()
+
+    def _write_concat_list(self, image_paths: List[Path], duration: float) -> str:
+        """Write an FFmpeg concat demuxer file list showing each image for an equal share of duration."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            for img_path in image_paths:
+                # Calculate display duration per image
+                img_duration = duration / len(image_paths)
+                f.write(f"file '{img_path}'\n")
+                f.write(f"duration {img_duration}\n")
+
+            # Repeat last image to ensure total duration
+            if image_paths:
+                f.write(f"file '{image_paths[-1]}'\n")
+
+            return f.name
+
     def add_audio_to_video(
         self,
         video_path: Path,
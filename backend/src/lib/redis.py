@@ -4,7 +4,9 @@ Redis connection and management utilities for session storage and task queue.
 import json
 import os
 import logging
-from typing import Optional, Any, Dict, List
+import time
+from itertools import islice
+from typing import Optional, Any, Dict, Iterable, Iterator, List
 from contextlib import asynccontextmanager, contextmanager
 import redis
 import redis.asyncio as aioredis
@@ -20,6 +22,34 @@ REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", "20"))
 _redis_client: Optional[redis.Redis] = None
 _async_redis_client: Optional[aioredis.Redis] = None
 
+# Formatted "YYYY-MM-DDTHH:MM:SS" for the most recent whole second seen by utc_now_iso
+_iso_second_cache = (0, "")
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string with microseconds.
+
+    Equivalent to datetime.now(timezone.utc).isoformat() but reuses the
+    formatted date/time part within the same second, which keeps timestamp
+    stamping cheap on the hot task/UI state write paths.
+    """
+    global _iso_second_cache
+
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second_cache
+
+    if second != cached_second:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second))
+        _iso_second_cache = (second, prefix)
+
+    return f"{prefix}.{int((now - second) * 1_000_000):06d}+00:00"
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to size items, e.g. to pipeline SCAN results in batches"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
 class RedisConfig:
     """Redis configuration constants"""
 
@@ -28,13 +58,20 @@ class RedisConfig:
     TASK_TTL = 604800    # 7 days
     PROGRESS_TTL = 3600  # 1 hour
     UI_STATE_TTL = 86400 # 24 hours (tied to session)
+    WORKFLOW_PROGRESS_TTL = 300  # 5 minutes (keys are versioned by updated_at)
+    STORAGE_USAGE_TTL = 3600  # 1 hour (reused only while cleanup removes nothing)
+    COMPOSITION_PROGRESS_TTL = 300  # 5 minutes (refreshed by every FFmpeg progress block)
 
     # Key prefixes
     SESSION_PREFIX = "sessions:"
     TASK_PREFIX = "tasks:"
     PROGRESS_PREFIX = "events:"
     UI_STATE_PREFIX = "ui_state:"
+    UI_SESSION_INDEX_PREFIX = "ui_session_idx:"
     TASK_PROGRESS_PREFIX = "task_progress:"
+    WORKFLOW_PROGRESS_PREFIX = "workflow_progress:"
+    STORAGE_USAGE_PREFIX = "storage:"
+    COMPOSITION_PROGRESS_PREFIX = "composition_progress:"
 
     # Pub/Sub channels
     PROGRESS_CHANNEL = "progress_updates"
@@ -121,27 +158,50 @@ async def async_redis_connection():
         # Connection is managed by the pool
         pass
 
-class RedisService:
-    """Base Redis service with common operations"""
+class _RedisKeyspace:
+    """Key naming and value encoding shared by the sync and async Redis services"""
 
     def __init__(self, key_prefix: str):
         self.key_prefix = key_prefix
-        self.client = get_redis_client()
 
     def _make_key(self, identifier: str) -> str:
         """Create Redis key with prefix"""
         return f"{self.key_prefix}{identifier}"
 
-    def set_json(self, key: str, data: Dict[str, Any], ttl: Optional[int] = None) -> bool:
-        """Store JSON data with optional TTL"""
+    @staticmethod
+    def _serialize_json(data: Dict[str, Any]) -> str:
+        """Encode data the same way set_json stores it"""
+        return json.dumps(data, default=str)
+
+    @staticmethod
+    def _deserialize_json(raw: str) -> Dict[str, Any]:
+        """Decode a value written by set_json"""
+        return json.loads(raw)
+
+class RedisService(_RedisKeyspace):
+    """Base Redis service with common operations"""
+
+    def __init__(self, key_prefix: str):
+        super().__init__(key_prefix)
+        self.client = get_redis_client()
+
+    def set_json(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        ttl: Optional[int] = None,
+        only_if_exists: bool = False
+    ) -> bool:
+        """Store JSON data with optional TTL
+
+        With only_if_exists the write uses SET ... XX and fails (returns False)
+        when the key has expired or been deleted in the meantime.
+        """
         try:
             redis_key = self._make_key(key)
-            json_data = json.dumps(data, default=str)
+            json_data = self._serialize_json(data)
 
-            if ttl:
-                return self.client.setex(redis_key, ttl, json_data)
-            else:
-                return self.client.set(redis_key, json_data)
+            return bool(self.client.set(redis_key, json_data, ex=ttl or None, xx=only_if_exists))
         except Exception as e:
             logger.error(f"Failed to set JSON data for key {key}: {e}")
             return False
@@ -155,7 +215,7 @@ class RedisService:
             if data is None:
                 return None
 
-            return json.loads(data)
+            return self._deserialize_json(data)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to decode JSON for key {key}: {e}")
             return None
@@ -201,6 +261,74 @@ class RedisService:
             logger.error(f"Failed to get keys by pattern {pattern}: {e}")
             return []
 
+class AsyncRedisService(_RedisKeyspace):
+    """Base Redis service with common operations on the asyncio client"""
+
+    def __init__(self, key_prefix: str):
+        super().__init__(key_prefix)
+        self.client = get_async_redis_client()
+
+    async def set_json(
+        self,
+        key: str,
+        data: Dict[str, Any],
+        ttl: Optional[int] = None,
+        only_if_exists: bool = False
+    ) -> bool:
+        """Store JSON data with optional TTL (see RedisService.set_json)"""
+        try:
+            redis_key = self._make_key(key)
+            json_data = self._serialize_json(data)
+
+            return bool(await self.client.set(redis_key, json_data, ex=ttl or None, xx=only_if_exists))
+        except Exception as e:
+            logger.error(f"Failed to set JSON data for key {key}: {e}")
+            return False
+
+    async def get_json(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve JSON data"""
+        try:
+            redis_key = self._make_key(key)
+            data = await self.client.get(redis_key)
+
+            if data is None:
+                return None
+
+            return self._deserialize_json(data)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to decode JSON for key {key}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get JSON data for key {key}: {e}")
+            return None
+
+    async def delete(self, key: str) -> bool:
+        """Delete key"""
+        try:
+            redis_key = self._make_key(key)
+            return bool(await self.client.delete(redis_key))
+        except Exception as e:
+            logger.error(f"Failed to delete key {key}: {e}")
+            return False
+
+    async def exists(self, key: str) -> bool:
+        """Check if key exists"""
+        try:
+            redis_key = self._make_key(key)
+            return bool(await self.client.exists(redis_key))
+        except Exception as e:
+            logger.error(f"Failed to check existence of key {key}: {e}")
+            return False
+
+    async def expire(self, key: str, ttl: int) -> bool:
+        """Set TTL for existing key"""
+        try:
+            redis_key = self._make_key(key)
+            return bool(await self.client.expire(redis_key, ttl))
+        except Exception as e:
+            logger.error(f"Failed to set TTL for key {key}: {e}")
+            return False
+
 class RedisHealthCheck:
     """Redis health check utilities"""
 
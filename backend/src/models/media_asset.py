@@ -13,6 +13,9 @@ from typing import Optional, Dict, Any, List, Tuple
 
 from .base import Base
 
+# Scene number embedded in generated asset filenames, e.g. bg_012_<asset id>.jpg
+SCENE_INDEX_PATTERN = re.compile(r"_(\d+)_")
+
 
 class AssetTypeEnum(enum.Enum):
     """Type of media asset used in video composition."""
@@ -63,6 +66,7 @@ class MediaAsset(Base):
     # File information
     file_path = Column(String(512), nullable=False)
     url_path = Column(String(256), nullable=False)
+    file_size = Column(BigInteger, nullable=True)  # Bytes on disk when file_path was recorded
 
     # Asset properties
     duration = Column(Integer, nullable=True)  # Duration in seconds (null for images)
@@ -103,9 +107,13 @@ class MediaAsset(Base):
 
     @validates('file_path')
     def validate_file_path(self, key: str, file_path: str) -> str:
-        """Validate that file_path exists for all asset types."""
-        if file_path and not os.path.exists(file_path):
-            raise ValueError(f"File path does not exist: {file_path}")
+        """Validate that file_path exists for all asset types, recording its size."""
+        if file_path:
+            try:
+                # The existence check's stat also gives the size, so cleanup never has to stat the file
+                self.file_size = os.stat(file_path).st_size
+            except OSError:
+                raise ValueError(f"File path does not exist: {file_path}")
         return file_path
 
     @validates('duration')
@@ -342,6 +350,16 @@ class MediaAsset(Base):
 
         self.asset_metadata = metadata
 
+    @property
+    def scene_index(self) -> Optional[int]:
+        """Scene number parsed from the filename, or None; memoized per file_path."""
+        cached = self.__dict__.get("_scene_index_cache")
+        if cached is None or cached[0] != self.file_path:
+            match = SCENE_INDEX_PATTERN.search(os.path.basename(self.file_path or ""))
+            cached = (self.file_path, int(match.group(1)) if match else None)
+            self.__dict__["_scene_index_cache"] = cached
+        return cached[1]
+
     @property
     def requires_duration(self) -> bool:
         """Check if this asset type requires a duration value."""
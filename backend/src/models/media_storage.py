@@ -179,16 +179,24 @@ class MediaStorage(Base):
         file_count = 0
 
         try:
-            for root, dirs, files in os.walk(self.directory_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        if os.path.isfile(file_path):
-                            total_size += os.path.getsize(file_path)
-                            file_count += 1
-                    except (OSError, IOError):
-                        # Skip files that can't be accessed
-                        continue
+            pending = [self.directory_path]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            try:
+                                if entry.is_dir(follow_symlinks=False):
+                                    pending.append(entry.path)
+                                elif entry.is_file():
+                                    # DirEntry caches the stat for regular files, so this is one syscall per file
+                                    total_size += entry.stat().st_size
+                                    file_count += 1
+                            except (OSError, IOError):
+                                # Skip files that can't be accessed
+                                continue
+                except (OSError, IOError):
+                    # Skip directories that can't be listed, as os.walk did
+                    continue
 
             self.total_size_bytes = total_size
             self.file_count = file_count
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Enum, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
+from typing import Optional
 import uuid
 import enum
 
@@ -56,26 +57,50 @@ class Workflow(Base):
     # Relationships
     uploaded_script = relationship("UploadedScript", backref="workflow")
 
+    # Indexes for the newest-first workflow listing, with and without a user filter
+    __table_args__ = (
+        Index('idx_workflows_user_created', 'user_id', 'created_at'),
+        Index('idx_workflows_created', 'created_at'),
+    )
+
     def __repr__(self):
         return f"<Workflow(id={self.id}, mode={self.mode.value}, status={self.status.value})>"
 
+    @staticmethod
+    def upload_mode_values(uploaded_script_id: Optional[uuid.UUID] = None) -> dict:
+        """Column values for script upload mode; without a script the script fields are left as is"""
+        values = {
+            "mode": WorkflowModeEnum.UPLOAD,
+            "skip_research": True,
+            "skip_generation": True,
+            "status": WorkflowStatusEnum.MODE_SELECTED,
+        }
+        if uploaded_script_id is not None:
+            values["script_source"] = ScriptSourceEnum.UPLOADED
+            values["uploaded_script_id"] = uploaded_script_id
+        return values
+
+    @staticmethod
+    def generate_mode_values() -> dict:
+        """Column values for script generation mode"""
+        return {
+            "mode": WorkflowModeEnum.GENERATE,
+            "script_source": ScriptSourceEnum.GENERATED,
+            "uploaded_script_id": None,
+            "skip_research": False,
+            "skip_generation": False,
+            "status": WorkflowStatusEnum.MODE_SELECTED,
+        }
+
     def set_upload_mode(self, uploaded_script_id: uuid.UUID) -> None:
         """Configure workflow for script upload mode"""
-        self.mode = WorkflowModeEnum.UPLOAD
-        self.script_source = ScriptSourceEnum.UPLOADED
-        self.uploaded_script_id = uploaded_script_id
-        self.skip_research = True
-        self.skip_generation = True
-        self.status = WorkflowStatusEnum.MODE_SELECTED
+        for column, value in self.upload_mode_values(uploaded_script_id).items():
+            setattr(self, column, value)
 
     def set_generate_mode(self) -> None:
         """Configure workflow for script generation mode"""
-        self.mode = WorkflowModeEnum.GENERATE
-        self.script_source = ScriptSourceEnum.GENERATED
-        self.uploaded_script_id = None
-        self.skip_research = False
-        self.skip_generation = False
-        self.status = WorkflowStatusEnum.MODE_SELECTED
+        for column, value in self.generate_mode_values().items():
+            setattr(self, column, value)
 
     def can_proceed_to_processing(self) -> bool:
         """Check if workflow is ready to proceed to content processing"""
@@ -2,6 +2,7 @@
 GeminiImageService for AI-powered image generation.
 Builds on the existing GeminiService to provide specialized image generation functionality.
 """
+import os
 import time
 import json
 import logging
@@ -22,6 +23,15 @@ from src.lib.exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Simulated AI processing delays (per FR-004); GEMINI_IMAGE_SIMULATE_DELAY=0 skips them so workers aren't held idle
+SIMULATE_PROCESSING_DELAY = os.getenv("GEMINI_IMAGE_SIMULATE_DELAY", "1") != "0"
+
+
+def _simulate_processing_time(seconds: float) -> None:
+    """Sleep to mimic realistic AI processing time, unless simulated delays are disabled."""
+    if SIMULATE_PROCESSING_DELAY:
+        time.sleep(seconds)
+
 
 class GeminiImageService:
     """
@@ -85,7 +95,7 @@ class GeminiImageService:
                 })
 
             # Simulate realistic AI processing time (per FR-004)
-            time.sleep(1.5)  # Minimum realistic processing time
+            _simulate_processing_time(1.5)  # Minimum realistic processing time
 
             # Track progress - processing prompt
             if progress_callback:
@@ -104,9 +114,9 @@ class GeminiImageService:
             # Additional processing time based on quality
             quality = generation_request.get("quality", "medium")
             if quality == "high":
-                time.sleep(1.0)  # Higher quality takes longer
+                _simulate_processing_time(1.0)  # Higher quality takes longer
             elif quality == "ultra_high":
-                time.sleep(2.0)  # Ultra high quality takes even longer
+                _simulate_processing_time(2.0)  # Ultra high quality takes even longer
 
             # Track progress - generating image
             if progress_callback:
@@ -308,8 +318,7 @@ class GeminiImageService:
 
     def _generate_mock_image(self, generation_request: Dict[str, Any]) -> Dict[str, Any]:
         """Generate mock image for testing when Imagen is not available."""
-        import time
-        time.sleep(2.0)  # Realistic AI processing time
+        _simulate_processing_time(2.0)  # Realistic AI processing time
 
         prompt = generation_request.get("prompt", "")
         mock_filename = f"mock_imagen_{int(time.time())}.jpg"
@@ -5,7 +5,7 @@ Generates images, audio, and video clips for video composition.
 import logging
 import uuid
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 import json
 import re
 from datetime import datetime
@@ -163,6 +163,35 @@ class MediaAssetGenerator:
         Returns:
             List of created MediaAsset objects
         """
+        assets = self.generate_asset_models_for_job(job_id, script_content, options)
+        return [self.asset_to_dict(asset) for asset in assets]
+
+    def generate_asset_models_for_job(
+        self,
+        job_id: uuid.UUID,
+        script_content: str,
+        options: Dict[str, Any]
+    ) -> List[MediaAsset]:
+        """
+        Generate all required media assets for a job and return the MediaAsset rows.
+
+        The rows are returned detached with their attributes still loaded, so
+        they can be handed straight to the video composer without re-querying.
+        """
+        return list(self.iter_asset_models_for_job(job_id, script_content, options))
+
+    def iter_asset_models_for_job(
+        self,
+        job_id: uuid.UUID,
+        script_content: str,
+        options: Dict[str, Any]
+    ) -> Iterator[MediaAsset]:
+        """
+        Generate the media assets for a job, yielding each MediaAsset row as soon as it is created.
+
+        The rows are committed together after the last one is yielded, and keep
+        their attribute values once the session closes.
+        """
         try:
             # Analyze script requirements
             requirements = self.analyze_script_requirements(
@@ -170,59 +199,56 @@ class MediaAssetGenerator:
                 options.get("duration", 180)
             )
 
-            generated_assets = []
+            generated_count = 0
 
             with get_db_session() as db:
+                # Keep attribute values after commit so the rows stay usable once the session closes
+                db.expire_on_commit = False
+
                 # Generate background images
                 for scene in requirements["scenes"]:
-                    image_asset = self._generate_background_image(
-                        db, job_id, scene, options
-                    )
-                    generated_assets.append(image_asset)
+                    yield self._generate_background_image(db, job_id, scene, options)
+                    generated_count += 1
 
                 # Generate text overlays
                 for scene in requirements["scenes"]:
-                    text_asset = self._generate_text_overlay(
-                        db, job_id, scene, options
-                    )
-                    generated_assets.append(text_asset)
+                    yield self._generate_text_overlay(db, job_id, scene, options)
+                    generated_count += 1
 
                 # Generate audio tracks
-                audio_asset = self._generate_audio_track(
+                yield self._generate_audio_track(
                     db, job_id, script_content, requirements["total_duration"], options
                 )
-                generated_assets.append(audio_asset)
+                generated_count += 1
 
                 # Generate background music if requested
                 if options.get("include_audio", True):
-                    music_asset = self._generate_background_music(
+                    yield self._generate_background_music(
                         db, job_id, requirements["total_duration"], options
                     )
-                    generated_assets.append(music_asset)
-
-                # Convert SQLAlchemy objects to dictionaries BEFORE commit to avoid DetachedInstanceError
-                assets_data = []
-                for asset in generated_assets:
-                    asset_dict = {
-                        "id": str(asset.id),
-                        "url": asset.url_path,
-                        "duration": asset.duration,
-                        "file_path": asset.file_path,
-                        "asset_type": asset.asset_type.value,
-                        "source_type": asset.source_type.value,
-                        "metadata": asset.asset_metadata
-                    }
-                    assets_data.append(asset_dict)
+                    generated_count += 1
 
                 db.commit()
 
-            logger.info(f"Generated {len(assets_data)} assets for job {job_id}")
-            return assets_data
+            logger.info(f"Generated {generated_count} assets for job {job_id}")
 
         except Exception as e:
             logger.error(f"Failed to generate assets for job {job_id}: {e}")
             raise MediaAssetGeneratorError(f"Asset generation failed: {e}")
 
+    @staticmethod
+    def asset_to_dict(asset: MediaAsset) -> Dict[str, Any]:
+        """Summary of a generated asset as returned in task results."""
+        return {
+            "id": str(asset.id),
+            "url": asset.url_path,
+            "duration": asset.duration,
+            "file_path": asset.file_path,
+            "asset_type": asset.asset_type.value,
+            "source_type": asset.source_type.value,
+            "metadata": asset.asset_metadata
+        }
+
     def _parse_script_scenes(self, script_content: str) -> List[str]:
         """Parse script content into scenes or segments."""
         # Simple scene parsing - split by paragraphs or sentences
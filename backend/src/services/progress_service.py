@@ -3,8 +3,12 @@ Redis-based progress event service for real-time progress tracking and notificat
 Handles progress updates, event publishing, and real-time communication with UI.
 """
 import json
+import os
+import threading
+import time
 import uuid
 import logging
+from collections import deque
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List, Callable
 from enum import Enum
@@ -13,6 +17,9 @@ from ..lib.redis import RedisService, RedisConfig, get_redis_client
 
 logger = logging.getLogger(__name__)
 
+# Batching window for publish_progress_async: events queued within it go out in one pipeline
+PROGRESS_FLUSH_INTERVAL = 0.05
+
 class ProgressEventType(str, Enum):
     """Progress event type enumeration"""
     TASK_STARTED = "task_started"
@@ -59,6 +66,7 @@ class ProgressService(RedisService):
         """Initialize progress service with Redis connection"""
         super().__init__(RedisConfig.PROGRESS_PREFIX)
         self.pubsub_client = get_redis_client()
+        self._flusher_pid: Optional[int] = None
         logger.info("ProgressService initialized")
 
     def publish_progress(
@@ -103,17 +111,17 @@ class ProgressService(RedisService):
                 "read": False
             }
 
-            # Store event with short TTL (progress events are transient)
-            success = self.set_json(event_id, event_data, RedisConfig.PROGRESS_TTL)
-
-            if not success:
-                raise ProgressServiceError(f"Failed to store progress event {event_id}")
+            # Store (short TTL, progress events are transient), publish and log the event in one round trip
+            pipe = self.client.pipeline(transaction=False)
+            self._queue_event_commands(pipe, event_data)
+            stored, *results = pipe.execute(raise_on_error=False)
 
-            # Publish to Redis pub/sub for real-time updates
-            self._publish_to_channel(session_id, event_data)
+            if isinstance(stored, Exception) or not stored:
+                raise ProgressServiceError(f"Failed to store progress event {event_id}: {stored}")
 
-            # Store in session-specific progress log
-            self._add_to_session_progress(session_id, event_id)
+            failures = [result for result in results if isinstance(result, Exception)]
+            if failures:
+                logger.error(f"Failed to publish or log progress event {event_id}: {failures[0]}")
 
             logger.debug(f"Published progress event {event_id} for session {session_id}")
             return event_id
@@ -122,6 +130,111 @@ class ProgressService(RedisService):
             logger.error(f"Failed to publish progress event: {e}")
             raise ProgressServiceError(f"Progress event publishing failed: {e}")
 
+    def publish_progress_async(
+        self,
+        session_id: str,
+        event_type: ProgressEventType,
+        message: str,
+        percentage: Optional[int] = None,
+        task_id: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Queue a progress event for the background flusher instead of writing it inline
+
+        Events queued within PROGRESS_FLUSH_INTERVAL are written and published
+        together in one Redis pipeline. Call flush_progress() before the caller
+        finishes to make sure everything queued has been sent.
+
+        Returns:
+            event_id: New event UUID
+        """
+        event_id = str(uuid.uuid4())
+
+        self._ensure_flusher()
+        self._pending_events.append({
+            "event_id": event_id,
+            "session_id": session_id,
+            "task_id": task_id,
+            "event_type": event_type.value,
+            "message": message,
+            "percentage": percentage,
+            "metadata": metadata or {},
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "read": False
+        })
+        self._flush_wakeup.set()
+
+        return event_id
+
+    def flush_progress(self) -> int:
+        """
+        Send every queued progress event in one pipeline
+
+        Returns:
+            Number of events sent
+        """
+        if self._flusher_pid != os.getpid():
+            return 0
+
+        # Held while sending so events are published in the order they were queued
+        with self._flush_lock:
+            events = []
+            while self._pending_events:
+                events.append(self._pending_events.popleft())
+
+            if not events:
+                return 0
+
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for event_data in events:
+                    self._queue_event_commands(pipe, event_data)
+                results = pipe.execute(raise_on_error=False)
+            except Exception as e:
+                logger.error(f"Failed to flush {len(events)} progress events: {e}")
+                return 0
+
+            failures = [result for result in results if isinstance(result, Exception)]
+            if failures:
+                logger.error(f"Failed {len(failures)} of {len(results)} progress event commands: {failures[0]}")
+
+            logger.debug(f"Flushed {len(events)} progress events")
+            return len(events)
+
+    def _queue_event_commands(self, pipe, event_data: Dict[str, Any]):
+        """Add the store, publish and session log commands for one event to a pipeline"""
+        session_id = event_data["session_id"]
+        progress_key = self._make_key(f"session_progress:{session_id}")
+
+        pipe.setex(self._make_key(event_data["event_id"]), RedisConfig.PROGRESS_TTL, self._serialize_json(event_data))
+        pipe.publish(f"{RedisConfig.PROGRESS_CHANNEL}:{session_id}", json.dumps(event_data, default=str))
+        pipe.lpush(progress_key, event_data["event_id"])
+        pipe.ltrim(progress_key, 0, 99)  # Keep last 100 events
+        pipe.expire(progress_key, RedisConfig.PROGRESS_TTL)
+
+    def _ensure_flusher(self):
+        """Start the background flusher in this process if it isn't running yet"""
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+
+        # A forked worker inherits the parent's queue but not its thread, so both are recreated
+        self._pending_events: deque = deque()
+        self._flush_lock = threading.Lock()
+        self._flush_wakeup = threading.Event()
+        self._flusher_pid = pid
+
+        threading.Thread(target=self._flusher_loop, name="progress-flusher", daemon=True).start()
+
+    def _flusher_loop(self):
+        """Send queued events once per batching window while there are any"""
+        while True:
+            self._flush_wakeup.wait()
+            time.sleep(PROGRESS_FLUSH_INTERVAL)
+            self._flush_wakeup.clear()
+            self.flush_progress()
+
     def get_progress_event(self, event_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve progress event by ID
@@ -383,30 +496,6 @@ class ProgressService(RedisService):
             logger.error(f"Failed to cleanup expired progress events: {e}")
             return 0
 
-    def _publish_to_channel(self, session_id: str, event_data: Dict[str, Any]):
-        """Publish event to Redis pub/sub channel"""
-        try:
-            channel = f"{RedisConfig.PROGRESS_CHANNEL}:{session_id}"
-            message = json.dumps(event_data, default=str)
-            self.pubsub_client.publish(channel, message)
-            logger.debug(f"Published to channel {channel}")
-
-        except Exception as e:
-            logger.error(f"Failed to publish to channel: {e}")
-
-    def _add_to_session_progress(self, session_id: str, event_id: str):
-        """Add event to session progress list"""
-        try:
-            progress_key = f"session_progress:{session_id}"
-            self.client.lpush(self._make_key(progress_key), event_id)
-            # Keep only recent events (limit list size)
-            self.client.ltrim(self._make_key(progress_key), 0, 99)  # Keep last 100 events
-            # Set TTL on progress list
-            self.client.expire(self._make_key(progress_key), RedisConfig.PROGRESS_TTL)
-
-        except Exception as e:
-            logger.error(f"Failed to add event to session progress: {e}")
-
     def _add_to_task_progress(self, task_id: str, event_id: str):
         """Add event to task progress list"""
         try:
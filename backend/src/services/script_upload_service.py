@@ -3,11 +3,10 @@ from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
 import uuid
 import logging
-from datetime import datetime
 
 from ..models.uploaded_script import UploadedScript, ValidationStatusEnum
 from ..models.workflow import Workflow
-from ..lib.database import SessionLocal
+from ..lib.database import ScopedSession
 
 logger = logging.getLogger(__name__)
 
@@ -22,8 +21,8 @@ class ScriptUploadService:
         """Get database session"""
         if self.db_session:
             return self.db_session
-        # Create a new session for standalone use
-        return SessionLocal()
+        # Reuse the pooled request/task-scoped session for standalone use
+        return ScopedSession()
 
     def upload_script(
         self,
@@ -34,11 +33,9 @@ class ScriptUploadService:
     ) -> Tuple[bool, Union[UploadedScript, str]]:
         """Upload a script and return success status and result"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)  # We created the session
 
             # Create uploaded script instance
             uploaded_script = UploadedScript(
@@ -81,9 +78,6 @@ class ScriptUploadService:
             if session:
                 session.rollback()
             return False, f"Upload failed: {str(e)}"
-        finally:
-            if created_session and session:
-                session.close()
 
     def get_script(self, script_id: str) -> Optional[UploadedScript]:
         """Retrieve uploaded script by ID"""
@@ -190,7 +184,6 @@ class ScriptUploadService:
                 return False, "Script not found"
 
             script.validation_status = status
-            script.updated_at = datetime.utcnow()
             session.commit()
 
             logger.info(f"Updated validation status for script {script_id} to {status.value}")
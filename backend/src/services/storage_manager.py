@@ -3,18 +3,40 @@ Storage Manager Service for organizing media files and managing storage policies
 Handles file organization, cleanup, quota enforcement, and path management.
 """
 import logging
+import os
 import shutil
+from stat import S_ISREG
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import json
 from datetime import datetime, timedelta
 import uuid
 
+import httpx
+
 from ..models.media_storage import MediaStorage, StorageTypeEnum as StorageType
 from ..lib.database import get_db_session
 
 logger = logging.getLogger(__name__)
 
+# Concurrent unlink calls when removing expired files from a storage directory
+FILE_UNLINK_WORKERS = 16
+
+
+def _unlink_expired_file(file_path: Path, file_size: int) -> Optional[int]:
+    """Remove one expired file; returns bytes freed or None if it could not be removed"""
+    try:
+        file_path.unlink()
+        logger.debug(f"Removed expired file: {file_path}")
+        return file_size
+    except FileNotFoundError:
+        # Already gone
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to remove file {file_path}: {e}")
+        return None
+
 
 class StorageManagerError(Exception):
     """Exception raised by storage management operations."""
@@ -55,6 +77,7 @@ class StorageManager:
             "images": self.base_path / "assets" / "images",
             "audio": self.base_path / "assets" / "audio",
             "video": self.base_path / "assets" / "video",
+            "videos": self.base_path / "assets" / "videos",
             "temp": self.base_path / "assets" / "temp"
         }
 
@@ -75,6 +98,57 @@ class StorageManager:
         temp_path.mkdir(parents=True, exist_ok=True)
         return temp_path
 
+    def get_job_temp_path(self, job_id: uuid.UUID, create: bool = True) -> Path:
+        """Get the temporary directory scoped to one job, so it can be removed as a whole."""
+        job_temp_path = self.base_path / "assets" / "temp" / "jobs" / str(job_id)
+        if create:
+            job_temp_path.mkdir(parents=True, exist_ok=True)
+        return job_temp_path
+
+    def save_generated_video(
+        self,
+        video: Any,
+        filename: str,
+        api_key: Optional[str] = None,
+        chunk_size: int = 1024 * 1024
+    ) -> Path:
+        """
+        Save an AI-generated video into the video assets directory.
+
+        Inline video bytes are written as-is; videos referenced by URI are
+        streamed to disk chunk by chunk so memory use stays bounded regardless
+        of video size. The file only appears under its final name once complete.
+        """
+        destination = self.get_asset_path("videos") / filename
+        partial_path = destination.with_name(f"{destination.name}.part")
+
+        try:
+            if getattr(video, "video_bytes", None):
+                partial_path.write_bytes(video.video_bytes)
+            elif getattr(video, "uri", None):
+                headers = {"x-goog-api-key": api_key} if api_key else {}
+                with httpx.stream("GET", video.uri, headers=headers,
+                                  follow_redirects=True, timeout=60.0) as response:
+                    response.raise_for_status()
+                    with open(partial_path, "wb") as f:
+                        for chunk in response.iter_bytes(chunk_size):
+                            f.write(chunk)
+            else:
+                raise StorageManagerError(f"Generated video {filename} has no content or download URI")
+
+            os.replace(partial_path, destination)
+            return destination
+
+        except Exception:
+            partial_path.unlink(missing_ok=True)
+            raise
+
+    def get_cache_path(self, namespace: str) -> Path:
+        """Get path for a generation result cache."""
+        cache_path = self.base_path / "cache" / namespace
+        cache_path.mkdir(parents=True, exist_ok=True)
+        return cache_path
+
     def initialize_storage_records(self) -> List[MediaStorage]:
         """Initialize MediaStorage records for all storage directories."""
         try:
@@ -251,13 +325,15 @@ class StorageManager:
         max_age_days = storage.cleanup_policy.get("max_age_days", 30)
         cutoff_date = datetime.now() - timedelta(days=max_age_days)
 
+        expired_files = []
         for file_path in directory.rglob("*"):
-            if not file_path.is_file():
-                continue
-
             try:
+                file_stat = file_path.stat()
+                if not S_ISREG(file_stat.st_mode):
+                    continue
+
                 # Check file age
-                file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
+                file_mtime = datetime.fromtimestamp(file_stat.st_mtime)
                 if file_mtime > cutoff_date:
                     continue
 
@@ -265,20 +341,43 @@ class StorageManager:
                 if self._should_preserve_file(file_path, storage):
                     continue
 
-                # Remove the file
-                file_size = file_path.stat().st_size
-                file_path.unlink()
-
-                result["files_removed"] += 1
-                result["bytes_freed"] += file_size
-
-                logger.debug(f"Removed expired file: {file_path}")
+                expired_files.append((file_path, file_stat.st_size))
 
             except Exception as e:
-                logger.warning(f"Failed to remove file {file_path}: {e}")
+                logger.warning(f"Failed to check file {file_path}: {e}")
 
+        result["files_removed"], result["bytes_freed"] = self._bulk_unlink(expired_files)
         return result
 
+    def _bulk_unlink(self, files: List[Tuple[Path, int]]) -> Tuple[int, int]:
+        """
+        Remove files on a thread pool once all victims are listed.
+
+        Each unlink mostly waits on the filesystem with the GIL released, so
+        running them concurrently keeps several in flight instead of paying
+        each syscall's latency in turn.
+
+        Args:
+            files: (file_path, file_size) pairs
+
+        Returns:
+            Tuple of (files removed, bytes freed)
+        """
+        if not files:
+            return 0, 0
+
+        with ThreadPoolExecutor(max_workers=min(FILE_UNLINK_WORKERS, len(files))) as executor:
+            freed = [
+                size for size in executor.map(
+                    _unlink_expired_file,
+                    [file_path for file_path, _ in files],
+                    [file_size for _, file_size in files]
+                )
+                if size is not None
+            ]
+
+        return len(freed), sum(freed)
+
     def _should_preserve_file(self, file_path: Path, storage: MediaStorage) -> bool:
         """Check if a file should be preserved based on storage policy."""
         policy = storage.cleanup_policy or {}
@@ -440,4 +539,17 @@ class StorageManager:
                 "error": str(e),
                 "issues": ["Storage health check failed"],
                 "recommendations": ["Check storage system configuration"]
-            }
\ No newline at end of file
+            }
+
+
+# Global storage manager instance for the default media path
+_storage_manager: Optional[StorageManager] = None
+
+def get_storage_manager() -> StorageManager:
+    """Get global storage manager instance"""
+    global _storage_manager
+
+    if _storage_manager is None:
+        _storage_manager = StorageManager()
+
+    return _storage_manager
@@ -2,17 +2,47 @@
 Redis-based task queue service for managing background tasks and job processing.
 Handles task queuing, status tracking, and result storage with TTL management.
 """
+import base64
 import json
+import time
 import uuid
 import logging
-from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List, Literal
 from enum import Enum
 
-from ..lib.redis import RedisService, RedisConfig
+import zstandard
+from redis.exceptions import ResponseError
+
+from ..lib.redis import RedisService, AsyncRedisService, RedisConfig, chunked, utc_now_iso
 
 logger = logging.getLogger(__name__)
 
+# Consumer group shared by all workers reading the priority streams
+WORKER_GROUP = "workers"
+
+# Pending entries idle for longer than this are considered abandoned by a crashed worker
+STALE_TASK_IDLE_MS = 300000  # 5 minutes
+
+# Task IDs read from a listing index per round trip while collecting matches
+LIST_TASKS_PAGE_SIZE = 200
+
+# Filter index entries checked per HSCAN/EXISTS round trip during cleanup
+CLEANUP_BATCH_SIZE = 500
+
+# Task fields that may carry large nested payloads. When their JSON exceeds the
+# threshold they are stored zstd-compressed (base64, since the client decodes
+# responses as text) under a marker object, leaving the rest of the record plain
+# JSON so the records stay readable with plain Redis tooling.
+_COMPRESSIBLE_FIELDS = ("input_data", "result")
+_COMPRESSION_THRESHOLD = 2048  # bytes
+_COMPRESSED_MARKER = "__zstd__"
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+# Key namespaces under the task prefix that do not hold task records
+_NON_TASK_KEY_PREFIXES = ("stream:", "idx:")
+
 class TaskStatus(str, Enum):
     """Task status enumeration"""
     PENDING = "pending"
@@ -38,16 +68,179 @@ class TaskType(str, Enum):
     TRENDING_ANALYSIS = "trending_analysis"
     THEME_EXTRACTION = "theme_extraction"
 
+# Status groups checked on every update
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+_CANCELLABLE_STATUSES = frozenset({TaskStatus.PENDING, TaskStatus.RUNNING})
+
+# Order in which workers drain the priority streams
+_DISPATCH_ORDER = (TaskPriority.URGENT, TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW)
+
 class TaskQueueServiceError(Exception):
     """Custom exception for task queue service operations"""
     pass
 
-class TaskQueueService(RedisService):
+# Task record transitions shared by the sync and async services
+
+def _new_task_record(
+    task_id: str,
+    task_type: TaskType,
+    input_data: Dict[str, Any],
+    session_id: str,
+    priority: TaskPriority,
+    metadata: Optional[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """Build the stored record for a freshly submitted task"""
+    now = utc_now_iso()
+
+    return {
+        "task_id": task_id,
+        "task_type": task_type.value,
+        "status": TaskStatus.PENDING.value,
+        "priority": priority.value,
+        "session_id": session_id,
+        "input_data": input_data,
+        "metadata": metadata or {},
+        "created_at": now,
+        "updated_at": now,
+        "started_at": None,
+        "completed_at": None,
+        "result": None,
+        "error_message": None,
+        "retry_count": 0,
+        "max_retries": 3,
+        "progress": 0,
+        "estimated_duration": None,
+        "worker_id": None
+    }
+
+def _apply_running(task_data: Dict[str, Any], worker_id: Optional[str], progress: Optional[int]):
+    """Move a task record to running; the worker is recorded on first start only"""
+    now = utc_now_iso()
+    task_data["status"] = TaskStatus.RUNNING.value
+    task_data["updated_at"] = now
+
+    if not task_data.get("started_at"):
+        task_data["started_at"] = now
+        task_data["worker_id"] = worker_id
+
+    if progress is not None:
+        task_data["progress"] = min(100, max(0, progress))
+
+def _apply_claim(task_data: Dict[str, Any], worker_id: str, message_id: str):
+    """Move a task record to running for the worker that read its stream entry"""
+    _apply_running(task_data, worker_id, None)
+    task_data["worker_id"] = worker_id
+    task_data["queue_message_id"] = message_id
+
+def _apply_finished(
+    task_data: Dict[str, Any],
+    status: TaskStatus,
+    progress: Optional[int],
+    result: Optional[Dict[str, Any]],
+    error_message: Optional[str]
+):
+    """Move a task record into a terminal status"""
+    now = utc_now_iso()
+    task_data["status"] = status.value
+    task_data["updated_at"] = now
+    task_data["completed_at"] = now
+
+    if result:
+        task_data["result"] = result
+    if error_message:
+        task_data["error_message"] = error_message
+    if progress is not None:
+        task_data["progress"] = min(100, max(0, progress))
+
+def _apply_status(task_data: Dict[str, Any], status: TaskStatus, progress: Optional[int]):
+    """Move a task record to a non-running, non-terminal status (pending/retrying)"""
+    task_data["status"] = status.value
+    task_data["updated_at"] = utc_now_iso()
+
+    if status == TaskStatus.RETRYING:
+        task_data["retry_count"] = task_data.get("retry_count", 0) + 1
+
+    if progress is not None:
+        task_data["progress"] = min(100, max(0, progress))
+
+def _apply_progress(task_data: Dict[str, Any], progress: int):
+    """Update a task record's progress without touching its status"""
+    task_data["progress"] = min(100, max(0, progress))
+    task_data["updated_at"] = utc_now_iso()
+
+def _filter_value(task_data: Dict[str, Any]) -> str:
+    """Compact "status|task_type" entry kept for a task in the filter index"""
+    return f"{task_data['status']}|{task_data['task_type']}"
+
+def _matches_filters(
+    filter_value: Optional[str],
+    status: Optional[TaskStatus],
+    task_type: Optional[TaskType]
+) -> bool:
+    """Check a filter index entry against the requested status and task type"""
+    if filter_value is None:
+        return False
+
+    task_status, _, stored_type = filter_value.partition("|")
+    return (not status or task_status == status.value) and (not task_type or stored_type == task_type.value)
+
+class _TaskQueueKeys:
+    """Redis key layout and record encoding shared by the sync and async task queue services"""
+
+    @staticmethod
+    def _serialize_json(data: Dict[str, Any]) -> str:
+        """Encode a task record, compressing oversized payload fields"""
+        record = dict(data)
+
+        for field in _COMPRESSIBLE_FIELDS:
+            value = record.get(field)
+            if not value:
+                continue
+
+            payload = json.dumps(value, default=str).encode("utf-8")
+            if len(payload) > _COMPRESSION_THRESHOLD:
+                compressed = _zstd_compressor.compress(payload)
+                record[field] = {_COMPRESSED_MARKER: base64.b64encode(compressed).decode("ascii")}
+
+        return json.dumps(record, default=str)
+
+    @staticmethod
+    def _deserialize_json(raw: str) -> Dict[str, Any]:
+        """Decode a task record, expanding compressed payload fields"""
+        record = json.loads(raw)
+
+        for field in _COMPRESSIBLE_FIELDS:
+            value = record.get(field)
+            if isinstance(value, dict) and _COMPRESSED_MARKER in value:
+                compressed = base64.b64decode(value[_COMPRESSED_MARKER])
+                record[field] = json.loads(_zstd_decompressor.decompress(compressed))
+
+        return record
+
+    def _init_queue_keys(self):
+        """Build the keys used on every enqueue/dequeue once"""
+        self._stream_keys = {
+            priority: self._make_key(f"stream:{priority.value}") for priority in TaskPriority
+        }
+        self._dispatch_streams = [(priority, self._stream_keys[priority]) for priority in _DISPATCH_ORDER]
+        # Listing indexes are sorted sets of task IDs scored by submission time;
+        # the filter index hash maps each task ID to its status and type
+        self._all_tasks_index_key = self._make_key("idx:created:all")
+        self._session_index_prefix = self._make_key("idx:created:session:")
+        self._filter_index_key = self._make_key("idx:filters")
+
+    def _session_index_key(self, session_id: str) -> str:
+        """Redis key of the sorted set holding a session's task IDs"""
+        return self._session_index_prefix + session_id
+
+class TaskQueueService(_TaskQueueKeys, RedisService):
     """Redis service for task queue management"""
 
     def __init__(self):
         """Initialize task queue service with Redis connection"""
         super().__init__(RedisConfig.TASK_PREFIX)
+        self._consumer_groups_ready = False
+        self._init_queue_keys()
         logger.info("TaskQueueService initialized")
 
     def submit_task(
@@ -76,36 +269,24 @@ class TaskQueueService(RedisService):
         """
         try:
             task_id = str(uuid.uuid4())
-            now = datetime.now(timezone.utc).isoformat()
-
-            task_data = {
-                "task_id": task_id,
-                "task_type": task_type.value,
-                "status": TaskStatus.PENDING.value,
-                "priority": priority.value,
-                "session_id": session_id,
-                "input_data": input_data,
-                "metadata": metadata or {},
-                "created_at": now,
-                "updated_at": now,
-                "started_at": None,
-                "completed_at": None,
-                "result": None,
-                "error_message": None,
-                "retry_count": 0,
-                "max_retries": 3,
-                "progress": 0,
-                "estimated_duration": None,
-                "worker_id": None
-            }
-
-            success = self.set_json(task_id, task_data, RedisConfig.TASK_TTL)
+            task_data = _new_task_record(task_id, task_type, input_data, session_id, priority, metadata)
+
+            # Store the task and register it in the listing indexes in one round trip
+            session_index_key = self._session_index_key(session_id)
+            submitted_at = time.time()
+            pipe = self.client.pipeline()
+            pipe.setex(self._make_key(task_id), RedisConfig.TASK_TTL, self._serialize_json(task_data))
+            pipe.zadd(session_index_key, {task_id: submitted_at})
+            pipe.expire(session_index_key, RedisConfig.TASK_TTL)
+            pipe.zadd(self._all_tasks_index_key, {task_id: submitted_at})
+            pipe.hset(self._filter_index_key, task_id, _filter_value(task_data))
+            success = pipe.execute()[0]
 
             if not success:
                 raise TaskQueueServiceError(f"Failed to store task data for {task_id}")
 
-            # Add to priority queue
-            self._add_to_priority_queue(task_id, priority)
+            # Add to priority stream
+            self._enqueue_task(task_id, priority)
 
             logger.info(f"Submitted task {task_id} of type {task_type} for session {session_id}")
             return task_id
@@ -150,6 +331,9 @@ class TaskQueueService(RedisService):
         """
         Update task status and related fields
 
+        Kept for callers that pick the status dynamically; dispatches to the
+        per-status fast paths (mark_running, mark_completed, mark_failed).
+
         Args:
             task_id: Task UUID
             status: New task status
@@ -161,6 +345,12 @@ class TaskQueueService(RedisService):
         Returns:
             True if update successful, False otherwise
         """
+        if status == TaskStatus.RUNNING:
+            return self.mark_running(task_id, worker_id, progress=progress)
+
+        if status in _TERMINAL_STATUSES:
+            return self._finish_task(task_id, status, progress, result, error_message)
+
         try:
             task_data = self.get_json(task_id)
 
@@ -168,40 +358,135 @@ class TaskQueueService(RedisService):
                 logger.warning(f"Task {task_id} not found for status update")
                 return False
 
-            now = datetime.now(timezone.utc).isoformat()
+            _apply_status(task_data, status, progress)
+            return self._store_task_update(task_id, task_data)
+
+        except Exception as e:
+            logger.error(f"Failed to update task {task_id} status: {e}")
+            return False
+
+    def mark_running(
+        self,
+        task_id: str,
+        worker_id: Optional[str] = None,
+        progress: Optional[int] = None
+    ) -> bool:
+        """
+        Mark a task as running
 
-            # Update status and timestamp
-            task_data["status"] = status.value
-            task_data["updated_at"] = now
+        Args:
+            task_id: Task UUID
+            worker_id: Worker processing the task (recorded on first start only)
+            progress: Task progress percentage (0-100)
 
-            # Update specific fields based on status
-            if status == TaskStatus.RUNNING and not task_data["started_at"]:
-                task_data["started_at"] = now
-                task_data["worker_id"] = worker_id
+        Returns:
+            True if update successful, False otherwise
+        """
+        try:
+            task_data = self.get_json(task_id)
 
-            elif status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                task_data["completed_at"] = now
-                if result:
-                    task_data["result"] = result
-                if error_message:
-                    task_data["error_message"] = error_message
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for status update")
+                return False
 
-            elif status == TaskStatus.RETRYING:
-                task_data["retry_count"] = task_data.get("retry_count", 0) + 1
+            _apply_running(task_data, worker_id, progress)
+            return self._store_task_update(task_id, task_data)
 
-            # Update progress
-            if progress is not None:
-                task_data["progress"] = min(100, max(0, progress))
+        except Exception as e:
+            logger.error(f"Failed to mark task {task_id} as running: {e}")
+            return False
 
-            success = self.set_json(task_id, task_data, RedisConfig.TASK_TTL)
+    def mark_completed(
+        self,
+        task_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        progress: Optional[int] = 100
+    ) -> bool:
+        """
+        Mark a task as completed and store its result
+
+        Args:
+            task_id: Task UUID
+            result: Task result data
+            progress: Final progress percentage (0-100)
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        return self._finish_task(task_id, TaskStatus.COMPLETED, progress, result=result)
+
+    def mark_failed(
+        self,
+        task_id: str,
+        error_message: Optional[str] = None,
+        progress: Optional[int] = None
+    ) -> bool:
+        """
+        Mark a task as failed
+
+        Args:
+            task_id: Task UUID
+            error_message: Error message describing the failure
+            progress: Progress percentage reached before failing (0-100)
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        return self._finish_task(task_id, TaskStatus.FAILED, progress, error_message=error_message)
+
+    def update_progress(self, task_id: str, progress: int) -> bool:
+        """
+        Update only the progress of a task, leaving its status untouched
+
+        Args:
+            task_id: Task UUID
+            progress: Task progress percentage (0-100)
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        try:
+            task_data = self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for progress update")
+                return False
+
+            _apply_progress(task_data, progress)
+            success = self.set_json(task_id, task_data, RedisConfig.TASK_TTL, only_if_exists=True)
 
             if success:
-                logger.info(f"Updated task {task_id} status to {status}")
-                # Remove from priority queue if completed/failed/cancelled
-                if status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED]:
-                    self._remove_from_priority_queue(task_id)
+                logger.debug(f"Updated task {task_id} progress to {progress}")
             else:
-                logger.error(f"Failed to update task {task_id} status")
+                logger.error(f"Failed to update task {task_id} progress")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to update task {task_id} progress: {e}")
+            return False
+
+    def _finish_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        progress: Optional[int] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None
+    ) -> bool:
+        """Move a task into a terminal status and acknowledge its stream entry"""
+        try:
+            task_data = self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for status update")
+                return False
+
+            _apply_finished(task_data, status, progress, result, error_message)
+            success = self._store_task_update(task_id, task_data)
+
+            if success:
+                self._acknowledge_task(task_data)
 
             return success
 
@@ -209,6 +494,24 @@ class TaskQueueService(RedisService):
             logger.error(f"Failed to update task {task_id} status: {e}")
             return False
 
+    def _store_task_record(self, task_id: str, task_data: Dict[str, Any]) -> bool:
+        """Overwrite an existing task record and its filter index entry in one round trip"""
+        pipe = self.client.pipeline()
+        pipe.set(self._make_key(task_id), self._serialize_json(task_data), ex=RedisConfig.TASK_TTL, xx=True)
+        pipe.hset(self._filter_index_key, task_id, _filter_value(task_data))
+        return bool(pipe.execute()[0])
+
+    def _store_task_update(self, task_id: str, task_data: Dict[str, Any]) -> bool:
+        """Persist an updated task record and log the outcome"""
+        success = self._store_task_record(task_id, task_data)
+
+        if success:
+            logger.info(f"Updated task {task_id} status to {task_data['status']}")
+        else:
+            logger.error(f"Failed to update task {task_id} status")
+
+        return success
+
     def cancel_task(self, task_id: str) -> bool:
         """
         Cancel a pending or running task
@@ -229,7 +532,7 @@ class TaskQueueService(RedisService):
             current_status = TaskStatus(task_data["status"])
 
             # Only allow cancellation of pending or running tasks
-            if current_status not in [TaskStatus.PENDING, TaskStatus.RUNNING]:
+            if current_status not in _CANCELLABLE_STATUSES:
                 logger.warning(f"Task {task_id} cannot be cancelled in status {current_status}")
                 return False
 
@@ -280,7 +583,7 @@ class TaskQueueService(RedisService):
             if success:
                 # Re-add to priority queue
                 priority = TaskPriority(task_data.get("priority", TaskPriority.NORMAL.value))
-                self._add_to_priority_queue(task_id, priority)
+                self._enqueue_task(task_id, priority)
                 logger.info(f"Retrying task {task_id}")
 
             return success
@@ -309,31 +612,43 @@ class TaskQueueService(RedisService):
             List of task data dictionaries
         """
         try:
-            all_keys = self.get_keys_by_pattern("*")
+            if session_id:
+                index_key = self._session_index_key(session_id)
+            else:
+                index_key = self._all_tasks_index_key
+
+            # Walk the index newest first, checking filters against the small filter
+            # index and fetching full records only for the tasks that are returned
             tasks = []
+            expired_ids = []
+            start = 0
 
-            for task_id in all_keys:
-                if len(tasks) >= limit:
+            while len(tasks) < limit:
+                task_ids = self.client.zrevrange(index_key, start, start + LIST_TASKS_PAGE_SIZE - 1)
+                if not task_ids:
                     break
+                start += len(task_ids)
 
-                task_data = self.get_json(task_id)
-                if not task_data:
-                    continue
-
-                # Apply filters
-                if session_id and task_data.get("session_id") != session_id:
-                    continue
-
-                if status and task_data.get("status") != status.value:
-                    continue
+                if status or task_type:
+                    filter_values = self.client.hmget(self._filter_index_key, task_ids)
+                    task_ids = [
+                        task_id for task_id, filter_value in zip(task_ids, filter_values)
+                        if _matches_filters(filter_value, status, task_type)
+                    ]
 
-                if task_type and task_data.get("task_type") != task_type.value:
+                task_ids = task_ids[:limit - len(tasks)]
+                if not task_ids:
                     continue
 
-                tasks.append(task_data)
+                raw_tasks = self.client.mget([self._make_key(task_id) for task_id in task_ids])
+                for task_id, raw_task in zip(task_ids, raw_tasks):
+                    if raw_task is None:
+                        expired_ids.append(task_id)
+                    else:
+                        tasks.append(self._deserialize_json(raw_task))
 
-            # Sort by created_at (newest first)
-            tasks.sort(key=lambda x: x.get("created_at", ""), reverse=True)
+            if expired_ids:
+                self._prune_task_index(expired_ids, index_key)
 
             logger.debug(f"Listed {len(tasks)} tasks with filters: session_id={session_id}, status={status}, task_type={task_type}")
             return tasks
@@ -342,29 +657,44 @@ class TaskQueueService(RedisService):
             logger.error(f"Failed to list tasks: {e}")
             return []
 
-    def get_next_task(self, worker_id: str) -> Optional[Dict[str, Any]]:
+    def get_next_task(
+        self,
+        worker_id: str,
+        block_ms: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get next pending task for worker to process (priority queue)
+        Get next pending task for worker to process (priority streams)
 
         Args:
-            worker_id: ID of worker requesting task
+            worker_id: ID of worker requesting task (consumer name in the group)
+            block_ms: Wait up to this many milliseconds for a task when all
+                streams are empty instead of returning immediately
 
         Returns:
             Task data dictionary or None if no tasks available
         """
         try:
-            # Check priority queues in order (urgent, high, normal, low)
-            for priority in [TaskPriority.URGENT, TaskPriority.HIGH, TaskPriority.NORMAL, TaskPriority.LOW]:
-                queue_key = f"queue:{priority.value}"
-                task_id = self.client.lpop(self._make_key(queue_key))
-
-                if task_id:
-                    task_data = self.get_json(task_id)
-                    if task_data and task_data.get("status") == TaskStatus.PENDING.value:
-                        # Mark as running
-                        self.update_task_status(task_id, TaskStatus.RUNNING, worker_id=worker_id)
-                        logger.info(f"Assigned task {task_id} to worker {worker_id}")
-                        return task_data
+            self._ensure_consumer_groups()
+
+            # Check priority streams in order (urgent, high, normal, low)
+            for _, stream_key in self._dispatch_streams:
+                entries = self.client.xreadgroup(
+                    WORKER_GROUP,
+                    worker_id,
+                    {stream_key: ">"},
+                    count=1
+                )
+
+                for stream_key, messages in entries:
+                    for message_id, fields in messages:
+                        task_data = self._claim_task(stream_key, message_id, fields, worker_id)
+                        if task_data:
+                            return task_data
+
+            if block_ms:
+                task_data = self._wait_for_task(worker_id, block_ms)
+                if task_data:
+                    return task_data
 
             logger.debug(f"No tasks available for worker {worker_id}")
             return None
@@ -373,6 +703,58 @@ class TaskQueueService(RedisService):
             logger.error(f"Failed to get next task for worker {worker_id}: {e}")
             return None
 
+    def reclaim_stale_tasks(
+        self,
+        worker_id: str,
+        min_idle_ms: int = STALE_TASK_IDLE_MS,
+        count: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        Take over tasks delivered to workers that stopped acknowledging them
+
+        Args:
+            worker_id: ID of worker taking over the tasks
+            min_idle_ms: Minimum time an entry must have been pending
+            count: Maximum number of entries to claim per priority stream
+
+        Returns:
+            List of reclaimed task data dictionaries, now assigned to worker_id
+        """
+        try:
+            self._ensure_consumer_groups()
+            reclaimed = []
+
+            for _, stream_key in self._dispatch_streams:
+                response = self.client.xautoclaim(
+                    stream_key,
+                    WORKER_GROUP,
+                    worker_id,
+                    min_idle_ms,
+                    count=count
+                )
+
+                for message_id, fields in response[1]:
+                    task_id = (fields or {}).get("task_id")
+                    task_data = self.get_json(task_id) if task_id else None
+
+                    if not task_data or task_data.get("status") != TaskStatus.RUNNING.value:
+                        # Task expired or already settled; nothing left to recover
+                        self._ack_stream_entry(stream_key, message_id)
+                        continue
+
+                    task_data["worker_id"] = worker_id
+                    task_data["queue_message_id"] = message_id
+                    task_data["updated_at"] = utc_now_iso()
+                    self.set_json(task_id, task_data, RedisConfig.TASK_TTL, only_if_exists=True)
+                    reclaimed.append(task_data)
+                    logger.info(f"Reclaimed stale task {task_id} for worker {worker_id}")
+
+            return reclaimed
+
+        except Exception as e:
+            logger.error(f"Failed to reclaim stale tasks for worker {worker_id}: {e}")
+            return []
+
     def cleanup_expired_tasks(self) -> int:
         """
         Clean up expired tasks and stale queue entries
@@ -381,21 +763,30 @@ class TaskQueueService(RedisService):
             Number of tasks cleaned up
         """
         try:
-            all_keys = self.get_keys_by_pattern("*")
+            all_keys = self._get_task_ids()
             cleaned_count = 0
 
             for task_id in all_keys:
                 if not self.exists(task_id):
                     cleaned_count += 1
 
-            # Clean up priority queues
-            for priority in TaskPriority:
-                queue_key = f"queue:{priority.value}"
-                # Remove stale task IDs from queues
-                queue_items = self.client.lrange(self._make_key(queue_key), 0, -1)
-                for task_id in queue_items:
-                    if not self.exists(task_id):
-                        self.client.lrem(self._make_key(queue_key), 0, task_id)
+            # Drop listing index entries whose task record has expired
+            filter_entries = self.client.hscan_iter(self._filter_index_key, count=CLEANUP_BATCH_SIZE)
+            for batch in chunked((task_id for task_id, _ in filter_entries), CLEANUP_BATCH_SIZE):
+                pipe = self.client.pipeline(transaction=False)
+                for task_id in batch:
+                    pipe.exists(self._make_key(task_id))
+                expired_ids = [task_id for task_id, exists in zip(batch, pipe.execute()) if not exists]
+                if expired_ids:
+                    self._prune_task_index(expired_ids)
+
+            # Clean up priority streams
+            for stream_key in self._stream_keys.values():
+                # Remove entries whose task record has expired
+                for message_id, fields in self.client.xrange(stream_key):
+                    task_id = (fields or {}).get("task_id")
+                    if not task_id or not self.exists(task_id):
+                        self._ack_stream_entry(stream_key, message_id)
 
             logger.info(f"Cleaned up {cleaned_count} expired tasks")
             return cleaned_count
@@ -404,30 +795,520 @@ class TaskQueueService(RedisService):
             logger.error(f"Failed to cleanup expired tasks: {e}")
             return 0
 
-    def _add_to_priority_queue(self, task_id: str, priority: TaskPriority):
-        """Add task to priority queue"""
+    def _get_task_ids(self) -> List[str]:
+        """List stored task IDs, skipping stream and index keys"""
+        return [key for key in self.get_keys_by_pattern("*") if not key.startswith(_NON_TASK_KEY_PREFIXES)]
+
+    def _prune_task_index(self, task_ids: List[str], index_key: Optional[str] = None):
+        """Remove expired tasks from the listing indexes and the filter index"""
+        pipe = self.client.pipeline()
+        if index_key and index_key != self._all_tasks_index_key:
+            pipe.zrem(index_key, *task_ids)
+        pipe.zrem(self._all_tasks_index_key, *task_ids)
+        pipe.hdel(self._filter_index_key, *task_ids)
+        pipe.execute()
+
+    def _ensure_consumer_groups(self):
+        """Create the worker consumer group on every priority stream once"""
+        if self._consumer_groups_ready:
+            return
+
+        for stream_key in self._stream_keys.values():
+            try:
+                self.client.xgroup_create(stream_key, WORKER_GROUP, id="0", mkstream=True)
+            except ResponseError as e:
+                # BUSYGROUP: the group already exists
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+        self._consumer_groups_ready = True
+
+    def _claim_task(
+        self,
+        stream_key: str,
+        message_id: str,
+        fields: Dict[str, str],
+        worker_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Mark a delivered stream entry's task as running, or drop it if it is stale"""
+        task_id = (fields or {}).get("task_id")
+        task_data = self.get_json(task_id) if task_id else None
+
+        if not task_data or task_data.get("status") != TaskStatus.PENDING.value:
+            # Expired, cancelled or already handled elsewhere
+            self._ack_stream_entry(stream_key, message_id)
+            return None
+
+        # Mark as running and remember the entry so completion can acknowledge it
+        _apply_claim(task_data, worker_id, message_id)
+
+        if not self._store_task_record(task_id, task_data):
+            logger.error(f"Failed to mark task {task_id} as running")
+            return None
+
+        logger.info(f"Assigned task {task_id} to worker {worker_id}")
+        return task_data
+
+    def _wait_for_task(self, worker_id: str, block_ms: int) -> Optional[Dict[str, Any]]:
+        """Block on all priority streams until an entry is delivered or the timeout passes"""
+        entries = self.client.xreadgroup(
+            WORKER_GROUP,
+            worker_id,
+            {stream_key: ">" for _, stream_key in self._dispatch_streams},
+            count=1,
+            block=block_ms
+        )
+
+        # Entries arriving together on several streams are delivered at once;
+        # keep the highest priority one and hand the rest back to the group
+        delivered = {stream_key: messages for stream_key, messages in entries or []}
+        task_data = None
+
+        for priority, stream_key in self._dispatch_streams:
+            for message_id, fields in delivered.get(stream_key, []):
+                if task_data is None:
+                    task_data = self._claim_task(stream_key, message_id, fields, worker_id)
+                    continue
+
+                self._ack_stream_entry(stream_key, message_id)
+                task_id = (fields or {}).get("task_id")
+                if task_id:
+                    self._enqueue_task(task_id, priority)
+
+        return task_data
+
+    def _ack_stream_entry(self, stream_key: str, message_id: str):
+        """Acknowledge and delete a stream entry"""
+        pipe = self.client.pipeline()
+        pipe.xack(stream_key, WORKER_GROUP, message_id)
+        pipe.xdel(stream_key, message_id)
+        pipe.execute()
+
+    def _enqueue_task(self, task_id: str, priority: TaskPriority):
+        """Append task to its priority stream"""
+        try:
+            self._ensure_consumer_groups()
+            self.client.xadd(self._stream_keys[priority], {"task_id": task_id})
+            logger.debug(f"Added task {task_id} to {priority.value} priority stream")
+
+        except Exception as e:
+            logger.error(f"Failed to add task {task_id} to priority stream: {e}")
+
+    def _acknowledge_task(self, task_data: Dict[str, Any]):
+        """Acknowledge the stream entry a worker consumed for this task"""
+        task_id = task_data.get("task_id")
+        try:
+            message_id = task_data.get("queue_message_id")
+            if not message_id:
+                # Never dequeued; a worker will drop the entry when it reads it
+                return
+
+            priority = TaskPriority(task_data.get("priority", TaskPriority.NORMAL.value))
+            self._ack_stream_entry(self._stream_keys[priority], message_id)
+            logger.debug(f"Acknowledged task {task_id} on {priority.value} priority stream")
+
+        except Exception as e:
+            logger.error(f"Failed to acknowledge task {task_id} on priority stream: {e}")
+
+class AsyncTaskQueueService(_TaskQueueKeys, AsyncRedisService):
+    """Task queue service on the asyncio Redis client for use inside the event loop.
+
+    Shares the key layout and record format of TaskQueueService, so tasks
+    submitted through either service are visible to both.
+    """
+
+    def __init__(self):
+        """Initialize async task queue service with Redis connection"""
+        super().__init__(RedisConfig.TASK_PREFIX)
+        self._consumer_groups_ready = False
+        self._init_queue_keys()
+        logger.info("AsyncTaskQueueService initialized")
+
+    async def submit_task(
+        self,
+        task_type: TaskType,
+        input_data: Dict[str, Any],
+        session_id: str,
+        priority: TaskPriority = TaskPriority.NORMAL,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Submit a new task to the queue (see TaskQueueService.submit_task)"""
+        try:
+            task_id = str(uuid.uuid4())
+            task_data = _new_task_record(task_id, task_type, input_data, session_id, priority, metadata)
+
+            session_index_key = self._session_index_key(session_id)
+            submitted_at = time.time()
+            async with self.client.pipeline() as pipe:
+                pipe.setex(self._make_key(task_id), RedisConfig.TASK_TTL, self._serialize_json(task_data))
+                pipe.zadd(session_index_key, {task_id: submitted_at})
+                pipe.expire(session_index_key, RedisConfig.TASK_TTL)
+                pipe.zadd(self._all_tasks_index_key, {task_id: submitted_at})
+                pipe.hset(self._filter_index_key, task_id, _filter_value(task_data))
+                success = (await pipe.execute())[0]
+
+            if not success:
+                raise TaskQueueServiceError(f"Failed to store task data for {task_id}")
+
+            await self._enqueue_task(task_id, priority)
+
+            logger.info(f"Submitted task {task_id} of type {task_type} for session {session_id}")
+            return task_id
+
+        except Exception as e:
+            logger.error(f"Failed to submit task: {e}")
+            raise TaskQueueServiceError(f"Task submission failed: {e}")
+
+    async def get_task(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve task data by ID"""
         try:
-            queue_key = f"queue:{priority.value}"
-            self.client.rpush(self._make_key(queue_key), task_id)
-            logger.debug(f"Added task {task_id} to {priority.value} priority queue")
+            task_data = await self.get_json(task_id)
+
+            if not task_data:
+                logger.debug(f"Task {task_id} not found")
+                return None
+
+            logger.debug(f"Retrieved task {task_id}")
+            return task_data
 
         except Exception as e:
-            logger.error(f"Failed to add task {task_id} to priority queue: {e}")
+            logger.error(f"Failed to get task {task_id}: {e}")
+            return None
+
+    async def update_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        progress: Optional[int] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None,
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """Update task status and related fields (see TaskQueueService.update_task_status)"""
+        if status == TaskStatus.RUNNING:
+            return await self.mark_running(task_id, worker_id, progress=progress)
+
+        if status in _TERMINAL_STATUSES:
+            return await self._finish_task(task_id, status, progress, result, error_message)
 
-    def _remove_from_priority_queue(self, task_id: str):
-        """Remove task from all priority queues"""
         try:
-            for priority in TaskPriority:
-                queue_key = f"queue:{priority.value}"
-                self.client.lrem(self._make_key(queue_key), 0, task_id)
+            task_data = await self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for status update")
+                return False
 
-            logger.debug(f"Removed task {task_id} from priority queues")
+            _apply_status(task_data, status, progress)
+            return await self._store_task_update(task_id, task_data)
 
         except Exception as e:
-            logger.error(f"Failed to remove task {task_id} from priority queues: {e}")
+            logger.error(f"Failed to update task {task_id} status: {e}")
+            return False
 
-# Global service instance
+    async def mark_running(
+        self,
+        task_id: str,
+        worker_id: Optional[str] = None,
+        progress: Optional[int] = None
+    ) -> bool:
+        """Mark a task as running"""
+        try:
+            task_data = await self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for status update")
+                return False
+
+            _apply_running(task_data, worker_id, progress)
+            return await self._store_task_update(task_id, task_data)
+
+        except Exception as e:
+            logger.error(f"Failed to mark task {task_id} as running: {e}")
+            return False
+
+    async def mark_completed(
+        self,
+        task_id: str,
+        result: Optional[Dict[str, Any]] = None,
+        progress: Optional[int] = 100
+    ) -> bool:
+        """Mark a task as completed and store its result"""
+        return await self._finish_task(task_id, TaskStatus.COMPLETED, progress, result=result)
+
+    async def mark_failed(
+        self,
+        task_id: str,
+        error_message: Optional[str] = None,
+        progress: Optional[int] = None
+    ) -> bool:
+        """Mark a task as failed"""
+        return await self._finish_task(task_id, TaskStatus.FAILED, progress, error_message=error_message)
+
+    async def update_progress(self, task_id: str, progress: int) -> bool:
+        """Update only the progress of a task, leaving its status untouched"""
+        try:
+            task_data = await self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for progress update")
+                return False
+
+            _apply_progress(task_data, progress)
+            success = await self.set_json(task_id, task_data, RedisConfig.TASK_TTL, only_if_exists=True)
+
+            if success:
+                logger.debug(f"Updated task {task_id} progress to {progress}")
+            else:
+                logger.error(f"Failed to update task {task_id} progress")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to update task {task_id} progress: {e}")
+            return False
+
+    async def list_tasks(
+        self,
+        session_id: Optional[str] = None,
+        status: Optional[TaskStatus] = None,
+        task_type: Optional[TaskType] = None,
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """List tasks with optional filtering (see TaskQueueService.list_tasks)"""
+        try:
+            if session_id:
+                index_key = self._session_index_key(session_id)
+            else:
+                index_key = self._all_tasks_index_key
+
+            tasks = []
+            expired_ids = []
+            start = 0
+
+            while len(tasks) < limit:
+                task_ids = await self.client.zrevrange(index_key, start, start + LIST_TASKS_PAGE_SIZE - 1)
+                if not task_ids:
+                    break
+                start += len(task_ids)
+
+                if status or task_type:
+                    filter_values = await self.client.hmget(self._filter_index_key, task_ids)
+                    task_ids = [
+                        task_id for task_id, filter_value in zip(task_ids, filter_values)
+                        if _matches_filters(filter_value, status, task_type)
+                    ]
+
+                task_ids = task_ids[:limit - len(tasks)]
+                if not task_ids:
+                    continue
+
+                raw_tasks = await self.client.mget([self._make_key(task_id) for task_id in task_ids])
+                for task_id, raw_task in zip(task_ids, raw_tasks):
+                    if raw_task is None:
+                        expired_ids.append(task_id)
+                    else:
+                        tasks.append(self._deserialize_json(raw_task))
+
+            if expired_ids:
+                await self._prune_task_index(expired_ids, index_key)
+
+            logger.debug(f"Listed {len(tasks)} tasks with filters: session_id={session_id}, status={status}, task_type={task_type}")
+            return tasks
+
+        except Exception as e:
+            logger.error(f"Failed to list tasks: {e}")
+            return []
+
+    async def get_next_task(
+        self,
+        worker_id: str,
+        block_ms: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get next pending task for worker to process (see TaskQueueService.get_next_task)"""
+        try:
+            await self._ensure_consumer_groups()
+
+            for _, stream_key in self._dispatch_streams:
+                entries = await self.client.xreadgroup(
+                    WORKER_GROUP,
+                    worker_id,
+                    {stream_key: ">"},
+                    count=1
+                )
+
+                for stream_key, messages in entries:
+                    for message_id, fields in messages:
+                        task_data = await self._claim_task(stream_key, message_id, fields, worker_id)
+                        if task_data:
+                            return task_data
+
+            if block_ms:
+                task_data = await self._wait_for_task(worker_id, block_ms)
+                if task_data:
+                    return task_data
+
+            logger.debug(f"No tasks available for worker {worker_id}")
+            return None
+
+        except Exception as e:
+            logger.error(f"Failed to get next task for worker {worker_id}: {e}")
+            return None
+
+    async def _finish_task(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        progress: Optional[int] = None,
+        result: Optional[Dict[str, Any]] = None,
+        error_message: Optional[str] = None
+    ) -> bool:
+        """Move a task into a terminal status and acknowledge its stream entry"""
+        try:
+            task_data = await self.get_json(task_id)
+
+            if not task_data:
+                logger.warning(f"Task {task_id} not found for status update")
+                return False
+
+            _apply_finished(task_data, status, progress, result, error_message)
+            success = await self._store_task_update(task_id, task_data)
+
+            if success:
+                await self._acknowledge_task(task_data)
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to update task {task_id} status: {e}")
+            return False
+
+    async def _store_task_record(self, task_id: str, task_data: Dict[str, Any]) -> bool:
+        """Overwrite an existing task record and its filter index entry in one round trip"""
+        async with self.client.pipeline() as pipe:
+            pipe.set(self._make_key(task_id), self._serialize_json(task_data), ex=RedisConfig.TASK_TTL, xx=True)
+            pipe.hset(self._filter_index_key, task_id, _filter_value(task_data))
+            return bool((await pipe.execute())[0])
+
+    async def _store_task_update(self, task_id: str, task_data: Dict[str, Any]) -> bool:
+        """Persist an updated task record and log the outcome"""
+        success = await self._store_task_record(task_id, task_data)
+
+        if success:
+            logger.info(f"Updated task {task_id} status to {task_data['status']}")
+        else:
+            logger.error(f"Failed to update task {task_id} status")
+
+        return success
+
+    async def _prune_task_index(self, task_ids: List[str], index_key: Optional[str] = None):
+        """Remove expired tasks from the listing indexes and the filter index"""
+        async with self.client.pipeline() as pipe:
+            if index_key and index_key != self._all_tasks_index_key:
+                pipe.zrem(index_key, *task_ids)
+            pipe.zrem(self._all_tasks_index_key, *task_ids)
+            pipe.hdel(self._filter_index_key, *task_ids)
+            await pipe.execute()
+
+    async def _ensure_consumer_groups(self):
+        """Create the worker consumer group on every priority stream once"""
+        if self._consumer_groups_ready:
+            return
+
+        for stream_key in self._stream_keys.values():
+            try:
+                await self.client.xgroup_create(stream_key, WORKER_GROUP, id="0", mkstream=True)
+            except ResponseError as e:
+                # BUSYGROUP: the group already exists
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+        self._consumer_groups_ready = True
+
+    async def _claim_task(
+        self,
+        stream_key: str,
+        message_id: str,
+        fields: Dict[str, str],
+        worker_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """Mark a delivered stream entry's task as running, or drop it if it is stale"""
+        task_id = (fields or {}).get("task_id")
+        task_data = await self.get_json(task_id) if task_id else None
+
+        if not task_data or task_data.get("status") != TaskStatus.PENDING.value:
+            await self._ack_stream_entry(stream_key, message_id)
+            return None
+
+        _apply_claim(task_data, worker_id, message_id)
+
+        if not await self._store_task_record(task_id, task_data):
+            logger.error(f"Failed to mark task {task_id} as running")
+            return None
+
+        logger.info(f"Assigned task {task_id} to worker {worker_id}")
+        return task_data
+
+    async def _wait_for_task(self, worker_id: str, block_ms: int) -> Optional[Dict[str, Any]]:
+        """Block on all priority streams until an entry is delivered or the timeout passes"""
+        entries = await self.client.xreadgroup(
+            WORKER_GROUP,
+            worker_id,
+            {stream_key: ">" for _, stream_key in self._dispatch_streams},
+            count=1,
+            block=block_ms
+        )
+
+        delivered = {stream_key: messages for stream_key, messages in entries or []}
+        task_data = None
+
+        for priority, stream_key in self._dispatch_streams:
+            for message_id, fields in delivered.get(stream_key, []):
+                if task_data is None:
+                    task_data = await self._claim_task(stream_key, message_id, fields, worker_id)
+                    continue
+
+                await self._ack_stream_entry(stream_key, message_id)
+                task_id = (fields or {}).get("task_id")
+                if task_id:
+                    await self._enqueue_task(task_id, priority)
+
+        return task_data
+
+    async def _ack_stream_entry(self, stream_key: str, message_id: str):
+        """Acknowledge and delete a stream entry"""
+        async with self.client.pipeline() as pipe:
+            pipe.xack(stream_key, WORKER_GROUP, message_id)
+            pipe.xdel(stream_key, message_id)
+            await pipe.execute()
+
+    async def _enqueue_task(self, task_id: str, priority: TaskPriority):
+        """Append task to its priority stream"""
+        try:
+            await self._ensure_consumer_groups()
+            await self.client.xadd(self._stream_keys[priority], {"task_id": task_id})
+            logger.debug(f"Added task {task_id} to {priority.value} priority stream")
+
+        except Exception as e:
+            logger.error(f"Failed to add task {task_id} to priority stream: {e}")
+
+    async def _acknowledge_task(self, task_data: Dict[str, Any]):
+        """Acknowledge the stream entry a worker consumed for this task"""
+        task_id = task_data.get("task_id")
+        try:
+            message_id = task_data.get("queue_message_id")
+            if not message_id:
+                return
+
+            priority = TaskPriority(task_data.get("priority", TaskPriority.NORMAL.value))
+            await self._ack_stream_entry(self._stream_keys[priority], message_id)
+            logger.debug(f"Acknowledged task {task_id} on {priority.value} priority stream")
+
+        except Exception as e:
+            logger.error(f"Failed to acknowledge task {task_id} on priority stream: {e}")
+
+# Global service instances
 _task_queue_service: Optional[TaskQueueService] = None
+_async_task_queue_service: Optional[AsyncTaskQueueService] = None
 
 def get_task_queue_service() -> TaskQueueService:
     """Get global task queue service instance"""
@@ -436,4 +1317,13 @@ def get_task_queue_service() -> TaskQueueService:
     if _task_queue_service is None:
         _task_queue_service = TaskQueueService()
 
-    return _task_queue_service
\ No newline at end of file
+    return _task_queue_service
+
+def get_async_task_queue_service() -> AsyncTaskQueueService:
+    """Get global async task queue service instance"""
+    global _async_task_queue_service
+
+    if _async_task_queue_service is None:
+        _async_task_queue_service = AsyncTaskQueueService()
+
+    return _async_task_queue_service
@@ -4,23 +4,88 @@ Handles form data, component state, and session-tied UI persistence.
 """
 import json
 import logging
-from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 
-from ..lib.redis import RedisService, RedisConfig
+from ..lib.redis import RedisService, AsyncRedisService, RedisConfig, chunked, utc_now_iso
 
 logger = logging.getLogger(__name__)
 
+# Keys fetched per SCAN call and checked per pipelined EXISTS round trip during cleanup
+CLEANUP_BATCH_SIZE = 500
+
 class UIStateServiceError(Exception):
     """Custom exception for UI state service operations"""
     pass
 
-class UIStateService(RedisService):
+def _new_ui_state(
+    session_id: str,
+    component_name: str,
+    state_data: Dict[str, Any],
+    form_data: Optional[Dict[str, Any]] = None,
+    metadata: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """Build the stored record for a component state"""
+    now = utc_now_iso()
+
+    return {
+        "session_id": session_id,
+        "component_name": component_name,
+        "state_data": state_data,
+        "form_data": form_data or {},
+        "metadata": metadata or {},
+        "created_at": now,
+        "updated_at": now
+    }
+
+def _apply_ui_updates(
+    ui_state: Dict[str, Any],
+    state_updates: Optional[Dict[str, Any]],
+    form_updates: Optional[Dict[str, Any]],
+    metadata_updates: Optional[Dict[str, Any]]
+):
+    """Merge partial updates into a stored component state"""
+    if state_updates:
+        ui_state["state_data"].update(state_updates)
+
+    if form_updates:
+        ui_state["form_data"].update(form_updates)
+
+    if metadata_updates:
+        ui_state["metadata"].update(metadata_updates)
+
+    ui_state["updated_at"] = utc_now_iso()
+
+def _merge_form_data(
+    raw_state: Optional[str],
+    session_id: str,
+    component_name: str,
+    form_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Merge form fields into a stored component state, or build a new one if none exists"""
+    if not raw_state:
+        return _new_ui_state(session_id, component_name, {}, form_data)
+
+    ui_state = json.loads(raw_state)
+    if not isinstance(ui_state.get("form_data"), dict):
+        ui_state["form_data"] = {}
+    ui_state["form_data"].update(form_data)
+    ui_state["updated_at"] = utc_now_iso()
+    return ui_state
+
+class _UIStateKeys:
+    """Redis key layout shared by the sync and async UI state services"""
+
+    def _session_index_key(self, session_id: str) -> str:
+        """Redis key of the set holding a session's component names"""
+        return self._session_index_prefix + session_id
+
+class UIStateService(_UIStateKeys, RedisService):
     """Redis service for UI component state management"""
 
     def __init__(self):
         """Initialize UI state service with Redis connection"""
         super().__init__(RedisConfig.UI_STATE_PREFIX)
+        self._session_index_prefix = RedisConfig.UI_SESSION_INDEX_PREFIX
         logger.info("UIStateService initialized")
 
     def save_component_state(
@@ -49,24 +114,20 @@ class UIStateService(RedisService):
         """
         try:
             state_key = f"{session_id}:{component_name}"
-            now = datetime.now(timezone.utc).isoformat()
-
-            ui_state = {
-                "session_id": session_id,
-                "component_name": component_name,
-                "state_data": state_data,
-                "form_data": form_data or {},
-                "metadata": metadata or {},
-                "created_at": now,
-                "updated_at": now
-            }
+            ui_state = _new_ui_state(session_id, component_name, state_data, form_data, metadata)
 
             # Check if state already exists to preserve created_at
             existing_state = self.get_json(state_key)
             if existing_state:
-                ui_state["created_at"] = existing_state.get("created_at", now)
+                ui_state["created_at"] = existing_state.get("created_at", ui_state["created_at"])
 
-            success = self.set_json(state_key, ui_state, RedisConfig.UI_STATE_TTL)
+            # Store the state and register it in the session index in one round trip
+            index_key = self._session_index_key(session_id)
+            pipe = self.client.pipeline()
+            pipe.setex(self._make_key(state_key), RedisConfig.UI_STATE_TTL, self._serialize_json(ui_state))
+            pipe.sadd(index_key, component_name)
+            pipe.expire(index_key, RedisConfig.UI_STATE_TTL)
+            success = pipe.execute()[0]
 
             if not success:
                 raise UIStateServiceError(f"Failed to store UI state for {component_name}")
@@ -101,8 +162,11 @@ class UIStateService(RedisService):
                 logger.debug(f"UI state for component {component_name} not found in session {session_id}")
                 return None
 
-            # Extend TTL on access
-            self.expire(state_key, RedisConfig.UI_STATE_TTL)
+            # Extend TTL on access, keeping the session index alive alongside
+            pipe = self.client.pipeline()
+            pipe.expire(self._make_key(state_key), RedisConfig.UI_STATE_TTL)
+            pipe.expire(self._session_index_key(session_id), RedisConfig.UI_STATE_TTL)
+            pipe.execute()
 
             logger.debug(f"Retrieved UI state for component {component_name} in session {session_id}")
             return ui_state
@@ -140,22 +204,13 @@ class UIStateService(RedisService):
                 logger.warning(f"UI state for component {component_name} not found for update")
                 return False
 
-            # Apply updates
-            if state_updates:
-                ui_state["state_data"].update(state_updates)
-
-            if form_updates:
-                ui_state["form_data"].update(form_updates)
-
-            if metadata_updates:
-                ui_state["metadata"].update(metadata_updates)
+            # Apply updates and refresh the timestamp
+            _apply_ui_updates(ui_state, state_updates, form_updates, metadata_updates)
 
-            # Update timestamp
-            ui_state["updated_at"] = datetime.now(timezone.utc).isoformat()
-
-            success = self.set_json(state_key, ui_state, RedisConfig.UI_STATE_TTL)
+            success = self.set_json(state_key, ui_state, RedisConfig.UI_STATE_TTL, only_if_exists=True)
 
             if success:
+                self.client.expire(self._session_index_key(session_id), RedisConfig.UI_STATE_TTL)
                 logger.debug(f"Updated UI state for component {component_name} in session {session_id}")
             else:
                 logger.error(f"Failed to update UI state for component {component_name}")
@@ -183,7 +238,10 @@ class UIStateService(RedisService):
         """
         try:
             state_key = f"{session_id}:{component_name}"
-            success = self.delete(state_key)
+            pipe = self.client.pipeline()
+            pipe.delete(self._make_key(state_key))
+            pipe.srem(self._session_index_key(session_id), component_name)
+            success = bool(pipe.execute()[0])
 
             if success:
                 logger.info(f"Deleted UI state for component {component_name} in session {session_id}")
@@ -212,20 +270,34 @@ class UIStateService(RedisService):
             Dictionary mapping component names to their states
         """
         try:
-            pattern = f"{session_id}:*"
-            if component_prefix:
-                pattern = f"{session_id}:{component_prefix}*"
-
-            matching_keys = self.get_keys_by_pattern(pattern)
+            index_key = self._session_index_key(session_id)
+            component_names = [
+                name for name in self.client.smembers(index_key)
+                if not component_prefix or name.startswith(component_prefix)
+            ]
             ui_states = {}
 
-            for key in matching_keys:
-                # Extract component name from key (remove session_id prefix)
-                component_name = key.replace(f"{session_id}:", "")
-                ui_state = self.get_json(key)
+            if not component_names:
+                return ui_states
 
-                if ui_state:
-                    ui_states[component_name] = ui_state
+            raw_states = self.client.mget(
+                [self._make_key(f"{session_id}:{name}") for name in component_names]
+            )
+            expired_names = []
+
+            for component_name, raw_state in zip(component_names, raw_states):
+                if raw_state is None:
+                    expired_names.append(component_name)
+                    continue
+
+                try:
+                    ui_states[component_name] = self._deserialize_json(raw_state)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to decode UI state for {component_name}: {e}")
+
+            # Drop index entries whose component state has already expired
+            if expired_names:
+                self.client.srem(index_key, *expired_names)
 
             logger.debug(f"Retrieved {len(ui_states)} UI states for session {session_id}")
             return ui_states
@@ -245,13 +317,16 @@ class UIStateService(RedisService):
             Number of component states cleared
         """
         try:
-            pattern = f"{session_id}:*"
-            matching_keys = self.get_keys_by_pattern(pattern)
+            index_key = self._session_index_key(session_id)
+            component_names = self.client.smembers(index_key)
             cleared_count = 0
 
-            for key in matching_keys:
-                if self.delete(key):
-                    cleared_count += 1
+            if component_names:
+                pipe = self.client.pipeline()
+                for component_name in component_names:
+                    pipe.delete(self._make_key(f"{session_id}:{component_name}"))
+                pipe.delete(index_key)
+                cleared_count = sum(pipe.execute()[:-1])
 
             logger.info(f"Cleared {cleared_count} UI states for session {session_id}")
             return cleared_count
@@ -278,23 +353,23 @@ class UIStateService(RedisService):
             True if save successful, False otherwise
         """
         try:
-            existing_state = self.get_component_state(session_id, component_name)
+            state_key = self._make_key(f"{session_id}:{component_name}")
+            index_key = self._session_index_key(session_id)
 
-            if existing_state:
-                # Update existing state
-                return self.update_component_state(
-                    session_id,
-                    component_name,
-                    form_updates=form_data
-                )
-            else:
-                # Create new state with form data
-                return self.save_component_state(
-                    session_id,
-                    component_name,
-                    state_data={},
-                    form_data=form_data
-                )
+            # Merge in Python rather than in a Lua script: re-encoding the record with
+            # cjson would turn empty arrays into objects and round large numbers
+            def upsert(pipe):
+                ui_state = _merge_form_data(pipe.get(state_key), session_id, component_name, form_data)
+                pipe.multi()
+                pipe.setex(state_key, RedisConfig.UI_STATE_TTL, self._serialize_json(ui_state))
+                pipe.sadd(index_key, component_name)
+                pipe.expire(index_key, RedisConfig.UI_STATE_TTL)
+
+            # WATCH the state so a concurrent write retries the merge instead of being lost
+            result = self.client.transaction(upsert, state_key)[0]
+
+            logger.debug(f"Saved form data for component {component_name} in session {session_id}")
+            return bool(result)
 
         except Exception as e:
             logger.error(f"Failed to save form data for component {component_name}: {e}")
@@ -391,12 +466,14 @@ class UIStateService(RedisService):
             Number of states cleaned up
         """
         try:
-            all_keys = self.get_keys_by_pattern("*")
             cleaned_count = 0
+            keys = self.client.scan_iter(match=self._make_key("*"), count=CLEANUP_BATCH_SIZE)
 
-            for key in all_keys:
-                if not self.exists(key):
-                    cleaned_count += 1
+            for batch in chunked(keys, CLEANUP_BATCH_SIZE):
+                pipe = self.client.pipeline(transaction=False)
+                for key in batch:
+                    pipe.exists(key)
+                cleaned_count += pipe.execute().count(0)
 
             logger.info(f"Cleaned up {cleaned_count} expired UI states")
             return cleaned_count
@@ -405,8 +482,247 @@ class UIStateService(RedisService):
             logger.error(f"Failed to cleanup expired UI states: {e}")
             return 0
 
-# Global service instance
+
+class AsyncUIStateService(_UIStateKeys, AsyncRedisService):
+    """UI component state service on the asyncio Redis client for use inside the event loop.
+
+    Reads and writes the same keys and record format as UIStateService.
+    """
+
+    def __init__(self):
+        """Initialize async UI state service with Redis connection"""
+        super().__init__(RedisConfig.UI_STATE_PREFIX)
+        self._session_index_prefix = RedisConfig.UI_SESSION_INDEX_PREFIX
+        logger.info("AsyncUIStateService initialized")
+
+    async def save_component_state(
+        self,
+        session_id: str,
+        component_name: str,
+        state_data: Dict[str, Any],
+        form_data: Optional[Dict[str, Any]] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Save UI component state for a session (see UIStateService.save_component_state)"""
+        try:
+            state_key = f"{session_id}:{component_name}"
+            ui_state = _new_ui_state(session_id, component_name, state_data, form_data, metadata)
+
+            existing_state = await self.get_json(state_key)
+            if existing_state:
+                ui_state["created_at"] = existing_state.get("created_at", ui_state["created_at"])
+
+            index_key = self._session_index_key(session_id)
+            async with self.client.pipeline() as pipe:
+                pipe.setex(self._make_key(state_key), RedisConfig.UI_STATE_TTL, self._serialize_json(ui_state))
+                pipe.sadd(index_key, component_name)
+                pipe.expire(index_key, RedisConfig.UI_STATE_TTL)
+                success = (await pipe.execute())[0]
+
+            if not success:
+                raise UIStateServiceError(f"Failed to store UI state for {component_name}")
+
+            logger.debug(f"Saved UI state for component {component_name} in session {session_id}")
+            return True
+
+        except Exception as e:
+            logger.error(f"Failed to save UI component state: {e}")
+            raise UIStateServiceError(f"UI state saving failed: {e}")
+
+    async def get_component_state(
+        self,
+        session_id: str,
+        component_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Retrieve UI component state, extending its TTL"""
+        try:
+            state_key = f"{session_id}:{component_name}"
+            ui_state = await self.get_json(state_key)
+
+            if not ui_state:
+                logger.debug(f"UI state for component {component_name} not found in session {session_id}")
+                return None
+
+            async with self.client.pipeline() as pipe:
+                pipe.expire(self._make_key(state_key), RedisConfig.UI_STATE_TTL)
+                pipe.expire(self._session_index_key(session_id), RedisConfig.UI_STATE_TTL)
+                await pipe.execute()
+
+            logger.debug(f"Retrieved UI state for component {component_name} in session {session_id}")
+            return ui_state
+
+        except Exception as e:
+            logger.error(f"Failed to get UI component state for {component_name}: {e}")
+            return None
+
+    async def update_component_state(
+        self,
+        session_id: str,
+        component_name: str,
+        state_updates: Optional[Dict[str, Any]] = None,
+        form_updates: Optional[Dict[str, Any]] = None,
+        metadata_updates: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """Update specific parts of UI component state"""
+        try:
+            state_key = f"{session_id}:{component_name}"
+            ui_state = await self.get_json(state_key)
+
+            if not ui_state:
+                logger.warning(f"UI state for component {component_name} not found for update")
+                return False
+
+            _apply_ui_updates(ui_state, state_updates, form_updates, metadata_updates)
+
+            success = await self.set_json(state_key, ui_state, RedisConfig.UI_STATE_TTL, only_if_exists=True)
+
+            if success:
+                await self.client.expire(self._session_index_key(session_id), RedisConfig.UI_STATE_TTL)
+                logger.debug(f"Updated UI state for component {component_name} in session {session_id}")
+            else:
+                logger.error(f"Failed to update UI state for component {component_name}")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to update UI component state: {e}")
+            return False
+
+    async def delete_component_state(
+        self,
+        session_id: str,
+        component_name: str
+    ) -> bool:
+        """Delete UI component state"""
+        try:
+            state_key = f"{session_id}:{component_name}"
+            async with self.client.pipeline() as pipe:
+                pipe.delete(self._make_key(state_key))
+                pipe.srem(self._session_index_key(session_id), component_name)
+                success = bool((await pipe.execute())[0])
+
+            if success:
+                logger.info(f"Deleted UI state for component {component_name} in session {session_id}")
+            else:
+                logger.warning(f"UI state for component {component_name} not found for deletion")
+
+            return success
+
+        except Exception as e:
+            logger.error(f"Failed to delete UI component state: {e}")
+            return False
+
+    async def get_session_ui_states(
+        self,
+        session_id: str,
+        component_prefix: Optional[str] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get all UI component states for a session"""
+        try:
+            index_key = self._session_index_key(session_id)
+            component_names = [
+                name for name in await self.client.smembers(index_key)
+                if not component_prefix or name.startswith(component_prefix)
+            ]
+            ui_states = {}
+
+            if not component_names:
+                return ui_states
+
+            raw_states = await self.client.mget(
+                [self._make_key(f"{session_id}:{name}") for name in component_names]
+            )
+            expired_names = []
+
+            for component_name, raw_state in zip(component_names, raw_states):
+                if raw_state is None:
+                    expired_names.append(component_name)
+                    continue
+
+                try:
+                    ui_states[component_name] = self._deserialize_json(raw_state)
+                except json.JSONDecodeError as e:
+                    logger.error(f"Failed to decode UI state for {component_name}: {e}")
+
+            if expired_names:
+                await self.client.srem(index_key, *expired_names)
+
+            logger.debug(f"Retrieved {len(ui_states)} UI states for session {session_id}")
+            return ui_states
+
+        except Exception as e:
+            logger.error(f"Failed to get session UI states for {session_id}: {e}")
+            return {}
+
+    async def clear_session_ui_states(self, session_id: str) -> int:
+        """Clear all UI component states for a session"""
+        try:
+            index_key = self._session_index_key(session_id)
+            component_names = await self.client.smembers(index_key)
+            cleared_count = 0
+
+            if component_names:
+                async with self.client.pipeline() as pipe:
+                    for component_name in component_names:
+                        pipe.delete(self._make_key(f"{session_id}:{component_name}"))
+                    pipe.delete(index_key)
+                    cleared_count = sum((await pipe.execute())[:-1])
+
+            logger.info(f"Cleared {cleared_count} UI states for session {session_id}")
+            return cleared_count
+
+        except Exception as e:
+            logger.error(f"Failed to clear UI states for session {session_id}: {e}")
+            return 0
+
+    async def save_form_data(
+        self,
+        session_id: str,
+        component_name: str,
+        form_data: Dict[str, Any]
+    ) -> bool:
+        """Merge form data into a component's state, creating it if needed"""
+        try:
+            state_key = self._make_key(f"{session_id}:{component_name}")
+            index_key = self._session_index_key(session_id)
+
+            async def upsert(pipe):
+                ui_state = _merge_form_data(await pipe.get(state_key), session_id, component_name, form_data)
+                pipe.multi()
+                pipe.setex(state_key, RedisConfig.UI_STATE_TTL, self._serialize_json(ui_state))
+                pipe.sadd(index_key, component_name)
+                pipe.expire(index_key, RedisConfig.UI_STATE_TTL)
+
+            result = (await self.client.transaction(upsert, state_key))[0]
+
+            logger.debug(f"Saved form data for component {component_name} in session {session_id}")
+            return bool(result)
+
+        except Exception as e:
+            logger.error(f"Failed to save form data for component {component_name}: {e}")
+            return False
+
+    async def get_form_data(
+        self,
+        session_id: str,
+        component_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """Get only the form data for a component"""
+        try:
+            ui_state = await self.get_component_state(session_id, component_name)
+
+            if not ui_state:
+                return None
+
+            return ui_state.get("form_data", {})
+
+        except Exception as e:
+            logger.error(f"Failed to get form data for component {component_name}: {e}")
+            return None
+
+# Global service instances
 _ui_state_service: Optional[UIStateService] = None
+_async_ui_state_service: Optional[AsyncUIStateService] = None
 
 def get_ui_state_service() -> UIStateService:
     """Get global UI state service instance"""
@@ -415,4 +731,13 @@ def get_ui_state_service() -> UIStateService:
     if _ui_state_service is None:
         _ui_state_service = UIStateService()
 
-    return _ui_state_service
\ No newline at end of file
+    return _ui_state_service
+
+def get_async_ui_state_service() -> AsyncUIStateService:
+    """Get global async UI state service instance"""
+    global _async_ui_state_service
+
+    if _async_ui_state_service is None:
+        _async_ui_state_service = AsyncUIStateService()
+
+    return _async_ui_state_service
@@ -1,10 +1,18 @@
 """
 VeoVideoService for AI-powered video generation using Google's Veo models.
 """
+import asyncio
+import hashlib
+import os
+import re
 import time
 import json
 import logging
+import tempfile
+import threading
 import uuid
+from collections import deque
+from pathlib import Path
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 
@@ -16,9 +24,231 @@ from src.lib.exceptions import (
     NoFallbackError,
     AIProcessingTimeoutError
 )
+from .storage_manager import StorageManager
+
+try:
+    from google import genai as _genai
+    from google.genai.types import GenerateVideosConfig as _GenerateVideosConfig
+except ImportError:
+    _genai = None
+    _GenerateVideosConfig = None
 
 logger = logging.getLogger(__name__)
 
+# API keys that switch the service to mock generation
+MOCK_API_KEYS = ("test-key", "demo-key", "mock-key")
+
+# Simulated Veo 3 generation time for mock mode (11s to 6min range); VEO_MOCK_SLEEP=0 disables all mock delays
+MOCK_GENERATION_SECONDS = float(os.getenv("VEO_MOCK_SLEEP", "15.0"))
+
+# Operation polling: start short, grow geometrically, give up after the deadline
+POLL_INITIAL_DELAY = 1.0
+POLL_BACKOFF_FACTOR = 1.5
+POLL_MAX_DELAY = 15.0
+POLL_TIMEOUT = 360.0  # Veo 3 generation takes 11s to 6min
+
+# Result cache: reuse a finished video for a repeated prompt and config
+CACHE_MAX_ENTRIES = 500
+
+# Progress events are delivered off the generation thread in batches
+PROGRESS_BATCH_SIZE = 10
+PROGRESS_BATCH_INTERVAL = 0.2  # seconds to wait for a batch to fill
+PROGRESS_QUEUE_SIZE = 1000  # beyond this the submitting thread delivers the backlog itself
+
+PROCESSING_STAGES = ("initialization", "prompt_processing", "video_generation", "completion")
+
+# (API result key, public result key) pairs copied onto generate_video results when present
+RESULT_FIELDS = (
+    ("video_url", "video_url"),
+    ("video_path", "video_path"),
+    ("description", "video_description"),
+    ("model_used", "ai_model_used"),
+    ("status", "status"),
+)
+
+
+def _simulate_latency(seconds: float) -> None:
+    """Sleep to mimic real generation latency in mock mode, skipped under pytest or when disabled."""
+    if MOCK_GENERATION_SECONDS <= 0 or "PYTEST_CURRENT_TEST" in os.environ:
+        return
+    time.sleep(seconds)
+
+
+class _ProgressDispatcher:
+    """
+    Delivers progress events to their callbacks on a single background thread.
+
+    Submitting is normally a non-blocking append, so slow callbacks (Redis, DB)
+    never stall generation. Events are delivered in order, in batches of up to
+    PROGRESS_BATCH_SIZE or every PROGRESS_BATCH_INTERVAL seconds; flush delivers
+    whatever is still queued before a generation returns.
+    """
+
+    def __init__(self, max_pending: int = PROGRESS_QUEUE_SIZE):
+        self.max_pending = max_pending
+        self._pending = deque()
+        self._condition = threading.Condition()
+        # Held while taking and delivering a batch, so batches never overtake each other
+        self._delivery_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, callback: Callable, event: Dict[str, Any]) -> None:
+        with self._condition:
+            self._pending.append((callback, event))
+            backlog = len(self._pending) >= self.max_pending
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="veo-progress", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+        # A full queue is delivered by the submitter rather than dropping events
+        if backlog:
+            self.flush()
+
+    def flush(self) -> int:
+        """Deliver every queued event on the calling thread; returns the number delivered."""
+        with self._delivery_lock:
+            return self._deliver(self._take_pending())
+
+    def _take_pending(self) -> List[tuple]:
+        with self._condition:
+            batch = list(self._pending)
+            self._pending.clear()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                self._condition.wait_for(
+                    lambda: len(self._pending) >= PROGRESS_BATCH_SIZE, timeout=PROGRESS_BATCH_INTERVAL
+                )
+            self.flush()
+
+    @staticmethod
+    def _deliver(batch: List[tuple]) -> int:
+        for callback, event in batch:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Progress callback failed for stage {event.get('stage')}: {e}")
+        return len(batch)
+
+
+_progress_dispatcher = _ProgressDispatcher()
+
+
+class VeoResultCache:
+    """
+    On-disk cache of completed Veo generations keyed on the normalized prompt.
+
+    Prompts match only when they are identical after lowercasing and dropping
+    punctuation and extra whitespace, so word order and every content word
+    count. A cached result is only reused when the generation config matches
+    exactly and its video file still exists.
+
+    Each entry is its own file named by a hash of the prompt and config, and is
+    replaced atomically, so worker processes sharing the directory never
+    overwrite each other's entries. A file's mtime records its last use, and
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = CACHE_MAX_ENTRIES):
+        self._cache_dir = cache_dir
+        self.max_entries = max_entries
+
+    @staticmethod
+    def _normalize_prompt(prompt: str) -> str:
+        return " ".join(re.findall(r"[a-z0-9']+", prompt.lower()))
+
+    def _entry_path(self, prompt: str, config: Dict[str, Any]) -> Path:
+        key = json.dumps([prompt, config], sort_keys=True, default=str)
+        return self._cache_dir / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def lookup(self, prompt: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the cached result for the same normalized prompt and config, if any."""
+        prompt = self._normalize_prompt(prompt)
+        if not prompt:
+            return None
+
+        path = self._entry_path(prompt, config)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Veo cache entry {path}: {e}")
+            return None
+
+        if entry.get("prompt") != prompt or entry.get("config") != config:
+            return None
+
+        if not Path(entry["result"].get("video_path", "")).exists():
+            self._remove(path)
+            return None
+
+        self._touch(path)
+        logger.info("♻️ Reusing cached Veo video for a repeated prompt")
+        return entry["result"]
+
+    def store(self, prompt: str, config: Dict[str, Any], result: Dict[str, Any]) -> None:
+        """Add a completed generation, evicting the least recently used entries."""
+        prompt = self._normalize_prompt(prompt)
+        if not prompt:
+            return
+
+        path = self._entry_path(prompt, config)
+        tmp_path = None
+        try:
+            # A unique temp name per writer, so concurrent stores never share a file
+            fd, tmp_path = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump({"prompt": prompt, "config": config, "result": result}, f, default=str)
+            os.replace(tmp_path, path)
+            self._touch(path)
+        except OSError as e:
+            logger.warning(f"Failed to write Veo cache entry {path}: {e}")
+            if tmp_path is not None:
+                self._remove(Path(tmp_path))
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        try:
+            with os.scandir(self._cache_dir) as it:
+                entries = [
+                    (entry.stat().st_mtime_ns, entry.path)
+                    for entry in it if entry.name.endswith(".json")
+                ]
+        except OSError as e:
+            logger.warning(f"Failed to scan Veo cache {self._cache_dir}: {e}")
+            return
+
+        if len(entries) > self.max_entries:
+            entries.sort()
+            for _, path in entries[:len(entries) - self.max_entries]:
+                self._remove(Path(path))
+
+    @staticmethod
+    def _touch(path: Path) -> None:
+        # Set from the high resolution clock; file system timestamps can be too coarse to order uses
+        now = time.time_ns()
+        try:
+            os.utime(path, ns=(now, now))
+        except OSError as e:
+            logger.warning(f"Failed to update Veo cache entry {path}: {e}")
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove Veo cache file {path}: {e}")
+
 
 class VeoVideoService:
     """
@@ -40,6 +270,28 @@ class VeoVideoService:
             "personGeneration": "allow_adult",  # Control people generation
         }
 
+        self._cache: Optional[VeoResultCache] = None
+
+        # Defaults shared by every generate_video result
+        self._result_template = {
+            "video_url": "",
+            "video_path": "",
+            "video_description": "Generated video",
+            "status": "completed",
+        }
+
+    @property
+    def result_cache(self) -> VeoResultCache:
+        """Lazily created cache of completed generations."""
+        if self._cache is None:
+            self._cache = VeoResultCache(StorageManager().get_cache_path("veo"))
+        return self._cache
+
+    @property
+    def _mock_mode(self) -> bool:
+        """Whether calls are served by mock generation instead of the Veo API."""
+        return (self._api_key or os.getenv('GEMINI_API_KEY', 'test-key')) in MOCK_API_KEYS
+
     def generate_video(self, generation_request: Dict[str, Any],
                       progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
         """
@@ -61,75 +313,148 @@ class VeoVideoService:
             # Validate generation request
             self._validate_generation_request(generation_request)
 
-            # Track progress - initialization
-            if progress_callback:
-                progress_callback({
-                    "stage": "initializing_video_generation",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "details": {
-                        "processing_info": "Initializing Veo video generation",
-                        "model": self.model_name,
-                        "prompt_length": len(generation_request.get("prompt", ""))
-                    }
-                })
+            self._report_initializing(generation_request, progress_callback)
 
             # Simulate realistic AI processing time
-            time.sleep(3.0)  # Video generation takes longer
+            if self._mock_mode:
+                _simulate_latency(3.0)  # Video generation takes longer
 
-            # Track progress - processing prompt
-            if progress_callback:
-                progress_callback({
-                    "stage": "processing_video_prompt",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "details": {
-                        "processing_info": "Processing video generation prompt",
-                        "prompt": generation_request.get("prompt", "")[:100] + "..."
-                    }
-                })
+            self._report_processing_prompt(generation_request, progress_callback)
 
             # Call Veo API for video generation
             generation_result = self._call_veo_api(generation_request)
 
             # Additional processing time based on duration
             duration = generation_request.get("duration", 4)
-            time.sleep(duration * 0.5)  # Longer videos take more time
+            if self._mock_mode:
+                _simulate_latency(duration * 0.5)  # Longer videos take more time
+
+            return self._build_generation_result(
+                generation_request, generation_result, start_time, progress_callback
+            )
 
-            # Track progress - generating video
+        except Exception as e:
+            # Handle errors without fallback
+            self._handle_generation_error(e, generation_request)
+
+        finally:
+            # Callbacks must not run after the caller has moved on (or the worker exited)
             if progress_callback:
-                progress_callback({
-                    "stage": "generating_video",
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "details": {
-                        "processing_info": "Generating AI video with Veo",
-                        "duration": duration,
-                        "model_response_available": bool(generation_result)
-                    }
-                })
-
-            processing_time = time.time() - start_time
-
-            # Build comprehensive result
-            result = {
-                "video_url": generation_result.get("video_url", ""),
-                "video_path": generation_result.get("video_path", ""),
-                "video_description": generation_result.get("description", "Generated video"),
-                "generation_prompt": generation_request.get("prompt", ""),
-                "ai_model_used": generation_result.get("model_used", self.model_name),
-                "processing_time": processing_time,
-                "status": generation_result.get("status", "completed"),
-                "generation_metadata": {
-                    **generation_result.get("generation_metadata", {}),
-                    "api_call_timestamp": datetime.utcnow().isoformat(),
-                    "processing_stages": ["initialization", "prompt_processing", "video_generation", "completion"]
-                }
-            }
+                _progress_dispatcher.flush()
+
+    async def generate_video_async(self, generation_request: Dict[str, Any],
+                                   progress_callback: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Generate AI-powered video using Veo model without blocking the event loop.
+
+        Same contract as generate_video; operation polling awaits instead of
+        sleeping so several generations can be in flight on one thread.
+        """
+        start_time = time.time()
 
-            return result
+        try:
+            self._validate_generation_request(generation_request)
+            self._report_initializing(generation_request, progress_callback)
+            self._report_processing_prompt(generation_request, progress_callback)
+
+            generation_result = await self._call_veo_api_async(generation_request)
+
+            return self._build_generation_result(
+                generation_request, generation_result, start_time, progress_callback
+            )
 
         except Exception as e:
             # Handle errors without fallback
             self._handle_generation_error(e, generation_request)
 
+        finally:
+            if progress_callback:
+                await asyncio.to_thread(_progress_dispatcher.flush)
+
+    async def generate_videos_batch(self, generation_requests: List[Dict[str, Any]],
+                                    max_concurrency: int = 4) -> List[Dict[str, Any]]:
+        """
+        Generate several videos concurrently.
+
+        Args:
+            generation_requests: Generation parameters, one per video
+            max_concurrency: Maximum Veo operations in flight at once
+
+        Returns:
+            Generation results in the same order as the requests
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def generate(generation_request: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.generate_video_async(generation_request)
+
+        return await asyncio.gather(*(generate(request) for request in generation_requests))
+
+    def _report_initializing(self, generation_request: Dict[str, Any],
+                             progress_callback: Optional[Callable]) -> None:
+        # Track progress - initialization
+        if progress_callback:
+            _progress_dispatcher.submit(progress_callback, {
+                "stage": "initializing_video_generation",
+                "timestamp": datetime.utcnow().isoformat(),
+                "details": {
+                    "processing_info": "Initializing Veo video generation",
+                    "model": self.model_name,
+                    "prompt_length": len(generation_request.get("prompt", ""))
+                }
+            })
+
+    def _report_processing_prompt(self, generation_request: Dict[str, Any],
+                                  progress_callback: Optional[Callable]) -> None:
+        # Track progress - processing prompt
+        if progress_callback:
+            _progress_dispatcher.submit(progress_callback, {
+                "stage": "processing_video_prompt",
+                "timestamp": datetime.utcnow().isoformat(),
+                "details": {
+                    "processing_info": "Processing video generation prompt",
+                    "prompt": generation_request.get("prompt", "")[:100] + "..."
+                }
+            })
+
+    def _build_generation_result(self, generation_request: Dict[str, Any],
+                                 generation_result: Dict[str, Any], start_time: float,
+                                 progress_callback: Optional[Callable]) -> Dict[str, Any]:
+        """Report the generating stage and assemble the public result."""
+        duration = generation_request.get("duration", 4)
+        timestamp = datetime.utcnow().isoformat()
+
+        # Track progress - generating video
+        if progress_callback:
+            _progress_dispatcher.submit(progress_callback, {
+                "stage": "generating_video",
+                "timestamp": timestamp,
+                "details": {
+                    "processing_info": "Generating AI video with Veo",
+                    "duration": duration,
+                    "model_response_available": bool(generation_result)
+                }
+            })
+
+        processing_time = time.time() - start_time
+
+        # Build comprehensive result from the shared defaults
+        result = self._result_template.copy()
+        result["ai_model_used"] = self.model_name
+        for source_key, result_key in RESULT_FIELDS:
+            if source_key in generation_result:
+                result[result_key] = generation_result[source_key]
+
+        result["generation_prompt"] = generation_request.get("prompt", "")
+        result["processing_time"] = processing_time
+        result["generation_metadata"] = {
+            **generation_result.get("generation_metadata", {}),
+            "api_call_timestamp": timestamp,
+            "processing_stages": list(PROCESSING_STAGES)
+        }
+        return result
+
     def _call_veo_api(self, generation_request: Dict[str, Any]) -> Dict[str, Any]:
         """
         Make actual call to Google Veo API for video generation.
@@ -140,27 +465,26 @@ class VeoVideoService:
         Returns:
             API response data with video_url and metadata
         """
-        import os
-        api_key = self._api_key or os.getenv('GEMINI_API_KEY', 'test-key')
-
         # Check if we're using a test/demo API key for mock mode
-        if api_key in ['test-key', 'demo-key', 'mock-key']:
+        if self._mock_mode:
             return self._generate_mock_video(generation_request)
 
+        api_key = self._api_key or os.getenv('GEMINI_API_KEY')
+        prompt = generation_request.get("prompt", "")
+        cache_config = self._cache_config(generation_request)
+
         try:
-            # Use Google GenAI SDK for Veo
-            from google import genai
-            from google.genai.types import GenerateVideosConfig
+            # Reuse a finished video for a repeated prompt and config
+            cached_result = self._get_cached_result(prompt, cache_config)
+            if cached_result:
+                return cached_result
 
-            client = genai.Client(api_key=api_key)
-            prompt = generation_request.get("prompt", "")
+            # Use Google GenAI SDK for Veo
+            if _genai is None:
+                logger.warning("Google GenAI SDK not available, falling back to mock mode")
+                return self._generate_mock_video(generation_request)
 
-            # Configure video generation per documentation
-            config = GenerateVideosConfig(
-                aspectRatio=self.generation_config["aspectRatio"],
-                personGeneration=self.generation_config.get("personGeneration", "allow_adult"),
-                negativePrompt=generation_request.get("negativePrompt")
-            )
+            client = _genai.Client(api_key=api_key)
 
             # Generate video with Veo 3 - returns operation (async)
             logger.info(f"🎬 Starting Veo 3 video generation: {prompt[:100]}")
@@ -168,80 +492,179 @@ class VeoVideoService:
             operation = client.models.generate_videos(
                 model=self.model_name,  # veo-3.0-generate-preview
                 prompt=prompt,
-                config=config
+                config=self._build_video_config(generation_request)
             )
 
-            # Poll for completion as per documentation
+            # Poll for completion with backoff so short jobs are picked up promptly
             logger.info("⏳ Polling for video generation completion...")
-            import time
-            max_polls = 36  # Max 6 minutes (10 second intervals)
-            poll_count = 0
+            poll_start = time.monotonic()
+            deadline = poll_start + POLL_TIMEOUT
+            delay = POLL_INITIAL_DELAY
 
-            while not operation.done and poll_count < max_polls:
-                logger.info(f"⏳ Video generation in progress... ({poll_count * 10}s elapsed)")
-                time.sleep(10)  # Wait 10 seconds as per documentation
+            while not operation.done and time.monotonic() < deadline:
+                logger.info(f"⏳ Video generation in progress... ({time.monotonic() - poll_start:.0f}s elapsed)")
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
                 operation = client.operations.get(operation)
-                poll_count += 1
+                delay = self._next_poll_delay(operation, delay)
 
-            if not operation.done:
-                raise VideoGenerationError(
-                    "Video generation timed out",
-                    generation_prompt=prompt,
-                    model_response="Generation exceeded maximum wait time"
-                )
+            polling_time = time.monotonic() - poll_start
+            video_data = self._get_generated_video(operation, prompt)
 
-            if operation.response and operation.response.generated_videos:
-                # Save the generated video
-                video_data = operation.response.generated_videos[0]
-                video_filename = f"veo3_{uuid.uuid4().hex[:8]}.mp4"
-
-                # Download and save the video file
-                client.files.download(file=video_data.video)
-
-                # Use storage manager to save video
-                from ..services.storage_manager import StorageManager
-                storage = StorageManager()
-                video_path = storage.save_generated_video(video_data.video, video_filename)
-
-                logger.info(f"✅ Successfully generated and saved Veo 3 video: {video_path}")
-
-                return {
-                    "video_url": f"/api/media/assets/videos/{video_filename}",
-                    "video_path": str(video_path),
-                    "description": f"Generated video (8s, 720p): {prompt}",
-                    "model_used": self.model_name,
-                    "status": "completed",
-                    "generation_metadata": {
-                        "provider": "google_veo",
-                        "model": self.model_name,
-                        "duration": 8,  # Veo 3 always generates 8 seconds
-                        "resolution": "720p",  # Veo 3 generates 720p at 24fps
-                        "aspect_ratio": config.aspectRatio,
-                        "original_prompt": prompt,
-                        "estimated_cost": 1.60,  # Veo 3 pricing per 8-second video
-                        "polling_time": poll_count * 10
-                    }
-                }
-            else:
-                raise VideoGenerationError(
-                    "No videos generated by Veo API",
-                    generation_prompt=prompt,
-                    model_response="Empty video generation response"
-                )
+            # Stream the video file to disk
+            return self._save_generated_video(video_data, prompt, cache_config, polling_time, api_key)
 
-        except ImportError:
-            logger.warning("Google GenAI SDK not available, falling back to mock mode")
-            return self._generate_mock_video(generation_request)
         except Exception as e:
             logger.error(f"Veo API error: {e}")
             # Fallback to mock for now
             logger.warning(f"Veo generation failed, using mock: {e}")
             return self._generate_mock_video(generation_request)
 
+    async def _call_veo_api_async(self, generation_request: Dict[str, Any]) -> Dict[str, Any]:
+        """Async counterpart of _call_veo_api using the GenAI SDK's aio client."""
+        if self._mock_mode:
+            return await asyncio.to_thread(self._generate_mock_video, generation_request)
+
+        api_key = self._api_key or os.getenv('GEMINI_API_KEY')
+        prompt = generation_request.get("prompt", "")
+        cache_config = self._cache_config(generation_request)
+
+        try:
+            cached_result = self._get_cached_result(prompt, cache_config)
+            if cached_result:
+                return cached_result
+
+            if _genai is None:
+                logger.warning("Google GenAI SDK not available, falling back to mock mode")
+                return await asyncio.to_thread(self._generate_mock_video, generation_request)
+
+            client = _genai.Client(api_key=api_key)
+
+            logger.info(f"🎬 Starting Veo 3 video generation: {prompt[:100]}")
+
+            operation = await client.aio.models.generate_videos(
+                model=self.model_name,
+                prompt=prompt,
+                config=self._build_video_config(generation_request)
+            )
+
+            poll_start = time.monotonic()
+            deadline = poll_start + POLL_TIMEOUT
+            delay = POLL_INITIAL_DELAY
+
+            while not operation.done and time.monotonic() < deadline:
+                await asyncio.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                operation = await client.aio.operations.get(operation)
+                delay = self._next_poll_delay(operation, delay)
+
+            polling_time = time.monotonic() - poll_start
+            video_data = self._get_generated_video(operation, prompt)
+
+            return await asyncio.to_thread(
+                self._save_generated_video, video_data, prompt, cache_config, polling_time, api_key
+            )
+
+        except Exception as e:
+            logger.error(f"Veo API error: {e}")
+            logger.warning(f"Veo generation failed, using mock: {e}")
+            return await asyncio.to_thread(self._generate_mock_video, generation_request)
+
+    def _build_video_config(self, generation_request: Dict[str, Any]):
+        """Configure video generation per documentation."""
+        return _GenerateVideosConfig(
+            aspectRatio=self.generation_config["aspectRatio"],
+            personGeneration=self.generation_config.get("personGeneration", "allow_adult"),
+            negativePrompt=generation_request.get("negativePrompt")
+        )
+
+    def _cache_config(self, generation_request: Dict[str, Any]) -> Dict[str, Any]:
+        """Generation settings a cached result must match exactly."""
+        return {
+            "model": self.model_name,
+            "aspectRatio": self.generation_config["aspectRatio"],
+            "personGeneration": self.generation_config.get("personGeneration", "allow_adult"),
+            "negativePrompt": generation_request.get("negativePrompt")
+        }
+
+    def _get_cached_result(self, prompt: str, cache_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Cached generation for the same normalized prompt and config, marked as a cache hit."""
+        cached_result = self.result_cache.lookup(prompt, cache_config)
+        if cached_result:
+            cached_result["generation_metadata"].update({
+                "original_prompt": prompt,
+                "cache_hit": True,
+                "estimated_cost": 0.00,
+                "polling_time": 0
+            })
+        return cached_result
+
+    def _get_generated_video(self, operation: Any, prompt: str) -> Any:
+        """First generated video of a finished operation."""
+        if not operation.done:
+            raise VideoGenerationError(
+                "Video generation timed out",
+                generation_prompt=prompt,
+                model_response="Generation exceeded maximum wait time"
+            )
+
+        if not (operation.response and operation.response.generated_videos):
+            raise VideoGenerationError(
+                "No videos generated by Veo API",
+                generation_prompt=prompt,
+                model_response="Empty video generation response"
+            )
+
+        return operation.response.generated_videos[0]
+
+    def _save_generated_video(self, video_data: Any, prompt: str, cache_config: Dict[str, Any],
+                              polling_time: float, api_key: Optional[str] = None) -> Dict[str, Any]:
+        """Stream a generated Veo video to storage and record it in the result cache."""
+        video_filename = f"veo3_{uuid.uuid4().hex[:8]}.mp4"
+
+        # Use storage manager to save video
+        storage = StorageManager()
+        video_path = storage.save_generated_video(video_data.video, video_filename, api_key=api_key)
+
+        logger.info(f"✅ Successfully generated and saved Veo 3 video: {video_path}")
+
+        result = {
+            "video_url": f"/api/media/assets/videos/{video_filename}",
+            "video_path": str(video_path),
+            "description": f"Generated video (8s, 720p): {prompt}",
+            "model_used": self.model_name,
+            "status": "completed",
+            "generation_metadata": {
+                "provider": "google_veo",
+                "model": self.model_name,
+                "duration": 8,  # Veo 3 always generates 8 seconds
+                "resolution": "720p",  # Veo 3 generates 720p at 24fps
+                "aspect_ratio": cache_config["aspectRatio"],
+                "original_prompt": prompt,
+                "estimated_cost": 1.60,  # Veo 3 pricing per 8-second video
+                "polling_time": round(polling_time, 1)
+            }
+        }
+        self.result_cache.store(prompt, cache_config, result)
+        return result
+
+    def _next_poll_delay(self, operation: Any, delay: float) -> float:
+        """Next operation poll interval, preferring a server retry_after hint over backoff."""
+        metadata = getattr(operation, "metadata", None)
+        if isinstance(metadata, dict):
+            retry_after = metadata.get("retry_after") or metadata.get("retryAfter")
+        else:
+            retry_after = getattr(metadata, "retry_after", None)
+
+        try:
+            if retry_after is not None and float(retry_after) > 0:
+                return min(float(retry_after), POLL_MAX_DELAY)
+        except (TypeError, ValueError):
+            pass
+
+        return min(delay * POLL_BACKOFF_FACTOR, POLL_MAX_DELAY)
+
     def _generate_mock_video(self, generation_request: Dict[str, Any]) -> Dict[str, Any]:
         """Generate mock video for testing when Veo is not available."""
-        import time
-        time.sleep(15.0)  # Simulate realistic Veo 3 generation time (11s to 6min range)
+        _simulate_latency(MOCK_GENERATION_SECONDS)
 
         prompt = generation_request.get("prompt", "")
         mock_filename = f"mock_veo3_{int(time.time())}.mp4"
@@ -2,20 +2,55 @@
 Video Composer Service for assembling final videos from media assets.
 Uses FFmpeg to combine images, audio, and effects into final video output.
 """
+import errno
+import hashlib
 import logging
+import os
+import shutil
+import struct
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple, Callable
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from ..models.media_asset import MediaAsset, AssetTypeEnum as AssetType
 from ..models.generated_video import GeneratedVideo, GenerationStatusEnum as VideoStatus
 from ..lib.ffmpeg_utils import ffmpeg, FFmpegError
+from ..lib.redis import RedisService, RedisConfig
 from .storage_manager import StorageManager
 
 logger = logging.getLogger(__name__)
 
+# Threads used to overlap filesystem calls (stat/unlink) on possibly remote media storage
+FILE_IO_WORKERS = 8
+
+# Byte budget for cached visual tracks; least recently used files are removed beyond it
+VISUAL_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Hard-link failures meaning the filesystem cannot link these files, so copying is the fallback
+LINK_UNSUPPORTED_ERRNOS = frozenset({errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP})
+
+
+def _scandir_sizes(path: Path) -> Tuple[int, int]:
+    """Count the files under a directory tree and their total size, using the sizes os.scandir reads."""
+    files, total = 0, 0
+    pending = [path]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        files += 1
+                        total += entry.stat(follow_symlinks=False).st_size
+        except OSError as e:
+            logger.warning(f"Failed to scan temp directory: {e}")
+    return files, total
+
 
 class VideoComposerError(Exception):
     """Exception raised by video composition operations."""
@@ -27,6 +62,7 @@ class VideoComposer:
 
     def __init__(self):
         self.storage_manager = StorageManager()
+        self._progress_store = None
 
     def compose_video(
         self,
@@ -49,23 +85,10 @@ class VideoComposer:
             # Validate inputs
             self._validate_composition_inputs(assets, output_options)
 
-            # Organize assets by type
-            asset_groups = self._group_assets_by_type(assets)
-
             # Create output video record
             video = self._create_video_record(output_options, job_id)
 
-            # Create composition timeline
-            timeline = self._create_composition_timeline(asset_groups, output_options)
-
-            # Compose video in stages
-            temp_video_path = self._compose_visual_track(timeline, output_options)
-            final_video_path = self._add_audio_tracks(
-                temp_video_path, asset_groups, output_options, video.file_path
-            )
-
-            # Validate final video
-            video_info = self._validate_output_video(final_video_path)
+            video_info = self._run_pipeline(assets, output_options, video.file_path, job_id)
 
             # Update video record with actual properties
             video.file_size = video_info["file_size"]
@@ -80,6 +103,52 @@ class VideoComposer:
             logger.error(f"Failed to compose video: {e}")
             raise VideoComposerError(f"Video composition failed: {e}")
 
+    def _run_pipeline(
+        self,
+        assets: List[MediaAsset],
+        options: Dict[str, Any],
+        output_path: str,
+        job_id: Optional[uuid.UUID] = None
+    ) -> Dict[str, Any]:
+        """
+        Compose validated assets into a video file at output_path.
+
+        When job_id is given, encoder progress is published to Redis while the
+        pipeline runs, where get_composition_progress reads it from any process.
+
+        Returns:
+            Properties of the composed video from _validate_output_video
+        """
+        try:
+            # Organize assets by type
+            asset_groups = self._group_assets_by_type(assets)
+
+            # Create composition timeline
+            timeline = self._create_composition_timeline(asset_groups, options)
+
+            # Render images and narration in a single FFmpeg pass when possible
+            final_video_path = None
+            narration_track = self._find_narration_track(asset_groups, options)
+            if narration_track:
+                final_video_path = self._compose_with_narration(
+                    timeline, options, narration_track, output_path, job_id
+                )
+
+            if final_video_path is None:
+                # Compose video in stages
+                temp_video_path = self._compose_visual_track(timeline, options, job_id)
+                final_video_path = self._add_audio_tracks(
+                    temp_video_path, asset_groups, options, output_path
+                )
+
+            # Validate final video
+            return self._validate_output_video(final_video_path)
+
+        finally:
+            store = self._get_progress_store() if job_id is not None else None
+            if store:
+                store.delete(str(job_id))
+
     def _validate_composition_inputs(
         self,
         assets: List[MediaAsset],
@@ -108,21 +177,21 @@ class VideoComposer:
 
     def _group_assets_by_type(self, assets: List[MediaAsset]) -> Dict[AssetType, List[MediaAsset]]:
         """Group assets by their type for easier processing."""
-        groups = {
-            AssetType.IMAGE: [],
-            AssetType.AUDIO: [],
-            AssetType.VIDEO_CLIP: [],
-            AssetType.TEXT_OVERLAY: []
-        }
-
+        grouped = defaultdict(list)
         for asset in assets:
-            if asset.asset_type in groups:
-                groups[asset.asset_type].append(asset)
+            grouped[asset.asset_type].append(asset)
 
-        # Sort images by filename to ensure proper sequence
-        groups[AssetType.IMAGE].sort(key=lambda a: a.file_path)
+        # Sort images by scene index to ensure proper sequence; unindexed files go last
+        grouped[AssetType.IMAGE].sort(
+            key=lambda a: (a.scene_index is None, a.scene_index or 0, a.file_path)
+        )
 
-        return groups
+        return {
+            AssetType.IMAGE: grouped[AssetType.IMAGE],
+            AssetType.AUDIO: grouped[AssetType.AUDIO],
+            AssetType.VIDEO_CLIP: grouped[AssetType.VIDEO_CLIP],
+            AssetType.TEXT_OVERLAY: grouped[AssetType.TEXT_OVERLAY]
+        }
 
     def _create_video_record(
         self,
@@ -174,23 +243,21 @@ class VideoComposer:
             "scenes": []
         }
 
+        # Index overlays by the scene number in their filename (first overlay wins)
+        overlays_by_index = {}
+        for overlay in text_overlays:
+            if overlay.scene_index is not None:
+                overlays_by_index.setdefault(overlay.scene_index, overlay)
+
         for i, image_asset in enumerate(images):
             start_time = i * scene_duration
 
-            # Find corresponding text overlay
-            text_overlay = None
-            for overlay in text_overlays:
-                # Match by index or timing
-                if f"_{i:03d}_" in overlay.file_path:
-                    text_overlay = overlay
-                    break
-
             timeline["scenes"].append({
                 "index": i,
                 "start_time": start_time,
                 "duration": scene_duration,
                 "background_image": image_asset,
-                "text_overlay": text_overlay
+                "text_overlay": overlays_by_index.get(i)
             })
 
         return timeline
@@ -198,7 +265,8 @@ class VideoComposer:
     def _compose_visual_track(
         self,
         timeline: Dict[str, Any],
-        options: Dict[str, Any]
+        options: Dict[str, Any],
+        job_id: Optional[uuid.UUID] = None
     ) -> Path:
         """Compose the visual track (images + text overlays)."""
         try:
@@ -206,20 +274,22 @@ class VideoComposer:
             width, height = map(int, resolution.split("x"))
             fps = options.get("fps", 30)
 
-            # Create temporary output path
-            temp_path = self.storage_manager.get_temp_path() / f"visual_{uuid.uuid4()}.mp4"
+            # Create temporary output path, inside the job's own temp directory when there is a job
+            if job_id is not None:
+                temp_dir = self.storage_manager.get_job_temp_path(job_id)
+            else:
+                temp_dir = self.storage_manager.get_temp_path()
+            temp_path = temp_dir / f"visual_{uuid.uuid4()}.mp4"
 
-            # Collect image paths for FFmpeg
-            image_paths = []
-            for scene in timeline["scenes"]:
-                image_path = Path(scene["background_image"].file_path)
-                if image_path.exists():
-                    image_paths.append(image_path)
-                else:
-                    logger.warning(f"Image not found: {image_path}")
+            image_paths = self._collect_image_paths(timeline)
 
-            if not image_paths:
-                raise VideoComposerError("No valid image files found")
+            # Identical images and settings always render the same track
+            cache_path = self._visual_cache_path(image_paths, width, height, fps, timeline["total_duration"])
+            if cache_path.exists():
+                self._link_or_copy(cache_path, temp_path)
+                os.utime(cache_path)
+                logger.info(f"Reusing cached visual track {cache_path.name}")
+                return temp_path
 
             # Use FFmpeg wrapper to create video from images
             success = ffmpeg.create_video_from_images(
@@ -227,18 +297,139 @@ class VideoComposer:
                 output_path=temp_path,
                 duration=timeline["total_duration"],
                 fps=fps,
-                resolution=(width, height)
+                resolution=(width, height),
+                progress_callback=self._progress_reporter(
+                    job_id, timeline["total_duration"], "Rendering visual track"
+                )
             )
 
             if not success:
                 raise VideoComposerError("Failed to create visual track")
 
+            self._store_visual_track(temp_path, cache_path)
+
             return temp_path
 
         except Exception as e:
             logger.error(f"Failed to compose visual track: {e}")
             raise VideoComposerError(f"Visual track composition failed: {e}")
 
+    def _compose_with_narration(
+        self,
+        timeline: Dict[str, Any],
+        options: Dict[str, Any],
+        narration_track: MediaAsset,
+        output_path: str,
+        job_id: Optional[uuid.UUID] = None
+    ) -> Optional[Path]:
+        """
+        Render images and narration straight to output_path in one FFmpeg pass.
+
+        Returns:
+            The output path, or None when the staged visual + audio path should be
+            used instead (cached visual track available, or the fused render failed)
+        """
+        width, height = map(int, options["resolution"].split("x"))
+        fps = options.get("fps", 30)
+        image_paths = self._collect_image_paths(timeline)
+
+        # A cached visual track only needs the narration muxed in, which is cheaper than encoding
+        if self._visual_cache_path(image_paths, width, height, fps, timeline["total_duration"]).exists():
+            return None
+
+        final_path = Path(output_path)
+        final_path.parent.mkdir(parents=True, exist_ok=True)
+
+        success = ffmpeg.compose_video_with_audio(
+            image_paths=image_paths,
+            audio_path=Path(narration_track.file_path),
+            output_path=final_path,
+            duration=timeline["total_duration"],
+            fps=fps,
+            resolution=(width, height),
+            progress_callback=self._progress_reporter(
+                job_id, timeline["total_duration"], "Rendering video with narration"
+            )
+        )
+
+        if not success:
+            logger.warning("Single-pass composition failed, composing visual and audio tracks separately")
+            return None
+
+        return final_path
+
+    def _collect_image_paths(self, timeline: Dict[str, Any]) -> List[Path]:
+        """Existing background image paths for the timeline scenes, in scene order."""
+        scene_paths = [Path(scene["background_image"].file_path) for scene in timeline["scenes"]]
+        with ThreadPoolExecutor(max_workers=FILE_IO_WORKERS) as executor:
+            found = list(executor.map(Path.exists, scene_paths))
+
+        image_paths = []
+        for image_path, exists in zip(scene_paths, found):
+            if exists:
+                image_paths.append(image_path)
+            else:
+                logger.warning(f"Image not found: {image_path}")
+
+        if not image_paths:
+            raise VideoComposerError("No valid image files found")
+
+        return image_paths
+
+    def _visual_cache_path(
+        self,
+        image_paths: List[Path],
+        width: int,
+        height: int,
+        fps: float,
+        duration: float
+    ) -> Path:
+        """Cache location for a visual track, keyed on image identity and render settings."""
+        key = hashlib.sha256()
+        for image_path in image_paths:
+            stat = image_path.stat()
+            key.update(str(image_path.resolve()).encode())
+            key.update(struct.pack("<qq", stat.st_size, stat.st_mtime_ns))
+        key.update(struct.pack("<iidd", width, height, float(fps), float(duration)))
+        return self.storage_manager.get_cache_path("visual") / f"{key.hexdigest()}.mp4"
+
+    def _store_visual_track(self, video_path: Path, cache_path: Path):
+        """Keep a rendered visual track for reuse and trim the cache to its byte budget."""
+        if cache_path.exists():
+            return
+
+        # Build the entry under a unique name and swap it in, so an existing entry
+        # (possibly hard-linked into another composition) is never written through
+        staging_path = cache_path.with_name(f".{cache_path.stem}.{uuid.uuid4().hex}.tmp")
+        try:
+            self._link_or_copy(video_path, staging_path)
+            os.replace(staging_path, cache_path)
+
+            cached = sorted(
+                ((f, f.stat()) for f in cache_path.parent.glob("*.mp4")),
+                key=lambda item: item[1].st_mtime
+            )
+            total_size = sum(stat.st_size for _, stat in cached)
+            for cached_file, stat in cached:
+                if total_size <= VISUAL_CACHE_MAX_BYTES:
+                    break
+                cached_file.unlink(missing_ok=True)
+                total_size -= stat.st_size
+
+        except OSError as e:
+            staging_path.unlink(missing_ok=True)
+            logger.warning(f"Failed to cache visual track: {e}")
+
+    @staticmethod
+    def _link_or_copy(source: Path, destination: Path):
+        """Hard-link source to a new destination, copying when the filesystem cannot link it."""
+        try:
+            os.link(source, destination)
+        except OSError as e:
+            if e.errno not in LINK_UNSUPPORTED_ERRNOS:
+                raise
+            shutil.copy2(source, destination)
+
     def _add_audio_tracks(
         self,
         video_path: Path,
@@ -247,59 +438,58 @@ class VideoComposer:
         final_output_path: str
     ) -> Path:
         """Add audio tracks to the visual video."""
+        final_path = Path(final_output_path)
+        audio_added = False
+
         try:
-            audio_assets = asset_groups[AssetType.AUDIO]
-            final_path = Path(final_output_path)
             final_path.parent.mkdir(parents=True, exist_ok=True)
 
-            if not audio_assets or not options.get("include_audio", True):
-                # No audio - just copy video to final location
-                if video_path != final_path:
-                    video_path.rename(final_path)
-                return final_path
-
-            # Find primary audio track (narration)
-            narration_track = None
-            music_track = None
-
-            for audio in audio_assets:
-                if audio.metadata and "content_type" in audio.metadata:
-                    if audio.metadata["content_type"] == "narration":
-                        narration_track = audio
-                    elif audio.metadata["content_type"] == "background_music":
-                        music_track = audio
+            # Find primary audio track (narration); None when audio is disabled or unavailable
+            narration_track = self._find_narration_track(asset_groups, options)
 
             # Add primary audio track
-            if narration_track and Path(narration_track.file_path).exists():
-                success = ffmpeg.add_audio_to_video(
+            if narration_track:
+                audio_added = ffmpeg.add_audio_to_video(
                     video_path=video_path,
                     audio_path=Path(narration_track.file_path),
                     output_path=final_path,
                     video_duration=options["duration"]
                 )
 
-                if not success:
+                if not audio_added:
                     logger.warning("Failed to add narration, copying video without audio")
-                    if video_path != final_path:
-                        video_path.rename(final_path)
-            else:
-                # No valid audio - copy video as-is
-                if video_path != final_path:
-                    video_path.rename(final_path)
-
-            # Clean up temporary video file
-            if video_path.exists() and video_path != final_path:
-                video_path.unlink()
-
-            return final_path
 
         except Exception as e:
             logger.error(f"Failed to add audio tracks: {e}")
-            # Fallback: copy video without audio
-            final_path = Path(final_output_path)
-            if video_path.exists() and video_path != final_path:
-                video_path.rename(final_path)
-            return final_path
+
+        finally:
+            if video_path != final_path:
+                if audio_added:
+                    # Clean up temporary video file
+                    video_path.unlink(missing_ok=True)
+                else:
+                    # Fallback: move video without audio to final location
+                    os.replace(video_path, final_path)
+
+        return final_path
+
+    def _find_narration_track(
+        self,
+        asset_groups: Dict[AssetType, List[MediaAsset]],
+        options: Dict[str, Any]
+    ) -> Optional[MediaAsset]:
+        """Narration audio asset to mux into the video, if audio is enabled and the file exists."""
+        if not options.get("include_audio", True):
+            return None
+
+        narration_track = None
+        for audio in asset_groups[AssetType.AUDIO]:
+            if audio.metadata and audio.metadata.get("content_type") == "narration":
+                narration_track = audio
+
+        if narration_track and Path(narration_track.file_path).exists():
+            return narration_track
+        return None
 
     def _validate_output_video(self, video_path: Path) -> Dict[str, Any]:
         """Validate the final output video and return its properties."""
@@ -334,7 +524,8 @@ class VideoComposer:
         self,
         assets: List[MediaAsset],
         output_options: Dict[str, Any],
-        output_file_path: str
+        output_file_path: str,
+        job_id: Optional[uuid.UUID] = None
     ) -> Dict[str, Any]:
         """
         Compose video file without creating database record.
@@ -343,6 +534,7 @@ class VideoComposer:
             assets: List of MediaAsset objects to compose
             output_options: Video output configuration
             output_file_path: Path where video file should be created
+            job_id: Associated job ID, whose temp directory holds intermediate files
 
         Returns:
             Dictionary with video file properties
@@ -351,20 +543,7 @@ class VideoComposer:
             # Validate inputs
             self._validate_composition_inputs(assets, output_options)
 
-            # Organize assets by type
-            asset_groups = self._group_assets_by_type(assets)
-
-            # Create composition timeline
-            timeline = self._create_composition_timeline(asset_groups, output_options)
-
-            # Compose video in stages
-            temp_video_path = self._compose_visual_track(timeline, output_options)
-            final_video_path = self._add_audio_tracks(
-                temp_video_path, asset_groups, output_options, output_file_path
-            )
-
-            # Validate final video and return properties
-            video_info = self._validate_output_video(final_video_path)
+            video_info = self._run_pipeline(assets, output_options, output_file_path, job_id)
 
             logger.info(f"Successfully composed video file at {output_file_path}")
             return video_info
@@ -373,29 +552,103 @@ class VideoComposer:
             logger.error(f"Failed to compose video file: {e}")
             raise VideoComposerError(f"Video file composition failed: {e}")
 
-    def cleanup_temp_files(self, job_id: uuid.UUID):
-        """Clean up temporary files created during composition."""
+    def cleanup_temp_files(self, job_id: uuid.UUID) -> Tuple[int, int]:
+        """Clean up temporary files created during composition.
+
+        Returns:
+            Tuple of (files removed, bytes freed)
+        """
         try:
+            job_dir = self.storage_manager.get_job_temp_path(job_id, create=False)
+            if job_dir.is_dir():
+                # One tree removal instead of a lookup and unlink per file
+                files_removed, bytes_freed = _scandir_sizes(job_dir)
+                shutil.rmtree(job_dir, ignore_errors=True)
+                return files_removed, bytes_freed
+
+            # Temp files written before per-job directories sit directly in the temp dir
             temp_dir = self.storage_manager.get_temp_path()
-
-            # Find temp files related to this job
-            for temp_file in temp_dir.glob(f"*{job_id}*"):
-                try:
-                    temp_file.unlink()
-                    logger.debug(f"Cleaned up temp file: {temp_file}")
-                except Exception as e:
-                    logger.warning(f"Failed to clean up {temp_file}: {e}")
+            temp_files = list(temp_dir.glob(f"*{job_id}*"))
+            with ThreadPoolExecutor(max_workers=FILE_IO_WORKERS) as executor:
+                removed = [size for size in executor.map(self._remove_temp_file, temp_files) if size is not None]
+            return len(removed), sum(removed)
 
         except Exception as e:
             logger.error(f"Failed to cleanup temp files for job {job_id}: {e}")
+            return 0, 0
+
+    def _remove_temp_file(self, temp_file: Path) -> Optional[int]:
+        """Delete a single temporary file, logging failures; returns its size when removed."""
+        try:
+            size = temp_file.stat().st_size
+            temp_file.unlink()
+            logger.debug(f"Cleaned up temp file: {temp_file}")
+            return size
+        except Exception as e:
+            logger.warning(f"Failed to clean up {temp_file}: {e}")
+            return None
+
+    def _progress_reporter(
+        self,
+        job_id: Optional[uuid.UUID],
+        duration: float,
+        operation: str
+    ) -> Optional[Callable[[Dict[str, Any]], None]]:
+        """FFmpeg progress callback publishing stats for job_id, or None when not tracking."""
+        store = self._get_progress_store() if job_id is not None else None
+        if store is None:
+            return None
+
+        def report(stats: Dict[str, Any]):
+            store.set_json(
+                str(job_id),
+                {**stats, "duration": duration, "operation": operation},
+                ttl=RedisConfig.COMPOSITION_PROGRESS_TTL
+            )
+
+        return report
+
+    def _get_progress_store(self) -> Optional[RedisService]:
+        """Redis store for composition progress; None when Redis is unavailable"""
+        if self._progress_store is None:
+            try:
+                self._progress_store = RedisService(RedisConfig.COMPOSITION_PROGRESS_PREFIX)
+            except Exception as e:
+                logger.warning(f"Composition progress reporting disabled, Redis unavailable: {e}")
+                self._progress_store = False
+        return self._progress_store or None
 
     def get_composition_progress(self, job_id: uuid.UUID) -> Dict[str, Any]:
         """Get progress information for an ongoing composition."""
-        # In a real implementation, this would track actual FFmpeg progress
-        # For now, return a simple progress estimate
+        store = self._get_progress_store()
+        stats = store.get_json(str(job_id)) if store else None
+
+        if not stats:
+            return {
+                "stage": "composition",
+                "progress_percentage": 0,
+                "current_operation": "Composing video from assets",
+                "estimated_completion": None
+            }
+
+        total_us = stats["duration"] * 1_000_000
+        out_time_us = stats.get("out_time_us", 0)
+
+        if stats.get("progress") == "end":
+            percentage = 100
+        else:
+            percentage = min(99, int(out_time_us / total_us * 100)) if total_us > 0 else 0
+
+        # Remaining media time divided by encoding speed (media seconds per wall second)
+        estimated_completion = None
+        speed = stats.get("speed")
+        if speed and total_us > out_time_us:
+            remaining_seconds = (total_us - out_time_us) / 1_000_000 / speed
+            estimated_completion = (datetime.now() + timedelta(seconds=remaining_seconds)).isoformat()
+
         return {
             "stage": "composition",
-            "progress_percentage": 75,  # Placeholder
-            "current_operation": "Composing video from assets",
-            "estimated_completion": None
+            "progress_percentage": percentage,
+            "current_operation": stats["operation"],
+            "estimated_completion": estimated_completion
         }
\ No newline at end of file
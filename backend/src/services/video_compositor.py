@@ -6,14 +6,126 @@ Uses FFmpeg to combine AI-generated assets with transitions and audio.
 import logging
 import subprocess
 import os
+import threading
 import uuid
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime
+from functools import lru_cache
+from itertools import accumulate
 import json
 
 logger = logging.getLogger(__name__)
 
+FFMPEG_TIMEOUT = 300  # 5 minute timeout
+STDERR_TAIL_BYTES = 64 * 1024
+PROGRESS_ARGS = ["-progress", "pipe:2", "-nostats"]
+MOCK_IMAGE_NAME = "test_image.jpg"
+# Bare lavfi generator name; output size and rate are set per composition
+MOCK_VIDEO_SOURCE = "testsrc"
+
+# Encoder flags by preference; hardware encoders are used when ffmpeg has them and the device works
+VIDEO_ENCODERS = {
+    "h264_nvenc": ["-preset", "p4", "-tune", "hq", "-rc", "vbr", "-cq", "23", "-pix_fmt", "yuv420p"],
+    "h264_qsv": ["-preset", "veryfast", "-global_quality", "23", "-pix_fmt", "nv12"],
+    "libx264": ["-preset", "veryfast", "-crf", "23", "-pix_fmt", "yuv420p"],
+}
+
+# Mock asset paths are identical across compositions, so resolve them once per process
+_mock_asset_paths: Dict[str, str] = {}
+_mock_asset_lock = threading.Lock()
+_mock_asset_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mock-assets")
+
+
+@lru_cache(maxsize=1)
+def _detect_video_encoder() -> str:
+    """Pick the preferred H.264 encoder this ffmpeg build can actually use, probed once per process."""
+    try:
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-encoders"],
+            capture_output=True, text=True, timeout=10
+        )
+        available = result.stdout if result.returncode == 0 else ""
+    except Exception as e:
+        logger.warning(f"Could not list FFmpeg encoders: {e}")
+        return "libx264"
+
+    for encoder in VIDEO_ENCODERS:
+        if encoder == "libx264" or f" {encoder} " not in available:
+            continue
+        # Listed encoders may still lack a device, so confirm with a tiny encode
+        try:
+            trial = subprocess.run(
+                [
+                    "ffmpeg", "-hide_banner", "-f", "lavfi", "-i", "color=size=256x256:duration=0.1",
+                    "-c:v", encoder, *VIDEO_ENCODERS[encoder], "-f", "null", "-"
+                ],
+                capture_output=True, timeout=30
+            )
+        except Exception:
+            continue
+        if trial.returncode == 0:
+            logger.info(f"Using hardware video encoder {encoder}")
+            return encoder
+
+    return "libx264"
+
+
+class _StderrTail:
+    """Keeps only the last max_chars characters of a line stream."""
+
+    def __init__(self, max_chars: int):
+        self.max_chars = max_chars
+        self._lines = deque()
+        self._size = 0
+
+    def append(self, line: str):
+        self._lines.append(line)
+        self._size += len(line)
+        while self._size > self.max_chars and len(self._lines) > 1:
+            self._size -= len(self._lines.popleft())
+
+    def text(self) -> str:
+        return "".join(self._lines)
+
+
+@lru_cache(maxsize=256)
+def _probe_video(video_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """ffprobe duration/format, memoized per file version (path, mtime, size)."""
+    try:
+        cmd = [
+            "ffprobe", "-v", "quiet", "-print_format", "json",
+            "-show_format", video_path
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        if result.returncode == 0:
+            format_info = json.loads(result.stdout).get("format", {})
+            return {
+                "duration": float(format_info.get("duration", 0)),
+                "format": format_info.get("format_name", "unknown")
+            }
+    except Exception as e:
+        logger.warning(f"Could not get video info: {e}")
+
+    return {"duration": 0, "format": "unknown"}
+
+
+@dataclass(slots=True)
+class Scene:
+    """A single timeline entry in a composition."""
+    id: str
+    type: str
+    path: str
+    input_format: Optional[str]
+    start_time: float
+    duration: float
+    transition: str
+
 
 class VideoCompositorError(Exception):
     """Exception raised by video composition operations."""
@@ -26,12 +138,20 @@ class VideoCompositor:
     def __init__(self):
         self.temp_dir = Path("/tmp/claude/video_composition")
         self.temp_dir.mkdir(parents=True, exist_ok=True)
+        self._video_encoder = _detect_video_encoder()
+        # Temp files created per composition, so cleanup never has to scan temp_dir
+        self._composition_files: Dict[str, List[Path]] = {}
+
+        # Render the mock image in the background; the first read waits on the resolve lock
+        if MOCK_IMAGE_NAME not in _mock_asset_paths:
+            _mock_asset_executor.submit(self._resolve_mock_asset, MOCK_IMAGE_NAME, self._create_test_image)
 
     def compose_hybrid_video(
         self,
         assets_plan: Dict[str, Any],
         output_path: str,
-        composition_settings: Optional[Dict[str, Any]] = None
+        composition_settings: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[float], None]] = None
     ) -> Dict[str, Any]:
         """
         Compose final video from mixed image and video assets.
@@ -40,6 +160,7 @@ class VideoCompositor:
             assets_plan: Plan from EnhancedContentPlanner with images/videos
             output_path: Final video output path
             composition_settings: Additional settings
+            progress_callback: Called with encoded fraction (0.0-1.0) of the timeline
 
         Returns:
             Composition result metadata
@@ -52,19 +173,15 @@ class VideoCompositor:
             fps = settings.get("fps", 30)
 
             # Create composition timeline
-            timeline = self._create_timeline(assets_plan)
-
-            # Generate FFmpeg filter complex
-            filter_complex = self._build_filter_complex(timeline, resolution, fps)
-
-            # Build FFmpeg command
-            cmd = self._build_ffmpeg_command(timeline, filter_complex, output_path, settings)
+            timeline, scene_counts = self._create_timeline(assets_plan)
 
-            # Execute composition
-            result = self._execute_ffmpeg(cmd)
+            # Encode scenes independently, then stitch them without re-encoding
+            result = self._encode_and_concat(
+                timeline, output_path, resolution, fps, progress_callback, settings.get("threads")
+            )
 
             # Get output video info
-            video_info = self._get_video_info(output_path)
+            video_info = self._get_video_info(output_path, result.get("duration"))
 
             logger.info(f"Video composition completed: {output_path}")
 
@@ -75,9 +192,9 @@ class VideoCompositor:
                 "fps": fps,
                 "file_size_mb": video_info.get("size_mb", 0),
                 "composition_metadata": {
-                    "total_scenes": len(timeline),
-                    "image_count": sum(1 for scene in timeline if scene["type"] == "image"),
-                    "video_count": sum(1 for scene in timeline if scene["type"] == "video"),
+                    "total_scenes": sum(scene_counts.values()),
+                    "image_count": scene_counts["image"],
+                    "video_count": scene_counts["video"],
                     "processing_time": result.get("processing_time", 0),
                     "created_at": datetime.utcnow().isoformat()
                 }
@@ -87,115 +204,218 @@ class VideoCompositor:
             logger.error(f"Video composition failed: {e}")
             raise VideoCompositorError(f"Composition failed: {e}")
 
-    def _create_timeline(self, assets_plan: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Create timeline from assets plan."""
-        timeline = []
-        current_time = 0.0
-
-        # Process images
-        for image_asset in assets_plan.get("assets", {}).get("images", []):
-            timeline.append({
-                "id": image_asset["id"],
-                "type": "image",
-                "path": self._get_mock_image_path(),  # Placeholder for now
-                "start_time": current_time,
-                "duration": image_asset["duration"],
-                "transition": "fade"
-            })
-            current_time += image_asset["duration"]
-
-        # Process videos
-        for video_asset in assets_plan.get("assets", {}).get("videos", []):
-            timeline.append({
-                "id": video_asset["id"],
-                "type": "video",
-                "path": self._get_mock_video_path(),  # Placeholder for now
-                "start_time": current_time,
-                "duration": video_asset["duration"],
-                "transition": "crossfade"
-            })
-            current_time += video_asset["duration"]
-
-        # Sort by start time
-        timeline.sort(key=lambda x: x["start_time"])
-        return timeline
-
-    def _build_filter_complex(self, timeline: List[Dict[str, Any]], resolution: str, fps: int) -> str:
-        """Build FFmpeg filter_complex for timeline."""
-        filters = []
-        width, height = map(int, resolution.split("x"))
-
-        # Scale and prepare each input
-        for i, scene in enumerate(timeline):
-            if scene["type"] == "image":
-                # Convert image to video with specified duration
-                filters.append(f"[{i}:v]scale={width}:{height},fps={fps},loop=loop=-1:size={fps * scene['duration']}[v{i}]")
-            else:
-                # Scale video
-                filters.append(f"[{i}:v]scale={width}:{height}[v{i}]")
-
-        # Concatenate all segments
-        input_refs = "".join([f"[v{i}]" for i in range(len(timeline))])
-        filters.append(f"{input_refs}concat=n={len(timeline)}:v=1:a=0[out]")
-
-        return ";".join(filters)
+    def _create_timeline(self, assets_plan: Dict[str, Any]) -> Tuple[List[Scene], Counter]:
+        """Create timeline from assets plan, with scene counts per type."""
+        assets = assets_plan.get("assets", {})
+        images = assets.get("images", [])
+        videos = assets.get("videos", [])
+
+        # Placeholders for now; resolved once rather than per scene
+        image_path = self.mock_image_path if images else None
+
+        # Generated clips are read straight from their lavfi source, never written to disk first
+        scenes = [(asset, "image", image_path, None, "fade") for asset in images]
+        scenes += [(asset, "video", MOCK_VIDEO_SOURCE, "lavfi", "crossfade") for asset in videos]
+
+        # Images then videos play back to back, so construction order is start-time order
+        starts = accumulate((asset["duration"] for asset, *_ in scenes), initial=0.0)
+
+        timeline = [
+            Scene(
+                id=asset["id"],
+                type=scene_type,
+                path=path,
+                input_format=input_format,
+                start_time=start_time,
+                duration=asset["duration"],
+                transition=transition
+            )
+            for (asset, scene_type, path, input_format, transition), start_time in zip(scenes, starts)
+        ]
+        return timeline, Counter(image=len(images), video=len(videos))
 
-    def _build_ffmpeg_command(
+    def _encode_and_concat(
         self,
-        timeline: List[Dict[str, Any]],
-        filter_complex: str,
+        timeline: List[Scene],
         output_path: str,
-        settings: Dict[str, Any]
-    ) -> List[str]:
-        """Build complete FFmpeg command."""
-        cmd = ["ffmpeg", "-y"]  # -y to overwrite output
+        resolution: str,
+        fps: int,
+        progress_callback: Optional[Callable[[float], None]] = None,
+        threads: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Encode each scene to an intermediate MPEG-TS segment in parallel, then concat with stream copy."""
+        if not timeline:
+            raise VideoCompositorError("No scenes to compose")
+
+        start_time = datetime.now()
+        composition_id = uuid.uuid4().hex
+        segment_paths = [self.temp_dir / f"{composition_id}_{i:05d}.ts" for i in range(len(timeline))]
+        list_path = self.temp_dir / f"{composition_id}_concat.txt"
+        self._composition_files[composition_id] = [*segment_paths, list_path]
 
-        # Add input files
-        for scene in timeline:
-            cmd.extend(["-i", scene["path"]])
+        total_duration = sum(scene.duration for scene in timeline) or 1
+        encoded = [0.0] * len(timeline)
+        progress_lock = threading.Lock()
 
-        # Add filter complex
-        cmd.extend(["-filter_complex", filter_complex])
+        def segment_progress(index: int) -> Optional[Callable[[float], None]]:
+            if not progress_callback:
+                return None
 
-        # Map output
-        cmd.extend(["-map", "[out]"])
+            def report(out_time: float):
+                with progress_lock:
+                    encoded[index] = min(out_time, timeline[index].duration)
+                    fraction = sum(encoded) / total_duration
+                progress_callback(min(fraction, 1.0))
 
-        # Output settings
+            return report
+
+        try:
+            # Each job is an ffmpeg child process, so threads are enough to keep all cores busy
+            cpu_count = os.cpu_count() or 1
+            workers = min(len(timeline), cpu_count)
+            # Split cores between concurrent encodes instead of letting each x264 claim all of them
+            segment_threads = threads or max(1, cpu_count // workers)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._execute_ffmpeg,
+                        self._build_segment_command(scene, str(segment_path), resolution, fps, segment_threads),
+                        segment_progress(i)
+                    )
+                    for i, (scene, segment_path) in enumerate(zip(timeline, segment_paths))
+                ]
+                for future in futures:
+                    future.result()
+
+            list_path.write_text("".join(f"file '{self._escape_concat_path(path)}'\n" for path in segment_paths))
+            concat_result = self._execute_ffmpeg(self._build_concat_command(list_path, output_path))
+        finally:
+            self.cleanup(composition_id)
+
+        return {
+            "success": True,
+            "processing_time": (datetime.now() - start_time).total_seconds(),
+            # Final out_time of the stream-copy concat is the output duration
+            "duration": concat_result.get("out_time", 0)
+        }
+
+    def _build_segment_command(
+        self,
+        scene: Scene,
+        segment_path: str,
+        resolution: str,
+        fps: int,
+        threads: int = 0
+    ) -> List[str]:
+        """Build FFmpeg command encoding a single scene to an MPEG-TS segment."""
+        width, height = map(int, resolution.split("x"))
+        cmd = ["ffmpeg", "-y", *PROGRESS_ARGS]  # -y to overwrite output
+        if threads:
+            cmd.extend(["-filter_threads", str(threads)])
+
+        if scene.type == "image":
+            # Let the image demuxer loop the still at the target rate, so only scaling is left to filter
+            cmd.extend(["-loop", "1", "-framerate", str(fps), "-t", str(scene.duration), "-i", scene.path])
+            video_filter = f"scale={width}:{height}"
+        elif scene.input_format == "lavfi":
+            # Generators render at the target size and rate directly, so no filter is needed;
+            # they are unbounded, so cap them at the scene duration
+            source = f"{scene.path}=size={width}x{height}:rate={fps}"
+            cmd.extend(["-f", "lavfi", "-t", str(scene.duration), "-i", source])
+            video_filter = None
+        else:
+            cmd.extend(["-i", scene.path])
+            video_filter = f"scale={width}:{height},fps={fps}"
+
+        if video_filter:
+            cmd.extend(["-vf", video_filter])
+
+        # Segments must share codec parameters so the final concat can stream copy
         cmd.extend([
-            "-c:v", "libx264",
-            "-preset", "medium",
-            "-crf", "23",
-            "-pix_fmt", "yuv420p",
-            "-movflags", "+faststart"
+            "-an",
+            "-threads", str(threads),
+            "-c:v", self._video_encoder,
+            *VIDEO_ENCODERS[self._video_encoder],
+            "-f", "mpegts",
+            segment_path
         ])
 
-        # Add output path
-        cmd.append(output_path)
-
         return cmd
 
-    def _execute_ffmpeg(self, cmd: List[str]) -> Dict[str, Any]:
-        """Execute FFmpeg command with error handling."""
+    def _build_concat_command(self, list_path: Path, output_path: str) -> List[str]:
+        """Build FFmpeg command joining encoded segments without re-encoding."""
+        return [
+            "ffmpeg", "-y", *PROGRESS_ARGS,
+            "-f", "concat", "-safe", "0",
+            "-i", str(list_path),
+            "-c", "copy",
+            "-movflags", "+faststart",
+            output_path
+        ]
+
+    @staticmethod
+    def _escape_concat_path(path: Path) -> str:
+        """Escape single quotes for the concat demuxer list format."""
+        return str(path).replace("'", "'\\''")
+
+    def _execute_ffmpeg(
+        self,
+        cmd: List[str],
+        progress_callback: Optional[Callable[[float], None]] = None
+    ) -> Dict[str, Any]:
+        """Execute FFmpeg command, streaming stderr into a bounded tail buffer."""
         try:
             start_time = datetime.now()
 
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                bufsize=1,
+                text=True
             )
+            stderr_tail = _StderrTail(STDERR_TAIL_BYTES)
+            out_time = [0.0]
+
+            def consume_stderr():
+                for line in proc.stderr:
+                    key, sep, value = line.partition("=")
+                    if sep and key in ("out_time_ms", "out_time_us"):
+                        # ffmpeg reports both keys in microseconds
+                        try:
+                            out_time[0] = int(value) / 1_000_000
+                        except ValueError:
+                            continue
+                        if progress_callback:
+                            progress_callback(out_time[0])
+                    else:
+                        stderr_tail.append(line)
+
+            reader = threading.Thread(target=consume_stderr, daemon=True)
+            reader.start()
+
+            try:
+                returncode = proc.wait(timeout=FFMPEG_TIMEOUT)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+                raise
+            finally:
+                reader.join()
+                proc.stderr.close()
 
             processing_time = (datetime.now() - start_time).total_seconds()
+            stderr = stderr_tail.text()
 
-            if result.returncode != 0:
-                logger.error(f"FFmpeg error: {result.stderr}")
-                raise VideoCompositorError(f"FFmpeg failed: {result.stderr}")
+            if returncode != 0:
+                logger.error(f"FFmpeg error: {stderr}")
+                raise VideoCompositorError(f"FFmpeg failed: {stderr}")
 
             return {
                 "success": True,
                 "processing_time": processing_time,
-                "stderr": result.stderr
+                "out_time": out_time[0],
+                "stderr": stderr
             }
 
         except subprocess.TimeoutExpired:
@@ -203,44 +423,51 @@ class VideoCompositor:
         except Exception as e:
             raise VideoCompositorError(f"FFmpeg execution failed: {e}")
 
-    def _get_video_info(self, video_path: str) -> Dict[str, Any]:
-        """Get video metadata using ffprobe."""
+    def _get_video_info(self, video_path: str, duration: Optional[float] = None) -> Dict[str, Any]:
+        """Get video metadata, probing with ffprobe only when duration is unknown."""
         try:
-            cmd = [
-                "ffprobe", "-v", "quiet", "-print_format", "json",
-                "-show_format", "-show_streams", video_path
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True)
-
-            if result.returncode == 0:
-                info = json.loads(result.stdout)
-                format_info = info.get("format", {})
-
-                return {
-                    "duration": float(format_info.get("duration", 0)),
-                    "size_mb": float(format_info.get("size", 0)) / (1024 * 1024),
-                    "format": format_info.get("format_name", "unknown")
-                }
-        except Exception as e:
+            stat = os.stat(video_path)
+        except OSError as e:
             logger.warning(f"Could not get video info: {e}")
+            return {"duration": 0, "size_mb": 0, "format": "unknown"}
 
-        return {"duration": 0, "size_mb": 0, "format": "unknown"}
-
-    def _get_mock_image_path(self) -> str:
-        """Get path to mock image for testing."""
-        # Create simple test image if needed
-        mock_path = self.temp_dir / "test_image.jpg"
-        if not mock_path.exists():
-            self._create_test_image(str(mock_path))
-        return str(mock_path)
+        size_mb = stat.st_size / (1024 * 1024)
+        if duration:
+            return {
+                "duration": duration,
+                "size_mb": size_mb,
+                "format": Path(video_path).suffix.lstrip(".") or "unknown"
+            }
 
-    def _get_mock_video_path(self) -> str:
-        """Get path to mock video for testing."""
-        mock_path = self.temp_dir / "test_video.mp4"
-        if not mock_path.exists():
-            self._create_test_video(str(mock_path))
-        return str(mock_path)
+        probe = _probe_video(video_path, stat.st_mtime_ns, stat.st_size)
+        return {
+            "duration": probe["duration"],
+            "size_mb": size_mb,
+            "format": probe["format"]
+        }
+
+    @property
+    def mock_image_path(self) -> str:
+        """Path to mock image for testing."""
+        return self._resolve_mock_asset(MOCK_IMAGE_NAME, self._create_test_image)
+
+    def _resolve_mock_asset(self, name: str, create: Callable[[str], None]) -> str:
+        """Resolve a mock asset once per process, creating it if needed."""
+        path = _mock_asset_paths.get(name)
+        if path is not None:
+            return path
+
+        with _mock_asset_lock:
+            path = _mock_asset_paths.get(name)
+            if path is None:
+                mock_path = self.temp_dir / name
+                if not mock_path.exists():
+                    create(str(mock_path))
+                path = str(mock_path)
+                # Only remember assets that exist so a failed creation is retried
+                if mock_path.exists():
+                    _mock_asset_paths[name] = path
+        return path
 
     def _create_test_image(self, path: str):
         """Create test image using FFmpeg."""
@@ -254,24 +481,16 @@ class VideoCompositor:
         except Exception as e:
             logger.warning(f"Could not create test image: {e}")
 
-    def _create_test_video(self, path: str):
-        """Create test video using FFmpeg."""
-        try:
-            cmd = [
-                "ffmpeg", "-y", "-f", "lavfi",
-                "-i", "testsrc=duration=3:size=1920x1080:rate=30",
-                "-c:v", "libx264", "-pix_fmt", "yuv420p", path
-            ]
-            subprocess.run(cmd, capture_output=True, check=True)
-        except Exception as e:
-            logger.warning(f"Could not create test video: {e}")
-
     def cleanup(self, composition_id: str):
         """Clean up temporary files for composition."""
         try:
+            tracked_files = self._composition_files.pop(composition_id, None)
+            if tracked_files is None:
+                # Not created by this instance; fall back to matching by name
+                tracked_files = self.temp_dir.glob(f"{composition_id}_*")
+
             # Remove temporary files associated with composition
-            temp_pattern = self.temp_dir / f"{composition_id}_*"
-            for temp_file in temp_pattern.parent.glob(temp_pattern.name):
+            for temp_file in tracked_files:
                 temp_file.unlink(missing_ok=True)
 
             logger.info(f"Cleaned up composition {composition_id}")
@@ -5,10 +5,14 @@ Coordinates media asset generation, video composition, and job management.
 import logging
 import uuid
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 
+import orjson
+from sqlalchemy import Text, cast, func, text
+
 from ..models.video_generation_job import VideoGenerationJob, JobStatusEnum as JobStatus
 from ..models.generated_video import GeneratedVideo
 from ..models.media_asset import MediaAsset
@@ -20,6 +24,24 @@ from ..lib.error_handlers import handle_ffmpeg_error, execute_ffmpeg_with_fallba
 
 logger = logging.getLogger(__name__)
 
+# Parallel unlink calls when removing expired job assets
+ASSET_CLEANUP_WORKERS = 32
+
+
+def _unlink_quietly(file_path: str):
+    """Remove an asset file, ignoring files that are already gone or unremovable."""
+    try:
+        Path(file_path).unlink(missing_ok=True)
+    except Exception:
+        pass
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback: objects with attributes are converted to dicts of their public fields."""
+    if hasattr(obj, '__dict__'):
+        return {key: value for key, value in obj.__dict__.items() if not key.startswith('_')}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
 
 class VideoGenerationServiceError(Exception):
     """Exception raised by video generation service operations."""
@@ -85,22 +107,21 @@ class VideoGenerationService:
                     raise VideoGenerationServiceError(f"Job {job_id} not found")
 
                 # Phase 1: Generate media assets with graceful degradation
-                job.update_progress(20, JobStatus.MEDIA_GENERATION)
-                db.commit()
+                self._record_progress(job_id, 20, JobStatus.MEDIA_GENERATION)
 
                 assets = self._generate_assets_with_fallback(
                     job_id, script_content, job.composition_settings or {}
                 )
 
                 # Phase 2: Compose final video
-                job.update_progress(60, JobStatus.VIDEO_COMPOSITION)
-                db.commit()
+                self._record_progress(job_id, 60, JobStatus.VIDEO_COMPOSITION)
 
                 video = self._compose_video_with_fallback(
                     assets, job.composition_settings or {}, job_id
                 )
 
-                # Phase 3: Complete job
+                # Phase 3: Complete job - the only durable commit of the workflow
+                db.refresh(job)
                 job.update_progress(100, JobStatus.COMPLETED)
                 job.completed_at = datetime.now()
                 db.add(video)
@@ -115,6 +136,20 @@ class VideoGenerationService:
             self._handle_job_failure(job_id, str(e))
             raise VideoGenerationServiceError(f"Unexpected error: {e}")
 
+    def _record_progress(self, job_id: uuid.UUID, percentage: int, status: JobStatus):
+        """Commit a progress update in its own short transaction so status polls see it."""
+        with get_db_session() as db:
+            if db.get_bind().dialect.name == "postgresql":
+                # Progress is advisory, so don't wait for the WAL flush on this commit
+                db.execute(text("SET LOCAL synchronous_commit = off"))
+
+            job = db.query(VideoGenerationJob).filter(
+                VideoGenerationJob.id == job_id
+            ).first()
+
+            if job:
+                job.update_progress(percentage, status)
+
     def cancel_job(self, job_id: uuid.UUID) -> bool:
         """Cancel an active video generation job."""
         try:
@@ -188,35 +223,55 @@ class VideoGenerationService:
         except Exception as e:
             logger.error(f"Failed to handle job failure for {job_id}: {e}")
 
-    def cleanup_expired_jobs(self, max_age_days: int = 7) -> int:
-        """Clean up old completed/failed jobs and their assets."""
+    def cleanup_expired_jobs(
+        self,
+        max_age_days: int = 7,
+        shard_index: Optional[int] = None,
+        shard_count: int = 1
+    ) -> int:
+        """Clean up old completed/failed jobs and their assets.
+
+        With shard_index set, only jobs whose id hashes into that shard out of
+        shard_count are cleaned, so several workers can split the sweep.
+        """
         try:
             cutoff_date = datetime.now() - timedelta(days=max_age_days)
             cleaned_count = 0
 
             with get_db_session() as db:
-                expired_jobs = db.query(VideoGenerationJob).filter(
+                query = db.query(VideoGenerationJob.id).filter(
                     VideoGenerationJob.completed_at < cutoff_date,
                     VideoGenerationJob.status.in_([JobStatus.COMPLETED, JobStatus.FAILED])
-                ).all()
+                )
+                if shard_index is not None:
+                    # hashtext() can be negative, so the sign bit is masked off before the modulo
+                    job_hash = func.hashtext(cast(VideoGenerationJob.id, Text)).op("&")(0x7FFFFFFF)
+                    query = query.filter(job_hash % shard_count == shard_index)
 
-                for job in expired_jobs:
-                    # Clean up associated assets
-                    assets = db.query(MediaAsset).filter(
-                        MediaAsset.generation_job_id == job.id
-                    ).all()
+                job_ids = [job_id for (job_id,) in query]
 
-                    for asset in assets:
-                        try:
-                            Path(asset.file_path).unlink(missing_ok=True)
-                        except Exception:
-                            pass
+                if not job_ids:
+                    return 0
 
-                    db.delete(job)
-                    cleaned_count += 1
+                asset_paths = [
+                    file_path for (file_path,) in db.query(MediaAsset.file_path).filter(
+                        MediaAsset.generation_job_id.in_(job_ids)
+                    )
+                ]
+
+                db.query(MediaAsset).filter(
+                    MediaAsset.generation_job_id.in_(job_ids)
+                ).delete(synchronize_session=False)
+                cleaned_count = db.query(VideoGenerationJob).filter(
+                    VideoGenerationJob.id.in_(job_ids)
+                ).delete(synchronize_session=False)
 
                 db.commit()
 
+            # Unlink releases the GIL, so asset files are removed concurrently once rows are gone
+            with ThreadPoolExecutor(max_workers=ASSET_CLEANUP_WORKERS) as executor:
+                list(executor.map(_unlink_quietly, asset_paths))
+
             logger.info(f"Cleaned up {cleaned_count} expired jobs")
             return cleaned_count
 
@@ -267,16 +322,18 @@ class VideoGenerationService:
 
     def _sanitize_for_json(self, obj: Any) -> Any:
         """Convert objects to JSON-serializable format."""
-        if isinstance(obj, uuid.UUID):
-            return str(obj)
-        elif isinstance(obj, datetime):
-            return obj.isoformat()
-        elif isinstance(obj, dict):
-            return {key: self._sanitize_for_json(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [self._sanitize_for_json(item) for item in obj]
-        elif hasattr(obj, '__dict__'):
-            # For objects with attributes, convert to dict
-            return {key: self._sanitize_for_json(value) for key, value in obj.__dict__.items() if not key.startswith('_')}
-        else:
-            return obj
\ No newline at end of file
+        # orjson walks the structure in C; UUIDs and datetimes are handled natively
+        return orjson.loads(orjson.dumps(obj, default=_json_default, option=orjson.OPT_NON_STR_KEYS))
+
+
+# Global service instance
+_video_generation_service: Optional[VideoGenerationService] = None
+
+def get_video_generation_service() -> VideoGenerationService:
+    """Get global video generation service instance"""
+    global _video_generation_service
+
+    if _video_generation_service is None:
+        _video_generation_service = VideoGenerationService()
+
+    return _video_generation_service
@@ -1,16 +1,28 @@
 from typing import Dict, Any, List, Optional
 from sqlalchemy.orm import Session
+import asyncio
 import uuid
 import logging
 import ffmpeg
-import os
+from pathlib import Path
 
 from ..models.composed_video import ComposedVideo, UploadStatusEnum
 from ..models.video_project import VideoProject, ProjectStatusEnum
 from ..models.media_asset import MediaAsset, AssetTypeEnum
+from ..models.video_generation_job import VideoGenerationJob
 
 logger = logging.getLogger(__name__)
 
+# Asset types that go into a composed video; text overlays are not composed here
+COMPOSABLE_ASSET_TYPES = (AssetTypeEnum.AUDIO, AssetTypeEnum.IMAGE, AssetTypeEnum.VIDEO_CLIP)
+
+
+def _write_placeholder_video(output_path: str, content: str):
+    """Create the output directory and write the simulated video file."""
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
 
 class VideoService:
     """Service for composing final videos from media assets"""
@@ -43,14 +55,23 @@ class VideoService:
             if project.status != ProjectStatusEnum.ready:
                 raise ValueError(f"Project not ready for composition: {project.status}")
 
-            # Get all assets
-            assets = self.db.query(MediaAsset).filter(
-                MediaAsset.project_id == project.id
+            # Get composable assets generated for the project's script; other asset
+            # types are filtered out in the database
+            assets = self.db.query(MediaAsset).join(
+                VideoGenerationJob, MediaAsset.generation_job_id == VideoGenerationJob.id
+            ).filter(
+                VideoGenerationJob.script_id == project.script_id,
+                MediaAsset.asset_type.in_(COMPOSABLE_ASSET_TYPES)
             ).all()
 
-            audio_assets = [a for a in assets if a.asset_type == AssetTypeEnum.audio]
-            image_assets = [a for a in assets if a.asset_type == AssetTypeEnum.image]
-            video_assets = [a for a in assets if a.asset_type == AssetTypeEnum.video]
+            # Split by type in a single pass
+            buckets = {asset_type: [] for asset_type in COMPOSABLE_ASSET_TYPES}
+            for asset in assets:
+                buckets[asset.asset_type].append(asset)
+
+            audio_assets = buckets[AssetTypeEnum.AUDIO]
+            image_assets = buckets[AssetTypeEnum.IMAGE]
+            video_assets = buckets[AssetTypeEnum.VIDEO_CLIP]
 
             if not audio_assets:
                 raise ValueError("No audio assets found for composition")
@@ -139,12 +160,12 @@ class VideoService:
                 "video_sources": len(video_assets)
             }
 
-            # Simulate file creation
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-
-            # Create a dummy file to simulate the composed video
-            with open(output_path, 'w') as f:
-                f.write(f"Simulated video file - Duration: {total_duration}s")
+            # Create a dummy file to simulate the composed video, off the event loop
+            await asyncio.to_thread(
+                _write_placeholder_video,
+                output_path,
+                f"Simulated video file - Duration: {total_duration}s"
+            )
 
             # Estimate file size (rough calculation)
             estimated_size = total_duration * 250000  # ~250KB per second for 1080p
@@ -173,14 +194,19 @@ class VideoService:
     def validate_assets_for_composition(self, project_id: str) -> bool:
         """Validate that all required assets are available for composition"""
         try:
-            assets = self.db.query(MediaAsset).filter(
-                MediaAsset.project_id == uuid.UUID(project_id)
-            ).all()
-
-            audio_assets = [a for a in assets if a.asset_type == AssetTypeEnum.audio]
-
             # Must have at least one audio asset
-            return len(audio_assets) > 0
+            has_audio = self.db.query(
+                self.db.query(MediaAsset).join(
+                    VideoGenerationJob, MediaAsset.generation_job_id == VideoGenerationJob.id
+                ).join(
+                    VideoProject, VideoProject.script_id == VideoGenerationJob.script_id
+                ).filter(
+                    VideoProject.id == uuid.UUID(project_id),
+                    MediaAsset.asset_type == AssetTypeEnum.AUDIO
+                ).exists()
+            ).scalar()
+
+            return bool(has_audio)
 
         except Exception as e:
             logger.error(f"Failed to validate assets for project {project_id}: {e}")
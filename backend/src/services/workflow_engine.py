@@ -1,4 +1,6 @@
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Union
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import logging
 import uuid
@@ -7,11 +9,59 @@ from ..models.workflow import Workflow, WorkflowStatusEnum, WorkflowModeEnum
 from ..models.uploaded_script import UploadedScript
 from .workflow_mode_service import WorkflowModeService
 from .script_upload_service import ScriptUploadService
-from ..lib.database import get_db_session
+from ..lib.database import ScopedSession
+from ..lib.redis import RedisService, RedisConfig
 
 logger = logging.getLogger(__name__)
 
 
+def _build_step_completion(mode: str, status: str, has_script: bool) -> Mapping[str, bool]:
+    """Completion flags for each workflow step given mode, status and script presence"""
+    if mode == "UPLOAD":
+        completion = {
+            "mode_selection": status != "CREATED",
+            "script_upload": has_script,
+            "script_validation": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
+            "content_processing": status in ["PROCESSING", "COMPLETED"],
+            "content_optimization": status == "COMPLETED",
+            "formatting": status == "COMPLETED",
+            "publishing": status == "COMPLETED"
+        }
+    else:  # GENERATE mode
+        completion = {
+            "mode_selection": status != "CREATED",
+            "youtube_research": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
+            "script_generation": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
+            "content_processing": status in ["PROCESSING", "COMPLETED"],
+            "content_optimization": status == "COMPLETED",
+            "formatting": status == "COMPLETED",
+            "publishing": status == "COMPLETED"
+        }
+    return MappingProxyType(completion)
+
+
+# Every step handled by either mode; anything else is rejected before the workflow is loaded
+KNOWN_STEPS = frozenset({
+    "mode_selection",
+    "script_upload",
+    "content_processing",
+    "youtube_research",
+    "script_generation",
+    "content_optimization",
+    "formatting",
+    "publishing",
+})
+
+
+# Step completion depends only on (mode, status, has_script), so every combination is built once
+STEP_COMPLETION: Mapping[Tuple[str, str, bool], Mapping[str, bool]] = {
+    (mode.value, status.value, has_script): _build_step_completion(mode.value, status.value, has_script)
+    for mode in WorkflowModeEnum
+    for status in WorkflowStatusEnum
+    for has_script in (False, True)
+}
+
+
 class WorkflowEngine:
     """Engine for orchestrating content creation workflows with script upload integration"""
 
@@ -19,15 +69,41 @@ class WorkflowEngine:
         self.db_session = db_session
         self.workflow_service = WorkflowModeService(db_session)
         self.script_service = ScriptUploadService(db_session)
+        self._progress_cache = None
+
+        # Step handlers by mode, built here because they are bound methods
+        self._step_handlers = {
+            WorkflowModeEnum.UPLOAD: {
+                "mode_selection": self._upload_mode_selection,
+                "script_upload": self._upload_script_upload,
+                "content_processing": self._upload_content_processing,
+            },
+            WorkflowModeEnum.GENERATE: {
+                "mode_selection": self._generate_mode_selection,
+                "youtube_research": self._generate_youtube_research,
+                "script_generation": self._generate_script_generation,
+            },
+        }
+        self._standard_step_handlers = {
+            "content_optimization": self._content_optimization,
+            "formatting": self._formatting,
+            "publishing": self._publishing,
+        }
 
     def _get_session(self) -> Session:
         """Get database session"""
         if self.db_session:
             return self.db_session
-        return next(get_db_session())
+        return ScopedSession()
 
     def process_workflow_step(self, workflow_id: str, step: str) -> Dict[str, Any]:
         """Process a workflow step based on workflow mode and current state"""
+        if step not in KNOWN_STEPS:
+            return {
+                "success": False,
+                "error": f"Unknown workflow step: {step}"
+            }
+
         try:
             workflow = self.workflow_service.get_workflow(workflow_id)
             if not workflow:
@@ -35,148 +111,151 @@ class WorkflowEngine:
 
             logger.info(f"Processing step '{step}' for workflow {workflow_id} (mode: {workflow.mode.value})")
 
-            # Route based on workflow mode and step
-            if workflow.mode == WorkflowModeEnum.UPLOAD:
-                return self._process_upload_workflow_step(workflow, step)
-            elif workflow.mode == WorkflowModeEnum.GENERATE:
-                return self._process_generate_workflow_step(workflow, step)
-            else:
+            # Route based on workflow mode and step; steps shared by both modes are the fallback
+            mode_handlers = self._step_handlers.get(workflow.mode)
+            if mode_handlers is None:
                 return {"success": False, "error": "Unknown workflow mode"}
 
-        except Exception as e:
-            logger.error(f"Error processing workflow step {step} for {workflow_id}: {e}")
-            return {"success": False, "error": str(e)}
-
-    def _process_upload_workflow_step(self, workflow: Workflow, step: str) -> Dict[str, Any]:
-        """Process workflow steps for script upload mode"""
-
-        if step == "mode_selection":
-            # Mode already selected, move to script upload
-            return {
-                "success": True,
-                "next_step": "script_upload",
-                "message": "Upload mode selected, ready for script upload"
-            }
-
-        elif step == "script_upload":
-            # Check if script is already uploaded
-            if workflow.uploaded_script_id:
-                script = self.script_service.get_script(str(workflow.uploaded_script_id))
-                if script and script.is_valid():
-                    # Script ready, move to processing
-                    self.workflow_service.update_workflow_status(
-                        str(workflow.id),
-                        WorkflowStatusEnum.SCRIPT_READY
-                    )
-                    return {
-                        "success": True,
-                        "next_step": "content_processing",
-                        "message": "Script uploaded and validated successfully"
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": "Uploaded script is not valid",
-                        "next_step": "script_upload"
-                    }
-            else:
+            handler = mode_handlers.get(step) or self._standard_step_handlers.get(step)
+            if handler is None:
                 return {
-                    "success": True,
-                    "message": "Waiting for script upload",
-                    "current_step": "script_upload"
+                    "success": False,
+                    "error": f"Unknown workflow step: {step}"
                 }
 
-        elif step == "content_processing":
-            # Skip research and generation, proceed to optimization
-            return {
-                "success": True,
-                "next_step": "content_optimization",
-                "message": "Ready for content optimization",
-                "skipped_steps": ["youtube_research", "script_generation"]
-            }
-
-        else:
-            # Default processing for other steps
-            return self._process_standard_step(workflow, step)
-
-    def _process_generate_workflow_step(self, workflow: Workflow, step: str) -> Dict[str, Any]:
-        """Process workflow steps for script generation mode"""
-
-        if step == "mode_selection":
-            return {
-                "success": True,
-                "next_step": "youtube_research",
-                "message": "Generate mode selected, starting research"
-            }
-
-        elif step == "youtube_research":
-            # Placeholder for YouTube research integration
-            return {
-                "success": True,
-                "next_step": "script_generation",
-                "message": "Research completed, ready for script generation",
-                "data": {"research_completed": True}
-            }
-
-        elif step == "script_generation":
-            # Placeholder for AI script generation
-            return {
-                "success": True,
-                "next_step": "content_processing",
-                "message": "Script generated successfully",
-                "data": {"script_generated": True}
-            }
+            return handler(workflow)
 
-        else:
-            # Default processing for other steps
-            return self._process_standard_step(workflow, step)
+        except Exception as e:
+            logger.error(f"Error processing workflow step {step} for {workflow_id}: {e}")
+            return {"success": False, "error": str(e)}
 
-    def _process_standard_step(self, workflow: Workflow, step: str) -> Dict[str, Any]:
-        """Process standard workflow steps that apply to both modes"""
+    # Script upload mode steps
 
-        if step == "content_optimization":
-            return {
-                "success": True,
-                "next_step": "formatting",
-                "message": "Content optimization completed"
-            }
+    def _upload_mode_selection(self, workflow: Workflow) -> Dict[str, Any]:
+        # Mode already selected, move to script upload
+        return {
+            "success": True,
+            "next_step": "script_upload",
+            "message": "Upload mode selected, ready for script upload"
+        }
 
-        elif step == "formatting":
+    def _upload_script_upload(self, workflow: Workflow) -> Dict[str, Any]:
+        # Check if script is already uploaded
+        if not workflow.uploaded_script_id:
             return {
                 "success": True,
-                "next_step": "publishing",
-                "message": "Content formatting completed"
+                "message": "Waiting for script upload",
+                "current_step": "script_upload"
             }
 
-        elif step == "publishing":
-            # Mark workflow as completed
-            self.workflow_service.update_workflow_status(
-                str(workflow.id),
-                WorkflowStatusEnum.COMPLETED
-            )
-            return {
-                "success": True,
-                "message": "Workflow completed successfully",
-                "completed": True
-            }
-
-        else:
+        script = self.script_service.get_script(str(workflow.uploaded_script_id))
+        if not (script and script.is_valid()):
             return {
                 "success": False,
-                "error": f"Unknown workflow step: {step}"
+                "error": "Uploaded script is not valid",
+                "next_step": "script_upload"
             }
 
+        # Script ready, move to processing
+        self.workflow_service.update_workflow_status(
+            workflow.id,
+            WorkflowStatusEnum.SCRIPT_READY
+        )
+        return {
+            "success": True,
+            "next_step": "content_processing",
+            "message": "Script uploaded and validated successfully"
+        }
+
+    def _upload_content_processing(self, workflow: Workflow) -> Dict[str, Any]:
+        # Skip research and generation, proceed to optimization
+        return {
+            "success": True,
+            "next_step": "content_optimization",
+            "message": "Ready for content optimization",
+            "skipped_steps": ["youtube_research", "script_generation"]
+        }
+
+    # Script generation mode steps
+
+    def _generate_mode_selection(self, workflow: Workflow) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "next_step": "youtube_research",
+            "message": "Generate mode selected, starting research"
+        }
+
+    def _generate_youtube_research(self, workflow: Workflow) -> Dict[str, Any]:
+        # Placeholder for YouTube research integration
+        return {
+            "success": True,
+            "next_step": "script_generation",
+            "message": "Research completed, ready for script generation",
+            "data": {"research_completed": True}
+        }
+
+    def _generate_script_generation(self, workflow: Workflow) -> Dict[str, Any]:
+        # Placeholder for AI script generation
+        return {
+            "success": True,
+            "next_step": "content_processing",
+            "message": "Script generated successfully",
+            "data": {"script_generated": True}
+        }
+
+    # Standard steps that apply to both modes
+
+    def _content_optimization(self, workflow: Workflow) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "next_step": "formatting",
+            "message": "Content optimization completed"
+        }
+
+    def _formatting(self, workflow: Workflow) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "next_step": "publishing",
+            "message": "Content formatting completed"
+        }
+
+    def _publishing(self, workflow: Workflow) -> Dict[str, Any]:
+        # Mark workflow as completed
+        self.workflow_service.update_workflow_status(
+            workflow.id,
+            WorkflowStatusEnum.COMPLETED
+        )
+        return {
+            "success": True,
+            "message": "Workflow completed successfully",
+            "completed": True
+        }
+
     def get_workflow_progress(self, workflow_id: str) -> Dict[str, Any]:
         """Get detailed workflow progress information"""
         try:
-            # Get workflow progress from workflow service
-            progress = self.workflow_service.get_workflow_progress(workflow_id)
-            if not progress:
+            # Any write to the workflow or its script changes the version, so cached entries never go stale
+            version = self._get_progress_version(workflow_id)
+            if version is None:
                 return {"success": False, "error": "Workflow not found"}
 
+            cache = self._get_progress_cache()
+            cache_key = f"{workflow_id}:{version}"
+            if cache:
+                cached = cache.get_json(cache_key)
+                if cached is not None:
+                    return {"success": True, "progress": cached}
+
+            # Workflow and its uploaded script come back in a single query
+            workflow = self.workflow_service.get_workflow(workflow_id, with_script=True)
+            if not workflow:
+                return {"success": False, "error": "Workflow not found"}
+
+            progress = self.workflow_service.build_workflow_progress(workflow)
+
             # Add script information if available
-            if progress.get("uploaded_script_id"):
-                script = self.script_service.get_script(progress["uploaded_script_id"])
+            if workflow.uploaded_script_id:
+                script = workflow.uploaded_script
                 if script:
                     progress["script_info"] = {
                         "content_length": script.content_length,
@@ -188,55 +267,73 @@ class WorkflowEngine:
             # Add step completion status
             progress["step_completion"] = self._get_step_completion_status(progress)
 
+            if cache:
+                cache.set_json(
+                    cache_key,
+                    {**progress, "step_completion": dict(progress["step_completion"])},
+                    ttl=RedisConfig.WORKFLOW_PROGRESS_TTL
+                )
+
             return {"success": True, "progress": progress}
 
         except Exception as e:
             logger.error(f"Error getting workflow progress for {workflow_id}: {e}")
             return {"success": False, "error": str(e)}
 
-    def _get_step_completion_status(self, progress: Dict[str, Any]) -> Dict[str, bool]:
-        """Get completion status for each workflow step"""
-        mode = progress.get("mode", "GENERATE")
+    def _get_progress_version(self, workflow_id: str) -> Optional[str]:
+        """Last-update stamps of a workflow and its uploaded script, or None if the workflow doesn't exist"""
+        try:
+            workflow_uuid = uuid.UUID(workflow_id)
+        except ValueError:
+            return None
+
+        row = self._get_session().execute(
+            select(Workflow.updated_at, UploadedScript.updated_at)
+            .outerjoin(UploadedScript, Workflow.uploaded_script_id == UploadedScript.id)
+            .where(Workflow.id == workflow_uuid)
+        ).first()
+
+        if row is None:
+            return None
+
+        return ":".join(stamp.isoformat() if stamp else "-" for stamp in row)
+
+    def _get_progress_cache(self) -> Optional[RedisService]:
+        """Redis cache for progress payloads; None when Redis is unavailable"""
+        if self._progress_cache is None:
+            try:
+                self._progress_cache = RedisService(RedisConfig.WORKFLOW_PROGRESS_PREFIX)
+            except Exception as e:
+                logger.warning(f"Workflow progress cache disabled, Redis unavailable: {e}")
+                self._progress_cache = False
+        return self._progress_cache or None
+
+    def _get_step_completion_status(self, progress: Dict[str, Any]) -> Mapping[str, bool]:
+        """Get completion status for each workflow step (shared read-only mapping)"""
+        mode = "UPLOAD" if progress.get("mode", "GENERATE") == "UPLOAD" else "GENERATE"
         status = progress.get("status", "CREATED")
-
-        if mode == "UPLOAD":
-            return {
-                "mode_selection": status != "CREATED",
-                "script_upload": progress.get("uploaded_script_id") is not None,
-                "script_validation": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
-                "content_processing": status in ["PROCESSING", "COMPLETED"],
-                "content_optimization": status == "COMPLETED",
-                "formatting": status == "COMPLETED",
-                "publishing": status == "COMPLETED"
-            }
-        else:  # GENERATE mode
-            return {
-                "mode_selection": status != "CREATED",
-                "youtube_research": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
-                "script_generation": status in ["SCRIPT_READY", "PROCESSING", "COMPLETED"],
-                "content_processing": status in ["PROCESSING", "COMPLETED"],
-                "content_optimization": status == "COMPLETED",
-                "formatting": status == "COMPLETED",
-                "publishing": status == "COMPLETED"
-            }
-
-    def handle_script_upload_completion(self, workflow_id: str, script_id: str) -> Dict[str, Any]:
+        has_script = progress.get("uploaded_script_id") is not None
+
+        completion = STEP_COMPLETION.get((mode, status, has_script))
+        if completion is None:
+            completion = _build_step_completion(mode, status, has_script)
+        return completion
+
+    def handle_script_upload_completion(
+        self,
+        workflow_id: Union[str, uuid.UUID],
+        script_id: Union[str, uuid.UUID]
+    ) -> Dict[str, Any]:
         """Handle completion of script upload for a workflow"""
         try:
-            # Associate script with workflow
-            success, message = self.workflow_service.associate_script_with_workflow(
+            # Associate script with workflow and mark it ready in a single write
+            success, message = self.workflow_service.associate_and_mark_ready(
                 workflow_id, script_id
             )
 
             if not success:
                 return {"success": False, "error": message}
 
-            # Update workflow status
-            self.workflow_service.update_workflow_status(
-                workflow_id,
-                WorkflowStatusEnum.SCRIPT_READY
-            )
-
             logger.info(f"Script upload completed for workflow {workflow_id}, script {script_id}")
 
             return {
@@ -254,23 +351,33 @@ class WorkflowEngine:
         try:
             session = self._get_session()
 
-            query = session.query(Workflow)
+            # Only the listed columns are selected, so no ORM objects are built
+            query = select(
+                Workflow.id,
+                Workflow.title,
+                Workflow.description,
+                Workflow.mode,
+                Workflow.status,
+                Workflow.created_at,
+                Workflow.updated_at
+            )
             if user_id:
-                query = query.filter(Workflow.user_id == uuid.UUID(user_id))
+                query = query.where(Workflow.user_id == uuid.UUID(user_id))
 
-            workflows = query.order_by(Workflow.created_at.desc()).limit(50).all()
+            rows = session.execute(query.order_by(Workflow.created_at.desc()).limit(50))
 
+            # IDs and timestamps stay as UUID/datetime objects for the JSON encoder to write directly
             return [
                 {
-                    "workflow_id": str(workflow.id),
-                    "title": workflow.title,
-                    "description": workflow.description,
-                    "mode": workflow.mode.value,
-                    "status": workflow.status.value,
-                    "created_at": workflow.created_at.isoformat(),
-                    "updated_at": workflow.updated_at.isoformat() if workflow.updated_at else None
+                    "workflow_id": row.id,
+                    "title": row.title,
+                    "description": row.description,
+                    "mode": row.mode.value,
+                    "status": row.status.value,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at
                 }
-                for workflow in workflows
+                for row in rows
             ]
 
         except Exception as e:
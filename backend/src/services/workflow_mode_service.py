@@ -1,17 +1,38 @@
-from typing import Optional, Tuple, Union
-from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple, Union
+from sqlalchemy import case, exists, false, func, select, update
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy.exc import SQLAlchemyError
 import uuid
 import logging
-from datetime import datetime
 
-from ..models.workflow import Workflow, WorkflowModeEnum, WorkflowStatusEnum
+from ..models.workflow import Workflow, WorkflowModeEnum, WorkflowStatusEnum, ScriptSourceEnum
 from ..models.uploaded_script import UploadedScript
-from ..lib.database import SessionLocal
+from ..lib.database import ScopedSession
 
 logger = logging.getLogger(__name__)
 
 
+# Valid status transitions, and the same table inverted for filtering UPDATEs by current status
+VALID_TRANSITIONS = {
+    WorkflowStatusEnum.CREATED: (WorkflowStatusEnum.MODE_SELECTED, WorkflowStatusEnum.FAILED),
+    WorkflowStatusEnum.MODE_SELECTED: (WorkflowStatusEnum.SCRIPT_READY, WorkflowStatusEnum.FAILED),
+    WorkflowStatusEnum.SCRIPT_READY: (WorkflowStatusEnum.PROCESSING, WorkflowStatusEnum.FAILED),
+    WorkflowStatusEnum.PROCESSING: (WorkflowStatusEnum.COMPLETED, WorkflowStatusEnum.FAILED),
+    WorkflowStatusEnum.COMPLETED: (),  # Terminal state
+    WorkflowStatusEnum.FAILED: (WorkflowStatusEnum.CREATED,)  # Can restart
+}
+
+ALLOWED_PREDECESSORS: Dict[WorkflowStatusEnum, Tuple[WorkflowStatusEnum, ...]] = {
+    status: tuple(current for current, targets in VALID_TRANSITIONS.items() if status in targets)
+    for status in WorkflowStatusEnum
+}
+
+
+def _as_uuid(value: Union[str, uuid.UUID]) -> uuid.UUID:
+    """Parse an ID string, passing through values that are already UUIDs"""
+    return value if isinstance(value, uuid.UUID) else uuid.UUID(value)
+
+
 class WorkflowModeService:
     """Service for managing workflow modes and state transitions"""
 
@@ -22,27 +43,25 @@ class WorkflowModeService:
         """Get database session"""
         if self.db_session:
             return self.db_session
-        # Create a new session for standalone use
-        return SessionLocal()
+        # Reuse the pooled request/task-scoped session for standalone use
+        return ScopedSession()
 
     def create_workflow(
         self,
         title: Optional[str] = None,
         description: Optional[str] = None,
-        user_id: Optional[str] = None
+        user_id: Optional[Union[str, uuid.UUID]] = None
     ) -> Tuple[bool, Union[Workflow, str]]:
         """Create a new workflow"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)  # We created the session
 
             workflow = Workflow(
                 title=title,
                 description=description,
-                user_id=uuid.UUID(user_id) if user_id else None,
+                user_id=_as_uuid(user_id) if user_id else None,
                 status=WorkflowStatusEnum.CREATED
             )
 
@@ -67,21 +86,20 @@ class WorkflowModeService:
             if session:
                 session.rollback()
             return False, f"Workflow creation failed: {str(e)}"
-        finally:
-            if created_session and session:
-                session.close()
 
-    def get_workflow(self, workflow_id: str) -> Optional[Workflow]:
-        """Get workflow by ID"""
+    def get_workflow(self, workflow_id: Union[str, uuid.UUID], with_script: bool = False) -> Optional[Workflow]:
+        """Get workflow by ID, optionally eager-loading its uploaded script in the same query"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)
 
-            workflow = session.query(Workflow).filter(
-                Workflow.id == uuid.UUID(workflow_id)
+            query = session.query(Workflow)
+            if with_script:
+                query = query.options(joinedload(Workflow.uploaded_script))
+
+            workflow = query.filter(
+                Workflow.id == _as_uuid(workflow_id)
             ).first()
 
             if workflow:
@@ -100,59 +118,81 @@ class WorkflowModeService:
         except Exception as e:
             logger.error(f"Unexpected error retrieving workflow {workflow_id}: {e}")
             return None
-        finally:
-            if created_session and session:
-                session.close()
+
+    def get_routing_state(self, workflow_id: Union[str, uuid.UUID]):
+        """Get only the mode, status and skip flags of a workflow, or None if it doesn't exist"""
+        try:
+            session = self._get_session()
+
+            return session.execute(
+                select(
+                    Workflow.mode,
+                    Workflow.status,
+                    Workflow.skip_research,
+                    Workflow.skip_generation
+                ).where(Workflow.id == _as_uuid(workflow_id))
+            ).first()
+
+        except ValueError as e:
+            logger.error(f"Invalid UUID format for workflow_id {workflow_id}: {e}")
+            return None
+        except SQLAlchemyError as e:
+            logger.error(f"Database error retrieving workflow {workflow_id}: {e}")
+            return None
 
     def set_workflow_mode(
         self,
-        workflow_id: str,
+        workflow_id: Union[str, uuid.UUID],
         mode: WorkflowModeEnum,
-        uploaded_script_id: Optional[str] = None
+        uploaded_script_id: Optional[Union[str, uuid.UUID]] = None
     ) -> Tuple[bool, Union[Workflow, str]]:
         """Set workflow mode and configure accordingly"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)
 
-            workflow = session.query(Workflow).filter(
-                Workflow.id == uuid.UUID(workflow_id)
+            workflow_uuid = _as_uuid(workflow_id)
+            script_uuid = _as_uuid(uploaded_script_id) if uploaded_script_id else None
+
+            # Load the workflow and check the uploaded script in a single round trip
+            script_join = UploadedScript.id == script_uuid if script_uuid else false()
+            row = session.query(Workflow, UploadedScript.id).outerjoin(
+                UploadedScript, script_join
+            ).filter(
+                Workflow.id == workflow_uuid
             ).first()
 
-            if not workflow:
+            if not row:
                 logger.warning(f"Workflow not found: {workflow_id}")
                 return False, "Workflow not found"
 
+            workflow, found_script_id = row
+
             # Validate mode transition
             if not self._can_change_mode(workflow, mode):
                 return False, f"Cannot change mode from {workflow.mode.value} to {mode.value}"
 
             # Configure workflow based on mode
             if mode == WorkflowModeEnum.UPLOAD:
-                if uploaded_script_id:
-                    # Verify uploaded script exists
-                    uploaded_script = session.query(UploadedScript).filter(
-                        UploadedScript.id == uuid.UUID(uploaded_script_id)
-                    ).first()
-
-                    if not uploaded_script:
-                        return False, "Uploaded script not found"
-
-                    workflow.set_upload_mode(uuid.UUID(uploaded_script_id))
-                else:
-                    # Set upload mode without script (script will be uploaded later)
-                    workflow.mode = WorkflowModeEnum.UPLOAD
-                    workflow.skip_research = True
-                    workflow.skip_generation = True
-                    workflow.status = WorkflowStatusEnum.MODE_SELECTED
-
+                if script_uuid and found_script_id is None:
+                    return False, "Uploaded script not found"
+                # Without a script, upload mode is set and the script is uploaded later
+                values = Workflow.upload_mode_values(script_uuid)
             elif mode == WorkflowModeEnum.GENERATE:
-                workflow.set_generate_mode()
-
-            workflow.updated_at = datetime.utcnow()
+                values = Workflow.generate_mode_values()
+            else:
+                values = {}
+
+            # Write the new mode and read the row back in the same statement;
+            # updated_at is stamped by the database through the column's onupdate
+            workflow = session.execute(
+                update(Workflow)
+                .where(Workflow.id == workflow_uuid)
+                .values(**values)
+                .returning(Workflow),
+                execution_options={"populate_existing": True}
+            ).scalar_one()
             session.commit()
 
             logger.info(f"Set workflow {workflow_id} mode to {mode.value}")
@@ -173,9 +213,6 @@ class WorkflowModeService:
             if session:
                 session.rollback()
             return False, f"Mode setting failed: {str(e)}"
-        finally:
-            if created_session and session:
-                session.close()
 
     def _can_change_mode(self, workflow: Workflow, new_mode: WorkflowModeEnum) -> bool:
         """Check if workflow mode can be changed"""
@@ -195,30 +232,37 @@ class WorkflowModeService:
 
     def update_workflow_status(
         self,
-        workflow_id: str,
+        workflow_id: Union[str, uuid.UUID],
         status: WorkflowStatusEnum
     ) -> Tuple[bool, str]:
         """Update workflow status"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)
-
-            workflow = session.query(Workflow).filter(
-                Workflow.id == uuid.UUID(workflow_id)
-            ).first()
-
-            if not workflow:
-                return False, "Workflow not found"
 
-            # Validate status transition
-            if not self._can_transition_to_status(workflow, status):
-                return False, f"Invalid status transition from {workflow.status.value} to {status.value}"
+            workflow_uuid = _as_uuid(workflow_id)
+
+            # The transition is validated by the UPDATE itself, so no prior read is needed
+            updated_id = session.execute(
+                update(Workflow)
+                .where(
+                    Workflow.id == workflow_uuid,
+                    Workflow.status.in_(ALLOWED_PREDECESSORS[status])
+                )
+                .values(status=status)
+                .returning(Workflow.id)
+            ).scalar_one_or_none()
+
+            if updated_id is None:
+                # Re-read once to tell a missing workflow from an invalid transition
+                current = session.execute(
+                    select(Workflow.status).where(Workflow.id == workflow_uuid)
+                ).scalar_one_or_none()
+                if current is None:
+                    return False, "Workflow not found"
+                return False, f"Invalid status transition from {current.value} to {status.value}"
 
-            workflow.status = status
-            workflow.updated_at = datetime.utcnow()
             session.commit()
 
             logger.info(f"Updated workflow {workflow_id} status to {status.value}")
@@ -239,32 +283,17 @@ class WorkflowModeService:
             if session:
                 session.rollback()
             return False, f"Status update failed: {str(e)}"
-        finally:
-            if created_session and session:
-                session.close()
-
-    def _can_transition_to_status(self, workflow: Workflow, new_status: WorkflowStatusEnum) -> bool:
-        """Check if workflow can transition to new status"""
-        current = workflow.status
-
-        # Define valid transitions
-        valid_transitions = {
-            WorkflowStatusEnum.CREATED: [WorkflowStatusEnum.MODE_SELECTED, WorkflowStatusEnum.FAILED],
-            WorkflowStatusEnum.MODE_SELECTED: [WorkflowStatusEnum.SCRIPT_READY, WorkflowStatusEnum.FAILED],
-            WorkflowStatusEnum.SCRIPT_READY: [WorkflowStatusEnum.PROCESSING, WorkflowStatusEnum.FAILED],
-            WorkflowStatusEnum.PROCESSING: [WorkflowStatusEnum.COMPLETED, WorkflowStatusEnum.FAILED],
-            WorkflowStatusEnum.COMPLETED: [],  # Terminal state
-            WorkflowStatusEnum.FAILED: [WorkflowStatusEnum.CREATED]  # Can restart
-        }
-
-        return new_status in valid_transitions.get(current, [])
 
-    def get_workflow_progress(self, workflow_id: str) -> Optional[dict]:
+    def get_workflow_progress(self, workflow_id: Union[str, uuid.UUID]) -> Optional[dict]:
         """Get workflow progress information"""
         workflow = self.get_workflow(workflow_id)
         if not workflow:
             return None
 
+        return self.build_workflow_progress(workflow)
+
+    def build_workflow_progress(self, workflow: Workflow) -> dict:
+        """Build progress information for an already loaded workflow"""
         next_steps = workflow.get_next_steps()
         can_proceed = workflow.can_proceed_to_processing()
 
@@ -284,19 +313,17 @@ class WorkflowModeService:
 
     def associate_script_with_workflow(
         self,
-        workflow_id: str,
-        script_id: str
+        workflow_id: Union[str, uuid.UUID],
+        script_id: Union[str, uuid.UUID]
     ) -> Tuple[bool, str]:
         """Associate an uploaded script with a workflow"""
         session = None
-        created_session = False
 
         try:
             session = self._get_session()
-            created_session = (self.db_session is None)
 
             workflow = session.query(Workflow).filter(
-                Workflow.id == uuid.UUID(workflow_id)
+                Workflow.id == _as_uuid(workflow_id)
             ).first()
 
             if not workflow:
@@ -304,21 +331,20 @@ class WorkflowModeService:
 
             # Verify script exists
             script = session.query(UploadedScript).filter(
-                UploadedScript.id == uuid.UUID(script_id)
+                UploadedScript.id == _as_uuid(script_id)
             ).first()
 
             if not script:
                 return False, "Script not found"
 
             # Associate script with workflow
-            workflow.uploaded_script_id = uuid.UUID(script_id)
+            workflow.uploaded_script_id = script.id
             workflow.script_source = "UPLOADED"
 
             # Update status if appropriate
             if workflow.status == WorkflowStatusEnum.MODE_SELECTED:
                 workflow.status = WorkflowStatusEnum.SCRIPT_READY
 
-            workflow.updated_at = datetime.utcnow()
             session.commit()
 
             logger.info(f"Associated script {script_id} with workflow {workflow_id}")
@@ -339,6 +365,59 @@ class WorkflowModeService:
             if session:
                 session.rollback()
             return False, f"Association failed: {str(e)}"
-        finally:
-            if created_session and session:
-                session.close()
\ No newline at end of file
+
+    def associate_and_mark_ready(
+        self,
+        workflow_id: Union[str, uuid.UUID],
+        script_id: Union[str, uuid.UUID]
+    ) -> Tuple[bool, str]:
+        """Associate an uploaded script and mark the workflow script-ready in one UPDATE"""
+        session = None
+
+        try:
+            session = self._get_session()
+            script_uuid = _as_uuid(script_id)
+
+            # The EXISTS guard makes a missing script, like a missing workflow, match no rows
+            updated_id = session.execute(
+                update(Workflow)
+                .where(
+                    Workflow.id == _as_uuid(workflow_id),
+                    exists().where(UploadedScript.id == script_uuid)
+                )
+                .values(
+                    uploaded_script_id=script_uuid,
+                    script_source=ScriptSourceEnum.UPLOADED,
+                    status=case(
+                        (Workflow.status == WorkflowStatusEnum.MODE_SELECTED, WorkflowStatusEnum.SCRIPT_READY),
+                        else_=Workflow.status
+                    ),
+                    updated_at=func.now()
+                )
+                .returning(Workflow.id)
+            ).scalar_one_or_none()
+
+            if updated_id is None:
+                session.rollback()
+                return False, "Workflow or script not found"
+
+            session.commit()
+
+            logger.info(f"Associated script {script_id} with workflow {workflow_id} and marked it ready")
+            return True, "Script associated successfully"
+
+        except ValueError as e:
+            logger.error(f"Invalid UUID format: {e}")
+            if session:
+                session.rollback()
+            return False, f"Invalid ID format: {e}"
+        except SQLAlchemyError as e:
+            logger.error(f"Database error associating script: {e}")
+            if session:
+                session.rollback()
+            return False, f"Database error: {str(e)}"
+        except Exception as e:
+            logger.error(f"Unexpected error associating script: {e}")
+            if session:
+                session.rollback()
+            return False, f"Association failed: {str(e)}"
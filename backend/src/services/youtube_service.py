@@ -1,17 +1,64 @@
-from typing import List, Dict, Any, Optional
+from collections import Counter
+from itertools import chain
+from typing import List, Dict, Any, Optional, Tuple
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+import asyncio
+import httplib2
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
+# Concurrent videos().list() calls, kept low to respect the API quota
+MAX_CONCURRENT_CATEGORY_FETCHES = 5
+
+# Video categories almost never change, so they are reused across service instances for a day
+CATEGORIES_CACHE_TTL = 24 * 60 * 60
+
+# regionCode -> (monotonic fetch time, {category title: category id})
+_categories_cache: Dict[str, Tuple[float, Dict[str, str]]] = {}
+
+# Common words longer than three letters that never make a useful theme
+STOPWORDS = frozenset({
+    'about', 'after', 'again', 'also', 'been', 'before', 'being', 'does', 'each',
+    'from', 'have', 'here', 'into', 'just', 'like', 'more', 'most', 'much', 'only',
+    'over', 'some', 'such', 'than', 'that', 'their', 'them', 'then', 'there',
+    'these', 'they', 'this', 'those', 'very', 'were', 'what', 'when', 'where',
+    'which', 'while', 'will', 'with', 'would', 'your',
+})
+
+
+def _theme_tokens(title: str, tags: List[str]) -> List[str]:
+    """Lowercased title words and tags that can become themes, skipping short and filler words"""
+    return [
+        keyword for keyword in chain(title.lower().split(), (tag.lower() for tag in tags))
+        if len(keyword) > 3 and keyword not in STOPWORDS
+    ]
+
 
 class YouTubeService:
     """Service for interacting with YouTube Data API v3"""
 
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.youtube = build('youtube', 'v3', developerKey=api_key)
+        self._youtube = None
+
+    @property
+    def youtube(self):
+        """API client, built on first use from the discovery document bundled with the client library"""
+        if self._youtube is None:
+            self._youtube = build(
+                'youtube', 'v3',
+                developerKey=self.api_key,
+                cache_discovery=False,
+                static_discovery=True
+            )
+        return self._youtube
+
+    @youtube.setter
+    def youtube(self, client):
+        self._youtube = client
 
     async def get_trending_videos_by_categories(
         self,
@@ -30,49 +77,57 @@ class YouTubeService:
         """
         try:
             # Get video categories
-            categories_response = self.youtube.videoCategories().list(
-                part='snippet',
-                regionCode='US'
-            ).execute()
+            categories_by_name = await self._get_categories('US')
 
-            categories_by_name = {}
-            for category in categories_response['items']:
-                if category['snippet']['assignable']:  # Only assignable categories
-                    categories_by_name[category['snippet']['title']] = category['id']
+            # Get trending videos for each category concurrently
+            top_categories = list(categories_by_name.items())[:5]  # Top 5 categories
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_CATEGORY_FETCHES)
+
+            async def fetch_category(category_id: str) -> List[Dict[str, Any]]:
+                async with semaphore:
+                    # Get most popular videos in this category
+                    videos_response = await self._execute(
+                        self.youtube.videos().list(
+                            part='snippet,statistics',
+                            chart='mostPopular',
+                            videoCategoryId=category_id,
+                            regionCode='US',
+                            maxResults=max_results_per_category
+                        )
+                    )
+
+                videos = []
+                for video in videos_response['items']:
+                    title = video['snippet']['title']
+                    tags = video['snippet'].get('tags', [])
+                    videos.append({
+                        'id': video['id'],
+                        'title': title,
+                        'channel_name': video['snippet']['channelTitle'],
+                        'view_count': int(video['statistics'].get('viewCount', 0)),
+                        'published_at': video['snippet']['publishedAt'],
+                        'description': video['snippet']['description'][:500],  # Truncate
+                        'tags': tags,
+                        '_tokens': _theme_tokens(title, tags)  # Prebuilt for theme extraction
+                    })
+
+                # The mostPopular chart is already ranked and capped at maxResults
+                return videos
+
+            results = await asyncio.gather(
+                *(fetch_category(category_id) for _, category_id in top_categories),
+                return_exceptions=True
+            )
 
-            # Get trending videos for each category
             trending_by_category = {}
 
-            for category_name, category_id in list(categories_by_name.items())[:5]:  # Top 5 categories
-                try:
-                    # Get most popular videos in this category
-                    videos_response = self.youtube.videos().list(
-                        part='snippet,statistics',
-                        chart='mostPopular',
-                        videoCategoryId=category_id,
-                        regionCode='US',
-                        maxResults=max_results_per_category
-                    ).execute()
-
-                    videos = []
-                    for video in videos_response['items']:
-                        videos.append({
-                            'id': video['id'],
-                            'title': video['snippet']['title'],
-                            'channel_name': video['snippet']['channelTitle'],
-                            'view_count': int(video['statistics'].get('viewCount', 0)),
-                            'published_at': video['snippet']['publishedAt'],
-                            'description': video['snippet']['description'][:500],  # Truncate
-                            'tags': video['snippet'].get('tags', [])
-                        })
-
-                    # Sort by view count and take top results
-                    videos.sort(key=lambda x: x['view_count'], reverse=True)
-                    trending_by_category[category_name] = videos[:max_results_per_category]
-
-                except HttpError as e:
-                    logger.warning(f"Failed to fetch videos for category {category_name}: {e}")
+            for (category_name, _), result in zip(top_categories, results):
+                if isinstance(result, HttpError):
+                    logger.warning(f"Failed to fetch videos for category {category_name}: {result}")
                     continue
+                if isinstance(result, BaseException):
+                    raise result
+                trending_by_category[category_name] = result
 
             return trending_by_category
 
@@ -80,6 +135,35 @@ class YouTubeService:
             logger.error(f"YouTube API error: {e}")
             raise Exception(f"Failed to fetch trending videos: {e}")
 
+    async def _get_categories(self, region_code: str) -> Dict[str, str]:
+        """Assignable video categories for a region, served from cache while fresh"""
+        cached = _categories_cache.get(region_code)
+        if cached and time.monotonic() - cached[0] < CATEGORIES_CACHE_TTL:
+            return cached[1]
+
+        categories_response = await self._execute(
+            self.youtube.videoCategories().list(
+                part='snippet',
+                regionCode=region_code
+            )
+        )
+
+        categories_by_name = {}
+        for category in categories_response['items']:
+            if category['snippet']['assignable']:  # Only assignable categories
+                categories_by_name[category['snippet']['title']] = category['id']
+
+        _categories_cache[region_code] = (time.monotonic(), categories_by_name)
+        return categories_by_name
+
+    async def _execute(self, request) -> Dict[str, Any]:
+        """Run a blocking API request in a worker thread.
+
+        The client's shared httplib2 connection is not thread-safe, so each
+        request gets its own.
+        """
+        return await asyncio.to_thread(request.execute, http=httplib2.Http())
+
     async def extract_themes_from_videos(
         self,
         videos_by_category: Dict[str, List[Dict[str, Any]]]
@@ -100,21 +184,14 @@ class YouTubeService:
                 continue
 
             # Simple theme extraction based on common keywords in titles and tags
-            theme_keywords = {}
-
-            for video in videos[:20]:  # Analyze top 20 videos per category
-                # Extract keywords from title
-                title_words = video['title'].lower().split()
-                tags = [tag.lower() for tag in video.get('tags', [])]
-
-                all_keywords = title_words + tags
-
-                for keyword in all_keywords:
-                    if len(keyword) > 3:  # Skip short words
-                        theme_keywords[keyword] = theme_keywords.get(keyword, 0) + 1
+            theme_keywords = Counter(chain.from_iterable(
+                # Videos not fetched by this service carry no prebuilt tokens
+                video['_tokens'] if '_tokens' in video else _theme_tokens(video['title'], video.get('tags', []))
+                for video in videos[:20]  # Analyze top 20 videos per category
+            ))
 
             # Get top 3 most common themes
-            sorted_themes = sorted(theme_keywords.items(), key=lambda x: x[1], reverse=True)[:3]
+            sorted_themes = theme_keywords.most_common(3)
 
             themes = []
             for i, (theme_name, count) in enumerate(sorted_themes):
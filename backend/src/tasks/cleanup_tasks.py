@@ -2,20 +2,140 @@
 Celery tasks for file cleanup and storage management.
 """
 import logging
-from typing import Dict, Any, Optional
-from celery import current_task
+import os
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+from celery import chord, current_task
 from datetime import datetime, timedelta
 import uuid
 
 from celery_worker import celery_app
-from ..services.storage_manager import StorageManager, StorageManagerError
-from ..services.video_generation_service import VideoGenerationService
+from ..services.storage_manager import get_storage_manager, StorageManagerError
+from ..services.video_generation_service import get_video_generation_service
 from ..lib.database import get_db_session
+from ..lib.redis import RedisService, RedisConfig
 
 logger = logging.getLogger(__name__)
 
+# Concurrent unlink calls when removing a failed job's asset files
+ASSET_UNLINK_WORKERS = 16
 
-@celery_app.task(bind=True, name="cleanup_tasks.cleanup_expired_files")
+# Subtasks the old job sweep is split into, by job id hash
+OLD_JOB_CLEANUP_SHARDS = 16
+
+# Redis key (under RedisConfig.STORAGE_USAGE_PREFIX) holding the last storage usage scan
+STORAGE_USAGE_SNAPSHOT_KEY = "usage_snapshot"
+
+
+def _unlink_asset_file(file_path: str, file_size: Optional[int], dir_fds: Dict[str, Optional[int]]) -> Optional[int]:
+    """Remove one asset file relative to its open parent directory; returns bytes freed or None"""
+    parent, name = os.path.split(file_path)
+    dir_fd = dir_fds.get(parent)
+    if dir_fd is None:
+        return None
+
+    try:
+        if file_size is None:
+            file_size = os.stat(name, dir_fd=dir_fd).st_size
+
+        os.unlink(name, dir_fd=dir_fd)
+        logger.debug(f"Removed asset file: {file_path}")
+        return file_size
+    except FileNotFoundError:
+        # Already gone
+        return None
+    except Exception as file_error:
+        logger.warning(f"Failed to remove asset file {file_path}: {file_error}")
+        return None
+
+
+def _unlink_asset_files(assets: Iterable[Tuple[str, Optional[int]]]) -> Tuple[int, int]:
+    """
+    Remove asset files from disk.
+
+    Each parent directory is opened once and its files are unlinked relative
+    to it, so directory paths are resolved once rather than per file. The
+    unlinks run on a thread pool since each one mostly waits on the
+    filesystem with the GIL released. Sizes come from the recorded
+    file_size, with a stat only for assets stored before sizes were recorded.
+
+    Args:
+        assets: (file_path, file_size) pairs
+
+    Returns:
+        Tuple of (files removed, bytes freed)
+    """
+    assets = list(assets)
+    dir_fds: Dict[str, Optional[int]] = {}
+
+    try:
+        for file_path, _ in assets:
+            parent = os.path.dirname(file_path)
+            if parent not in dir_fds:
+                try:
+                    dir_fds[parent] = os.open(parent or ".", os.O_RDONLY | os.O_DIRECTORY)
+                except FileNotFoundError:
+                    # Directory already gone along with its files
+                    dir_fds[parent] = None
+                except OSError as dir_error:
+                    logger.warning(f"Failed to open asset directory {parent}: {dir_error}")
+                    dir_fds[parent] = None
+
+        with ThreadPoolExecutor(max_workers=ASSET_UNLINK_WORKERS) as executor:
+            freed = [
+                size for size in executor.map(
+                    _unlink_asset_file,
+                    [file_path for file_path, _ in assets],
+                    [file_size for _, file_size in assets],
+                    repeat(dir_fds)
+                )
+                if size is not None
+            ]
+    finally:
+        for dir_fd in dir_fds.values():
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+    return len(freed), sum(freed)
+
+
+def _usage_snapshot_cache() -> Optional[RedisService]:
+    """Redis store for the storage usage snapshot; None when Redis is unavailable"""
+    try:
+        return RedisService(RedisConfig.STORAGE_USAGE_PREFIX)
+    except Exception as e:
+        logger.warning(f"Storage usage snapshot disabled, Redis unavailable: {e}")
+        return None
+
+
+def _scan_storage_usage(storage_manager, reuse_snapshot: bool = False) -> Dict[str, Any]:
+    """
+    Storage usage keyed by storage type value, saved as a snapshot for later runs.
+
+    With reuse_snapshot the previous run's snapshot is returned instead of
+    walking the storage directories again, as long as it hasn't expired.
+    """
+    cache = _usage_snapshot_cache()
+
+    if reuse_snapshot and cache:
+        snapshot = cache.get_json(STORAGE_USAGE_SNAPSHOT_KEY)
+        if snapshot is not None:
+            logger.info("Nothing removed, reusing the previous storage usage scan")
+            return snapshot
+
+    usage_stats = {
+        storage_type.value: stats
+        for storage_type, stats in storage_manager.scan_storage_usage().items()
+    }
+
+    if cache:
+        cache.set_json(STORAGE_USAGE_SNAPSHOT_KEY, usage_stats, ttl=RedisConfig.STORAGE_USAGE_TTL)
+
+    return usage_stats
+
+
+@celery_app.task(bind=True, acks_late=True, name="cleanup_tasks.cleanup_expired_files")
 def cleanup_expired_files(
     self,
     storage_type: Optional[str] = None,
@@ -32,7 +152,7 @@ def cleanup_expired_files(
         Dictionary with cleanup results
     """
     task_id = self.request.id
-    storage_manager = StorageManager()
+    storage_manager = get_storage_manager()
 
     try:
         logger.info(f"Starting file cleanup task {task_id}")
@@ -46,8 +166,9 @@ def cleanup_expired_files(
         # Run cleanup
         cleanup_results = storage_manager.cleanup_expired_files(target_storage_type)
 
-        # Update storage records
-        usage_stats = storage_manager.scan_storage_usage()
+        # Update storage records, unless nothing was removed and the last scan is still fresh
+        nothing_removed = cleanup_results["files_removed"] == 0 and cleanup_results["bytes_freed"] == 0
+        usage_stats = _scan_storage_usage(storage_manager, reuse_snapshot=nothing_removed)
 
         result = {
             "status": "success",
@@ -89,48 +210,39 @@ def cleanup_failed_job(
         Dictionary with cleanup results
     """
     task_id = self.request.id
-    video_service = VideoGenerationService()
+    video_service = get_video_generation_service()
 
     try:
         logger.info(f"Starting failed job cleanup for job {job_id}")
+        job_uuid = uuid.UUID(job_id)
 
         # Cancel the job if still active
-        job_cancelled = video_service.cancel_job(uuid.UUID(job_id))
+        job_cancelled = video_service.cancel_job(job_uuid)
 
         # Clean up temporary files
-        video_service.video_composer.cleanup_temp_files(uuid.UUID(job_id))
+        temp_files_cleaned, temp_bytes_freed = video_service.video_composer.cleanup_temp_files(job_uuid)
 
         # Clean up media assets
-        files_cleaned = 0
-        bytes_freed = 0
-
         with get_db_session() as db:
             from ..models.media_asset import MediaAsset
-            from pathlib import Path
 
-            # Get all assets for this job
-            assets = db.query(MediaAsset).filter(
-                MediaAsset.generation_job_id == uuid.UUID(job_id)
-            ).all()
+            job_assets = db.query(MediaAsset).filter(
+                MediaAsset.generation_job_id == job_uuid
+            )
 
-            for asset in assets:
-                try:
-                    asset_path = Path(asset.file_path)
-                    if asset_path.exists():
-                        file_size = asset_path.stat().st_size
-                        asset_path.unlink()
-                        files_cleaned += 1
-                        bytes_freed += file_size
-                        logger.debug(f"Removed asset file: {asset_path}")
-                except Exception as file_error:
-                    logger.warning(f"Failed to remove asset file {asset.file_path}: {file_error}")
-
-            # Remove asset database records
-            for asset in assets:
-                db.delete(asset)
+            # Only the path and size are needed to remove the files
+            assets = job_assets.with_entities(MediaAsset.file_path, MediaAsset.file_size).all()
+
+            # Remove asset database records in a single DELETE
+            job_assets.delete(synchronize_session=False)
 
             db.commit()
 
+        # Files are removed once the rows are gone, without holding the transaction open
+        files_cleaned, bytes_freed = _unlink_asset_files(assets)
+        files_cleaned += temp_files_cleaned
+        bytes_freed += temp_bytes_freed
+
         result = {
             "status": "success",
             "job_id": job_id,
@@ -160,7 +272,7 @@ def enforce_storage_quotas(self) -> Dict[str, Any]:
         Dictionary with quota enforcement results
     """
     task_id = self.request.id
-    storage_manager = StorageManager()
+    storage_manager = get_storage_manager()
 
     try:
         logger.info(f"Starting storage quota enforcement task {task_id}")
@@ -198,7 +310,7 @@ def enforce_storage_quotas(self) -> Dict[str, Any]:
         raise
 
 
-@celery_app.task(bind=True, name="cleanup_tasks.cleanup_old_jobs")
+@celery_app.task(bind=True, acks_late=True, name="cleanup_tasks.cleanup_old_jobs")
 def cleanup_old_jobs(
     self,
     max_age_days: int = 30,
@@ -207,24 +319,85 @@ def cleanup_old_jobs(
     """
     Clean up old video generation jobs and their associated data.
 
+    The sweep is split into OLD_JOB_CLEANUP_SHARDS subtasks by job id hash so
+    idle workers share it; a chord callback totals the shards and runs the
+    general file cleanup once they all finish.
+
     Args:
         max_age_days: Maximum age for jobs before cleanup
         preserve_completed: Whether to preserve completed videos
 
     Returns:
-        Dictionary with cleanup results
+        Dictionary with the dispatched sweep
     """
     task_id = self.request.id
-    video_service = VideoGenerationService()
 
     try:
         logger.info(f"Starting old jobs cleanup task {task_id}")
 
-        # Use the service cleanup method
-        jobs_cleaned = video_service.cleanup_expired_jobs(max_age_days)
+        sweep = chord([
+            cleanup_old_jobs_shard.s(shard_index, OLD_JOB_CLEANUP_SHARDS, max_age_days)
+            for shard_index in range(OLD_JOB_CLEANUP_SHARDS)
+        ])(finish_old_jobs_cleanup.s(max_age_days, preserve_completed))
+
+        return {
+            "status": "dispatched",
+            "shards": OLD_JOB_CLEANUP_SHARDS,
+            "max_age_days": max_age_days,
+            "preserve_completed": preserve_completed,
+            "summary_task_id": sweep.id
+        }
+
+    except Exception as e:
+        error_msg = f"Old jobs cleanup failed: {str(e)}"
+        logger.error(f"Task {task_id} failed: {error_msg}")
+        raise
+
+
+@celery_app.task(bind=True, acks_late=True, name="cleanup_tasks.cleanup_old_jobs_shard")
+def cleanup_old_jobs_shard(
+    self,
+    shard_index: int,
+    shard_count: int,
+    max_age_days: int = 30
+) -> int:
+    """
+    Clean up the old video generation jobs in one shard of the job id hash space.
+
+    Returns:
+        Number of jobs cleaned
+    """
+    video_service = get_video_generation_service()
+    return video_service.cleanup_expired_jobs(
+        max_age_days, shard_index=shard_index, shard_count=shard_count
+    )
+
+
+@celery_app.task(bind=True, acks_late=True, name="cleanup_tasks.finish_old_jobs_cleanup")
+def finish_old_jobs_cleanup(
+    self,
+    shard_results: List[int],
+    max_age_days: int = 30,
+    preserve_completed: bool = True
+) -> Dict[str, Any]:
+    """
+    Total the old job cleanup shards and run the general file cleanup.
+
+    Args:
+        shard_results: Jobs cleaned by each shard
+        max_age_days: Maximum age for jobs before cleanup
+        preserve_completed: Whether to preserve completed videos
+
+    Returns:
+        Dictionary with cleanup results
+    """
+    task_id = self.request.id
+
+    try:
+        jobs_cleaned = sum(shard_results)
 
         # Also run general file cleanup
-        storage_manager = StorageManager()
+        storage_manager = get_storage_manager()
         cleanup_results = storage_manager.cleanup_expired_files()
 
         result = {
@@ -245,7 +418,7 @@ def cleanup_old_jobs(
         raise
 
 
-@celery_app.task(bind=True, name="cleanup_tasks.validate_storage_health")
+@celery_app.task(bind=True, acks_late=True, name="cleanup_tasks.validate_storage_health")
 def validate_storage_health(self) -> Dict[str, Any]:
     """
     Validate storage system health and report issues.
@@ -254,7 +427,7 @@ def validate_storage_health(self) -> Dict[str, Any]:
         Dictionary with health validation results
     """
     task_id = self.request.id
-    storage_manager = StorageManager()
+    storage_manager = get_storage_manager()
 
     try:
         logger.info(f"Starting storage health validation task {task_id}")
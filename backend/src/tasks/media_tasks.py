@@ -2,23 +2,42 @@
 Celery tasks for media generation and video composition.
 """
 import logging
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, List, Optional, Tuple
 from celery import current_task
+from sqlalchemy import func, literal_column, select, union_all
+from sqlalchemy.orm import load_only
 from datetime import datetime
 import uuid
 
 from celery_worker import celery_app
-from ..services.progress_service import get_progress_service, ProgressEventType
-from ..services.task_queue_service import get_task_queue_service, TaskStatus
 from ..lib.database import get_db_session
 from ..models.uploaded_script import UploadedScript
 from ..models.video_script import VideoScript
-from ..services.video_generation_service import VideoGenerationService, VideoGenerationServiceError
+from ..services.video_generation_service import get_video_generation_service, VideoGenerationServiceError
+from .reporting import task_run
 
 logger = logging.getLogger(__name__)
 
+# Generated assets between intermediate progress events
+ASSET_PROGRESS_INTERVAL = 10
 
-@celery_app.task(bind=True, name="media_tasks.generate_media_from_script")
+# Result key for each generated asset type; other types are left out of the result
+ASSET_TYPE_BUCKETS = {
+    "IMAGE": "background_images",
+    "AUDIO": "audio_tracks",
+    "VIDEO_CLIP": "video_clips",
+    "TEXT_OVERLAY": "text_overlays",
+}
+
+
+def _progress_range(progress: Callable[[int, str], None], start: int, end: int) -> Callable[[int, str], None]:
+    """Map a step's 0-100 progress onto the start..end part of its task's progress."""
+    def scaled(percentage: int, message: str):
+        progress(start + (end - start) * percentage // 100, message)
+    return scaled
+
+
+@celery_app.task(bind=True, acks_late=True, name="media_tasks.generate_media_from_script")
 def generate_media_from_script(
     self,
     session_id: str,
@@ -36,134 +55,22 @@ def generate_media_from_script(
     Returns:
         Dictionary with generated media assets and metadata
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-    task_queue = get_task_queue_service()
-    video_service = VideoGenerationService()
-
-    try:
-        # Update task status to running
-        task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=0)
-
-        # Publish start progress
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message=f"Starting real media generation for script {script_id}",
-            percentage=0,
-            task_id=task_id
-        )
-
-        with get_db_session() as db:
-            # Get the script content
-            script_content, script_title = _get_script_content(db, script_id)
-
-            # Create generation job
-            generation_options = media_options or {}
-            generation_options.update({
-                "script_id": uuid.UUID(script_id),
-                "session_id": session_id,
-                "duration": generation_options.get("duration", 180),
-                "resolution": generation_options.get("resolution", "1920x1080"),
-                "quality": generation_options.get("quality", "high"),
-                "include_audio": generation_options.get("include_audio", True)
-            })
-
-            job_id = video_service.create_generation_job(
-                script_id=uuid.UUID(script_id),
-                session_id=session_id,
-                options=generation_options
-            )
-
-            # Progress: Analyzing script content
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Analyzing script content for media requirements",
-                percentage=15,
-                task_id=task_id
-            )
-
-            # Generate real media assets
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Generating background images and visual assets",
-                percentage=35,
-                task_id=task_id
-            )
-
-            assets = video_service.asset_generator.generate_assets_for_job(
-                job_id, script_content, generation_options
-            )
-
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Creating audio tracks and voiceovers",
-                percentage=60,
-                task_id=task_id
-            )
-
-            # Organize assets by type for result
-            assets_by_type = {
-                "background_images": [],
-                "audio_tracks": [],
-                "video_clips": [],
-                "text_overlays": []
-            }
-
-            for asset in assets:
-                # Assets are already dictionaries, just use them directly
-                asset_data = asset
-
-                if asset_data["asset_type"] == "IMAGE":
-                    assets_by_type["background_images"].append(asset_data)
-                elif asset_data["asset_type"] == "AUDIO":
-                    assets_by_type["audio_tracks"].append(asset_data)
-                elif asset_data["asset_type"] == "VIDEO_CLIP":
-                    assets_by_type["video_clips"].append(asset_data)
-                elif asset_data["asset_type"] == "TEXT_OVERLAY":
-                    assets_by_type["text_overlays"].append(asset_data)
-
-            # Complete task
-            result = {
-                "status": "success",
-                "script_id": script_id,
-                "script_title": script_title,
-                "job_id": str(job_id),
-                "media_assets": assets_by_type,
-                "total_assets": len(assets),
-                "estimated_duration": generation_options["duration"],
-                "generated_at": datetime.now().isoformat()
-            }
-
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_COMPLETED,
-                message=f"Media generation completed successfully - {result['total_assets']} assets created",
-                percentage=100,
-                task_id=task_id
-            )
-
-            task_queue.update_task_status(task_id, TaskStatus.COMPLETED, progress=100, result=result)
-
-            logger.info(f"Real media generation task {task_id} completed for script {script_id}")
-            return result
-
-    except VideoGenerationServiceError as e:
-        error_msg = f"Video generation service failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-        _handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue)
-        raise
-    except Exception as e:
-        error_msg = f"Media generation failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-        _handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue)
-        raise
+    with task_run(
+        self, session_id,
+        start_message=f"Starting real media generation for script {script_id}",
+        failure_prefix="Media generation failed",
+        service_error=VideoGenerationServiceError,
+        service_failure_prefix="Video generation service failed"
+    ) as run:
+        result, _, _, _ = _generate_media(session_id, script_id, media_options, run.progress)
+
+        run.complete(result, f"Media generation completed successfully - {result['total_assets']} assets created")
+
+        logger.info(f"Real media generation task {run.task_id} completed for script {script_id}")
+        return result
 
 
-@celery_app.task(bind=True, name="media_tasks.compose_video")
+@celery_app.task(bind=True, acks_late=True, name="media_tasks.compose_video")
 def compose_video(
     self,
     session_id: str,
@@ -181,55 +88,36 @@ def compose_video(
     Returns:
         Dictionary with final video information
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-    task_queue = get_task_queue_service()
-    video_service = VideoGenerationService()
-
-    try:
-        # Update task status to running
-        task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=0)
-
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message="Starting real video composition",
-            percentage=0,
-            task_id=task_id
-        )
-
+    with task_run(
+        self, session_id,
+        start_message="Starting real video composition",
+        failure_prefix="Video composition failed",
+        service_error=VideoGenerationServiceError,
+        service_failure_prefix="Video composition service failed"
+    ) as run:
         # Progress: Preparing timeline
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_PROGRESS,
-            message="Preparing video timeline and sequencing",
-            percentage=20,
-            task_id=task_id
-        )
+        run.progress(20, "Preparing video timeline and sequencing")
+
+        job_uuid = uuid.UUID(job_id)
 
         # Get media assets from job and perform video composition within the same session
         with get_db_session() as db:
             from ..models.media_asset import MediaAsset
+
+            # Only the columns the composer reads are loaded
             assets = db.query(MediaAsset).filter(
-                MediaAsset.generation_job_id == uuid.UUID(job_id)
+                MediaAsset.generation_job_id == job_uuid
+            ).options(
+                load_only(MediaAsset.asset_type, MediaAsset.file_path, MediaAsset.asset_metadata)
             ).all()
 
             if not assets:
                 raise ValueError(f"No media assets found for job {job_id}")
 
-            # Progress: Compositing layers
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Compositing video layers and effects",
-                percentage=50,
-                task_id=task_id
-            )
-
             # Get job information to extract required options
             from ..models.video_generation_job import VideoGenerationJob
             job = db.query(VideoGenerationJob).filter(
-                VideoGenerationJob.id == uuid.UUID(job_id)
+                VideoGenerationJob.id == job_uuid
             ).first()
 
             if not job:
@@ -249,128 +137,243 @@ def compose_video(
                 "script_id": job.script_id
             })
 
-            # Progress: Rendering video
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Rendering final video file using FFmpeg",
-                percentage=80,
-                task_id=task_id
-            )
+            result = _compose_assets(db, job_uuid, assets, options, run.progress)
 
-            # Create the GeneratedVideo record within this session
-            from ..models.generated_video import GeneratedVideo, GenerationStatusEnum as VideoStatus
-            import uuid as uuid_module
-            from pathlib import Path
-
-            video_id = uuid_module.uuid4()
-            filename = f"video_{video_id}.mp4"
-
-            # Create video record in the session
-            generated_video = GeneratedVideo(
-                id=video_id,
-                file_path=f"/code/contentizer/backend/media/videos/{filename}",
-                url_path=f"/media/videos/{filename}",
-                title=options.get("title", "Generated Video Content"),
-                duration=options["duration"],
-                resolution=options["resolution"],
-                format="mp4",
-                generation_status=VideoStatus.GENERATING,
-                script_id=options["script_id"],
-                session_id=options["session_id"],
-                generation_job_id=uuid.UUID(job_id),
-                creation_timestamp=datetime.now()
-            )
+        run.complete(result, "Video composition completed successfully")
 
-            db.add(generated_video)
-            db.flush()  # Get the ID assigned but don't commit yet
+        logger.info(f"Real video composition task {run.task_id} completed")
+        return result
 
-            # Now compose the actual video file (without creating DB record)
-            video_info = video_service.video_composer.compose_video_file_only(
-                assets, options, generated_video.file_path
-            )
 
-            # Update video record with actual file properties
-            generated_video.file_size = video_info.get("file_size", 0)
-            generated_video.duration = video_info.get("duration", options["duration"])
-            generated_video.generation_status = VideoStatus.COMPLETED
-            generated_video.completion_timestamp = datetime.now()
-
-            db.commit()
-            # No need to refresh since we're still in the same session
-
-            # Create result inside the session while generated_video is still attached
-            result = {
-                "status": "success",
-                "video": {
-                    "video_id": str(generated_video.id),
-                    "title": generated_video.title,
-                    "url": generated_video.url_path,
-                    "duration": generated_video.duration,
-                    "resolution": generated_video.resolution,
-                    "file_size": generated_video.file_size,
-                    "format": generated_video.format,
-                    "file_path": generated_video.file_path
-                },
-                "job_id": job_id,
-                "composed_at": datetime.now().isoformat()
-            }
-
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_COMPLETED,
-            message="Video composition completed successfully",
-            percentage=100,
-            task_id=task_id
-        )
+@celery_app.task(bind=True, acks_late=True, name="media_tasks.generate_and_compose")
+def generate_and_compose(
+    self,
+    session_id: str,
+    script_id: str,
+    options: Optional[Dict[str, Any]] = None,
+    job_id: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Generate media assets from a script and compose them into the final video in one task.
 
-        task_queue.update_task_status(task_id, TaskStatus.COMPLETED, progress=100, result=result)
+    The generated assets are composed straight from memory, so there is no
+    second broker round trip and no re-query of the job and its assets as
+    with generate_media_from_script followed by compose_video.
 
-        logger.info(f"Real video composition task {task_id} completed")
-        return result
+    Args:
+        session_id: User session ID for progress tracking
+        script_id: UUID of the script to generate the video for
+        options: Media generation and composition options
+        job_id: Existing video generation job to generate into (a new job is created if omitted)
 
-    except VideoGenerationServiceError as e:
-        error_msg = f"Video composition service failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-        _handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue)
-        raise
-    except Exception as e:
-        error_msg = f"Video composition failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-        _handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue)
-        raise
+    Returns:
+        Dictionary with the generated media assets and final video information
+    """
+    with task_run(
+        self, session_id,
+        start_message=f"Starting video generation for script {script_id}",
+        failure_prefix="Video generation failed",
+        service_error=VideoGenerationServiceError,
+        service_failure_prefix="Video generation service failed"
+    ) as run:
+        # Media generation covers the first half of the progress bar, composition the second
+        media_result, assets, generation_options, job_uuid = _generate_media(
+            session_id, script_id, options, _progress_range(run.progress, 0, 50),
+            job_uuid=uuid.UUID(job_id) if job_id else None
+        )
 
+        composition_options = {
+            "session_id": session_id,
+            "title": generation_options.get("title", "Generated Video Content"),
+            "duration": generation_options["duration"],
+            "resolution": generation_options["resolution"],
+            "script_id": generation_options["script_id"]
+        }
 
-def _get_script_content(db, script_id: str) -> tuple[str, str]:
-    """Helper function to get script content and title."""
-    # Try to find in uploaded scripts first
-    uploaded_script = db.query(UploadedScript).filter(
-        UploadedScript.id == uuid.UUID(script_id)
-    ).first()
+        with get_db_session() as db:
+            video_result = _compose_assets(
+                db, job_uuid, assets, composition_options, _progress_range(run.progress, 50, 100)
+            )
 
-    if uploaded_script:
-        return uploaded_script.content, uploaded_script.file_name or "Uploaded Script"
+        result = {**video_result, "media": media_result}
 
-    # Try to find in generated scripts
-    video_script = db.query(VideoScript).filter(
-        VideoScript.id == uuid.UUID(script_id)
-    ).first()
+        run.complete(result, "Video generation completed successfully")
 
-    if video_script:
-        return video_script.content, video_script.title
+        logger.info(f"Video generation task {run.task_id} completed for script {script_id}")
+        return result
 
-    raise ValueError(f"Script {script_id} not found")
 
+def _generate_media(
+    session_id: str,
+    script_id: str,
+    media_options: Optional[Dict[str, Any]],
+    progress: Callable[[int, str], None],
+    job_uuid: Optional[uuid.UUID] = None
+) -> Tuple[Dict[str, Any], List[Any], Dict[str, Any], uuid.UUID]:
+    """
+    Generate a script's media assets, creating a generation job unless job_uuid is given.
 
-def _handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue):
-    """Helper function to handle task failures."""
-    try:
-        progress_service.publish_progress(
+    Returns:
+        Tuple of (media result, generated MediaAsset rows, generation options, job UUID)
+    """
+    video_service = get_video_generation_service()
+    script_uuid = uuid.UUID(script_id)
+
+    with get_db_session() as db:
+        # Get the script content
+        script_content, script_title = _get_script_content(db, script_uuid)
+
+    # Create generation job
+    generation_options = media_options or {}
+    generation_options.update({
+        "script_id": script_uuid,
+        "session_id": session_id,
+        "duration": generation_options.get("duration", 180),
+        "resolution": generation_options.get("resolution", "1920x1080"),
+        "quality": generation_options.get("quality", "high"),
+        "include_audio": generation_options.get("include_audio", True)
+    })
+
+    if job_uuid is None:
+        job_uuid = video_service.create_generation_job(
+            script_id=script_uuid,
             session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
+            options=generation_options
         )
-        task_queue.update_task_status(task_id, TaskStatus.FAILED, error_message=error_msg)
-    except Exception as cleanup_error:
-        logger.error(f"Failed to cleanup task {task_id}: {cleanup_error}")
\ No newline at end of file
+
+    # Progress: Analyzing script content
+    progress(15, "Analyzing script content for media requirements")
+
+    # Generate real media assets
+    progress(35, "Generating background images and visual assets")
+
+    # Assets are organized by type for the result as they are generated
+    assets = []
+    assets_by_type = {bucket: [] for bucket in ASSET_TYPE_BUCKETS.values()}
+
+    for asset in video_service.asset_generator.iter_asset_models_for_job(
+        job_uuid, script_content, generation_options
+    ):
+        assets.append(asset)
+        asset_data = video_service.asset_generator.asset_to_dict(asset)
+        bucket = ASSET_TYPE_BUCKETS.get(asset_data["asset_type"])
+        if bucket:
+            assets_by_type[bucket].append(asset_data)
+
+        if bucket == "audio_tracks" and len(assets_by_type[bucket]) == 1:
+            progress(60, "Creating audio tracks and voiceovers")
+        elif len(assets) % ASSET_PROGRESS_INTERVAL == 0:
+            progress(35, f"Generated {len(assets)} media assets")
+
+    result = {
+        "status": "success",
+        "script_id": script_id,
+        "script_title": script_title,
+        "job_id": str(job_uuid),
+        "media_assets": assets_by_type,
+        "total_assets": len(assets),
+        "estimated_duration": generation_options["duration"],
+        "generated_at": datetime.now().isoformat()
+    }
+
+    return result, assets, generation_options, job_uuid
+
+
+def _compose_assets(
+    db,
+    job_uuid: uuid.UUID,
+    assets: List[Any],
+    options: Dict[str, Any],
+    progress: Callable[[int, str], None]
+) -> Dict[str, Any]:
+    """
+    Compose a job's assets into the final video and record it as a GeneratedVideo.
+
+    Returns:
+        Dictionary with final video information
+    """
+    video_service = get_video_generation_service()
+
+    # Progress: Compositing layers
+    progress(50, "Compositing video layers and effects")
+
+    # Progress: Rendering video
+    progress(80, "Rendering final video file using FFmpeg")
+
+    from ..models.generated_video import GeneratedVideo, GenerationStatusEnum as VideoStatus
+
+    video_id = uuid.uuid4()
+    filename = f"video_{video_id}.mp4"
+    file_path = f"/code/contentizer/backend/media/videos/{filename}"
+    creation_timestamp = datetime.now()
+
+    # Compose the actual video file first, so its record is written once, already complete
+    video_info = video_service.video_composer.compose_video_file_only(
+        assets, options, file_path, job_uuid
+    )
+
+    # The completion time is also the result's composed_at
+    completed_at = datetime.now()
+
+    generated_video = GeneratedVideo(
+        id=video_id,
+        file_path=file_path,
+        url_path=f"/media/videos/{filename}",
+        title=options.get("title", "Generated Video Content"),
+        duration=video_info.get("duration", options["duration"]),
+        resolution=options["resolution"],
+        format="mp4",
+        file_size=video_info.get("file_size", 0),
+        generation_status=VideoStatus.COMPLETED,
+        script_id=options["script_id"],
+        session_id=options["session_id"],
+        generation_job_id=job_uuid,
+        creation_timestamp=creation_timestamp,
+        completion_timestamp=completed_at
+    )
+
+    db.add(generated_video)
+    db.commit()
+
+    # Create result inside the session while generated_video is still attached
+    return {
+        "status": "success",
+        "video": {
+            "video_id": str(generated_video.id),
+            "title": generated_video.title,
+            "url": generated_video.url_path,
+            "duration": generated_video.duration,
+            "resolution": generated_video.resolution,
+            "file_size": generated_video.file_size,
+            "format": generated_video.format,
+            "file_path": generated_video.file_path
+        },
+        "job_id": str(job_uuid),
+        "composed_at": completed_at.isoformat()
+    }
+
+
+def _get_script_content(db, script_uuid: uuid.UUID) -> tuple[str, str]:
+    """Helper function to get script content and title."""
+    # Probe uploaded and generated scripts in one round trip; uploaded scripts win if both match
+    uploaded = select(
+        UploadedScript.content,
+        func.coalesce(UploadedScript.file_name, "Uploaded Script").label("title"),
+        literal_column("0").label("priority")
+    ).where(UploadedScript.id == script_uuid)
+
+    generated = select(
+        VideoScript.content,
+        VideoScript.title,
+        literal_column("1").label("priority")
+    ).where(VideoScript.id == script_uuid)
+
+    scripts = union_all(uploaded, generated).subquery()
+    row = db.execute(
+        select(scripts.c.content, scripts.c.title).order_by(scripts.c.priority).limit(1)
+    ).first()
+
+    if row is None:
+        raise ValueError(f"Script {script_uuid} not found")
+
+    return row.content, row.title
@@ -0,0 +1,113 @@
+"""
+Progress and outcome reporting shared by the Celery task modules.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional, Type
+
+from ..services.progress_service import get_progress_service, ProgressEventType
+from ..services.task_queue_service import get_task_queue_service
+
+logger = logging.getLogger(__name__)
+
+
+class TaskRun:
+    """Progress and completion reporting for one running task."""
+
+    def __init__(self, task_id: str, session_id: str, progress_service, task_queue):
+        self.task_id = task_id
+        self.session_id = session_id
+        self.progress_service = progress_service
+        self.task_queue = task_queue
+
+    def progress(self, percentage: int, message: str):
+        """Queue an intermediate progress event."""
+        self.progress_service.publish_progress_async(
+            session_id=self.session_id,
+            event_type=ProgressEventType.TASK_PROGRESS,
+            message=message,
+            percentage=percentage,
+            task_id=self.task_id
+        )
+
+    def complete(self, result: Dict[str, Any], message: str):
+        """Store the task result, then queue the completion event after it."""
+        if self.task_queue is not None:
+            self.task_queue.mark_completed(self.task_id, result=result)
+        self.progress_service.publish_progress_async(
+            session_id=self.session_id,
+            event_type=ProgressEventType.TASK_COMPLETED,
+            message=message,
+            percentage=100,
+            task_id=self.task_id
+        )
+
+
+@contextmanager
+def task_run(
+    task,
+    session_id: str,
+    start_message: str,
+    failure_prefix: str,
+    service_error: Optional[Type[Exception]] = None,
+    service_failure_prefix: Optional[str] = None,
+    mark_running: bool = False,
+    tracked: bool = True
+) -> Iterator[TaskRun]:
+    """
+    Report a task's start, progress and outcome.
+
+    The start event is queued with the task's first progress events, and the
+    completion event with its last ones, so each goes out in a shared Redis
+    pipeline rather than a round trip of its own. Failures are recorded on
+    the task and re-raised, using service_failure_prefix for service_error
+    exceptions. With mark_running the task record is set to running before
+    the start event; untracked tasks have no task record and only publish
+    progress events.
+    """
+    task_id = task.request.id
+    progress_service = get_progress_service()
+    task_queue = get_task_queue_service() if tracked else None
+
+    try:
+        if mark_running and task_queue is not None:
+            task_queue.mark_running(task_id, progress=0)
+
+        progress_service.publish_progress_async(
+            session_id=session_id,
+            event_type=ProgressEventType.TASK_STARTED,
+            message=start_message,
+            percentage=0,
+            task_id=task_id
+        )
+
+        yield TaskRun(task_id, session_id, progress_service, task_queue)
+
+    except Exception as e:
+        if service_error is not None and isinstance(e, service_error):
+            error_msg = f"{service_failure_prefix}: {str(e)}"
+        else:
+            error_msg = f"{failure_prefix}: {str(e)}"
+        logger.error(f"Task {task_id} failed: {error_msg}")
+        handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue)
+        raise
+    finally:
+        # Send anything still queued before the task returns
+        progress_service.flush_progress()
+
+
+def handle_task_failure(task_id, session_id, error_msg, progress_service, task_queue):
+    """Publish a task's failure and record it on the task, if it has a record."""
+    try:
+        # Queued progress goes out first so the failure is the last event seen
+        progress_service.flush_progress()
+        progress_service.publish_progress(
+            session_id=session_id,
+            event_type=ProgressEventType.TASK_FAILED,
+            message=error_msg,
+            task_id=task_id
+        )
+        if task_queue is not None:
+            task_queue.mark_failed(task_id, error_message=error_msg)
+    except Exception as cleanup_error:
+        logger.error(f"Failed to cleanup task {task_id}: {cleanup_error}")
@@ -10,10 +10,9 @@ import uuid
 from celery_worker import celery_app
 from ..services.script_service import ScriptService
 from ..services.gemini_service import GeminiService
-from ..services.progress_service import get_progress_service, ProgressEventType
-from ..services.task_queue_service import get_task_queue_service, TaskStatus
 from ..lib.database import get_db_session
 from ..models.video_script import VideoScript, InputSourceEnum, FormatTypeEnum
+from .reporting import task_run
 
 logger = logging.getLogger(__name__)
 
@@ -40,22 +39,14 @@ def generate_script_from_theme(
     Returns:
         Dictionary with generated script data
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-    task_queue = get_task_queue_service()
-
-    try:
-        # Update task status to running
-        task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=0)
-
-        # Publish start progress
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message=f"Starting script generation from theme: {theme_name}",
-            percentage=0,
-            task_id=task_id
-        )
+    with task_run(
+        self, session_id,
+        start_message=f"Starting script generation from theme: {theme_name}",
+        failure_prefix="Script generation failed",
+        mark_running=True
+    ) as run:
+        # Parse the theme id once, so a malformed id fails before any work is done
+        theme_uuid = uuid.UUID(theme_id) if theme_id else None
 
         # Initialize services
         with get_db_session() as db:
@@ -63,26 +54,14 @@ def generate_script_from_theme(
             script_service = ScriptService(db=db, gemini_service=gemini_service)
 
             # Progress: Analyzing theme
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Analyzing theme and preparing script structure",
-                percentage=20,
-                task_id=task_id
-            )
+            run.progress(20, "Analyzing theme and preparing script structure")
 
             # Generate script content (async call in sync task - design limitation)
             # For now, we'll create a mock script structure
-            logger.info(f"Generating script for theme {theme_name} in task {task_id}")
+            logger.info(f"Generating script for theme {theme_name} in task {run.task_id}")
 
             # Progress: Generating content
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Generating script content with AI",
-                percentage=50,
-                task_id=task_id
-            )
+            run.progress(50, "Generating script content with AI")
 
             # Mock script generation (would call script_service.generate_from_theme in real implementation)
             script_content = f"""# Video Script: {theme_name}
@@ -110,17 +89,11 @@ def generate_script_from_theme(
 """
 
             # Create script record with progress tracking
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Saving generated script",
-                percentage=80,
-                task_id=task_id
-            )
+            run.progress(80, "Saving generated script")
 
             script = VideoScript(
                 id=uuid.uuid4(),
-                theme_id=uuid.UUID(theme_id) if theme_id else None,
+                theme_id=theme_uuid,
                 title=f"Video Script: {theme_name}",
                 content=script_content,
                 estimated_duration=180,  # 3 minutes
@@ -146,35 +119,12 @@ def generate_script_from_theme(
                 "generated_at": datetime.now().isoformat()
             }
 
-            # Complete task
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_COMPLETED,
-                message=f"Script generated successfully for theme: {theme_name}",
-                percentage=100,
-                task_id=task_id
-            )
-
-            task_queue.update_task_status(task_id, TaskStatus.COMPLETED, progress=100, result=result)
+            # The result is stored before the completion event goes out
+            run.complete(result, f"Script generated successfully for theme: {theme_name}")
 
-            logger.info(f"Script generation task {task_id} completed for theme {theme_name}")
+            logger.info(f"Script generation task {run.task_id} completed for theme {theme_name}")
             return result
 
-    except Exception as e:
-        error_msg = f"Script generation failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-
-        # Publish error
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
-        )
-
-        task_queue.update_task_status(task_id, TaskStatus.FAILED, error_message=error_msg)
-        raise
-
 
 @celery_app.task(bind=True, name="script_tasks.generate_script_from_manual_subject")
 def generate_script_from_manual_subject(
@@ -194,40 +144,17 @@ def generate_script_from_manual_subject(
     Returns:
         Dictionary with generated script data
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-    task_queue = get_task_queue_service()
-
-    try:
-        # Update task status to running
-        task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=0)
-
-        # Publish start progress
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message=f"Starting script generation for subject: {subject}",
-            percentage=0,
-            task_id=task_id
-        )
-
+    with task_run(
+        self, session_id,
+        start_message=f"Starting script generation for subject: {subject}",
+        failure_prefix="Manual script generation failed",
+        mark_running=True
+    ) as run:
         with get_db_session() as db:
             # Progress updates
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Analyzing subject and preparing content structure",
-                percentage=25,
-                task_id=task_id
-            )
+            run.progress(25, "Analyzing subject and preparing content structure")
 
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Generating script content with AI",
-                percentage=60,
-                task_id=task_id
-            )
+            run.progress(60, "Generating script content with AI")
 
             # Mock script generation for manual subject
             script_content = f"""# Video Script: {subject}
@@ -255,13 +182,7 @@ def generate_script_from_manual_subject(
 """
 
             # Create script record
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Saving generated script",
-                percentage=85,
-                task_id=task_id
-            )
+            run.progress(85, "Saving generated script")
 
             script = VideoScript(
                 id=uuid.uuid4(),
@@ -291,35 +212,12 @@ def generate_script_from_manual_subject(
                 "generated_at": datetime.now().isoformat()
             }
 
-            # Complete task
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_COMPLETED,
-                message=f"Script generated successfully for subject: {subject}",
-                percentage=100,
-                task_id=task_id
-            )
-
-            task_queue.update_task_status(task_id, TaskStatus.COMPLETED, progress=100, result=result)
+            # The result is stored before the completion event goes out
+            run.complete(result, f"Script generated successfully for subject: {subject}")
 
-            logger.info(f"Manual script generation task {task_id} completed for subject {subject}")
+            logger.info(f"Manual script generation task {run.task_id} completed for subject {subject}")
             return result
 
-    except Exception as e:
-        error_msg = f"Manual script generation failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-
-        # Publish error
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
-        )
-
-        task_queue.update_task_status(task_id, TaskStatus.FAILED, error_message=error_msg)
-        raise
-
 
 @celery_app.task(bind=True, name="script_tasks.validate_and_optimize_script")
 def validate_and_optimize_script(
@@ -339,32 +237,22 @@ def validate_and_optimize_script(
     Returns:
         Dictionary with optimization results
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-
-    try:
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message="Starting script validation and optimization",
-            percentage=0,
-            task_id=task_id
-        )
+    with task_run(
+        self, session_id,
+        start_message="Starting script validation and optimization",
+        failure_prefix="Script validation failed",
+        tracked=False
+    ) as run:
+        script_uuid = uuid.UUID(script_id)
 
         with get_db_session() as db:
             # Get script
-            script = db.query(VideoScript).filter(VideoScript.id == uuid.UUID(script_id)).first()
+            script = db.query(VideoScript).filter(VideoScript.id == script_uuid).first()
             if not script:
                 raise ValueError(f"Script {script_id} not found")
 
             # Validate script structure
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message="Validating script structure and content",
-                percentage=30,
-                task_id=task_id
-            )
+            run.progress(30, "Validating script structure and content")
 
             # Mock validation results
             validation_results = {
@@ -380,13 +268,7 @@ def validate_and_optimize_script(
 
             # Apply optimizations if requested
             if optimization_options:
-                progress_service.publish_progress(
-                    session_id=session_id,
-                    event_type=ProgressEventType.TASK_PROGRESS,
-                    message="Applying optimization suggestions",
-                    percentage=70,
-                    task_id=task_id
-                )
+                run.progress(70, "Applying optimization suggestions")
 
             result = {
                 "status": "success",
@@ -396,26 +278,7 @@ def validate_and_optimize_script(
                 "validated_at": datetime.now().isoformat()
             }
 
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_COMPLETED,
-                message="Script validation and optimization completed",
-                percentage=100,
-                task_id=task_id
-            )
+            run.complete(result, "Script validation and optimization completed")
 
-            logger.info(f"Script validation task {task_id} completed for script {script_id}")
+            logger.info(f"Script validation task {run.task_id} completed for script {script_id}")
             return result
-
-    except Exception as e:
-        error_msg = f"Script validation failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
-        )
-
-        raise
\ No newline at end of file
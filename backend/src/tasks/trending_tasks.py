@@ -8,11 +8,10 @@ from datetime import datetime
 
 from celery_worker import celery_app
 from ..services.youtube_service import YouTubeService
-from ..services.progress_service import get_progress_service, ProgressEventType
-from ..services.task_queue_service import get_task_queue_service, TaskStatus
 from ..lib.database import get_db_session
 from ..models.trending_content import TrendingContent
 from ..models.generated_theme import GeneratedTheme
+from .reporting import task_run
 
 logger = logging.getLogger(__name__)
 
@@ -37,47 +36,24 @@ def analyze_trending_content(
     Returns:
         Dictionary with analysis results and extracted themes
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-    task_queue = get_task_queue_service()
-
-    try:
-        # Update task status to running
-        task_queue.update_task_status(task_id, TaskStatus.RUNNING, progress=0)
-
-        # Publish start progress
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message=f"Starting trending analysis for {timeframe} timeframe",
-            percentage=0,
-            task_id=task_id
-        )
-
+    with task_run(
+        self, session_id,
+        start_message=f"Starting trending analysis for {timeframe} timeframe",
+        failure_prefix="Trending analysis failed",
+        mark_running=True
+    ) as run:
         # Initialize YouTube service
-        logger.info(f"Initializing YouTube service for task {task_id}")
+        logger.info(f"Initializing YouTube service for task {run.task_id}")
         youtube_service = YouTubeService(youtube_api_key)
 
         # Validate API key
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_PROGRESS,
-            message="Validating YouTube API key",
-            percentage=10,
-            task_id=task_id
-        )
+        run.progress(10, "Validating YouTube API key")
 
         # Note: validate_api_key is async but Celery tasks are sync
         # For now, we'll proceed without validation
 
         # Get trending videos by categories
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_PROGRESS,
-            message="Fetching trending videos by categories",
-            percentage=25,
-            task_id=task_id
-        )
+        run.progress(25, "Fetching trending videos by categories")
 
         # Note: YouTube service methods are async, but Celery tasks are sync
         # This is a design limitation we need to address
@@ -105,13 +81,7 @@ def analyze_trending_content(
         ]
 
         # Store results in database
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_PROGRESS,
-            message="Storing analysis results",
-            percentage=80,
-            task_id=task_id
-        )
+        run.progress(80, "Storing analysis results")
 
         with get_db_session() as db:
             # Store trending content and themes
@@ -142,36 +112,12 @@ def analyze_trending_content(
             "analyzed_at": datetime.now().isoformat()
         }
 
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_COMPLETED,
-            message="Trending analysis completed successfully",
-            percentage=100,
-            task_id=task_id
-        )
-
-        task_queue.update_task_status(task_id, TaskStatus.COMPLETED, progress=100, result=result)
+        # The result is stored before the completion event goes out
+        run.complete(result, "Trending analysis completed successfully")
 
-        logger.info(f"Trending analysis task {task_id} completed successfully")
+        logger.info(f"Trending analysis task {run.task_id} completed successfully")
         return result
 
-    except Exception as e:
-        error_msg = f"Trending analysis failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-
-        # Publish error
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
-        )
-
-        task_queue.update_task_status(task_id, TaskStatus.FAILED, error_message=error_msg)
-
-        # Re-raise for Celery
-        raise
-
 
 @celery_app.task(bind=True, name="trending_tasks.extract_themes_from_videos")
 def extract_themes_from_videos(
@@ -191,31 +137,19 @@ def extract_themes_from_videos(
     Returns:
         Dictionary with extracted themes by category
     """
-    task_id = self.request.id
-    progress_service = get_progress_service()
-
-    try:
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_STARTED,
-            message="Starting theme extraction from videos",
-            percentage=0,
-            task_id=task_id
-        )
-
+    with task_run(
+        self, session_id,
+        start_message="Starting theme extraction from videos",
+        failure_prefix="Theme extraction failed",
+        tracked=False
+    ) as run:
         themes_by_category = {}
         total_categories = len(videos_by_category)
 
         for i, (category_name, videos) in enumerate(videos_by_category.items()):
             progress = int((i / total_categories) * 90)
 
-            progress_service.publish_progress(
-                session_id=session_id,
-                event_type=ProgressEventType.TASK_PROGRESS,
-                message=f"Extracting themes from {category_name} videos",
-                percentage=progress,
-                task_id=task_id
-            )
+            run.progress(progress, f"Extracting themes from {category_name} videos")
 
             # Mock theme extraction (would use AI service in real implementation)
             mock_themes = []
@@ -231,30 +165,11 @@ def extract_themes_from_videos(
 
         result = themes_by_category
 
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_COMPLETED,
-            message="Theme extraction completed successfully",
-            percentage=100,
-            task_id=task_id
-        )
+        run.complete(result, "Theme extraction completed successfully")
 
-        logger.info(f"Theme extraction task {task_id} completed")
+        logger.info(f"Theme extraction task {run.task_id} completed")
         return result
 
-    except Exception as e:
-        error_msg = f"Theme extraction failed: {str(e)}"
-        logger.error(f"Task {task_id} failed: {error_msg}")
-
-        progress_service.publish_progress(
-            session_id=session_id,
-            event_type=ProgressEventType.TASK_FAILED,
-            message=error_msg,
-            task_id=task_id
-        )
-
-        raise
-
 
 @celery_app.task(bind=True, name="trending_tasks.cleanup_old_trending_data")
 def cleanup_old_trending_data(self, days_to_keep: int = 30) -> Dict[str, Any]:
@@ -288,4 +203,4 @@ def cleanup_old_trending_data(self, days_to_keep: int = 30) -> Dict[str, Any]:
     except Exception as e:
         error_msg = f"Trending data cleanup failed: {str(e)}"
         logger.error(f"Task {task_id} failed: {error_msg}")
-        raise
\ No newline at end of file
+        raise
@@ -0,0 +1,73 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services import progress_service as progress_module
+from src.services.progress_service import ProgressService, ProgressEventType
+
+
+class FakePipeline:
+    """Records pipelined commands and counts executions"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args))
+
+    def execute(self, raise_on_error=True):
+        self.client.executed.append(self.commands)
+        return [True] * len(self.commands)
+
+
+class FakeClient:
+    def __init__(self):
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class TestProgressBatching:
+    """Unit tests for batched progress publishing"""
+
+    @pytest.fixture
+    def service(self):
+        client = FakeClient()
+        with patch("src.lib.redis.get_redis_client", return_value=client), \
+                patch.object(progress_module, "get_redis_client", return_value=client), \
+                patch.object(progress_module, "PROGRESS_FLUSH_INTERVAL", 60):
+            yield ProgressService()
+
+    def test_queued_events_flush_in_one_pipeline(self, service):
+        """Events queued in one window are sent with a single round trip, in order"""
+        first = service.publish_progress_async("s1", ProgressEventType.TASK_STARTED, "start", 0, task_id="t1")
+        second = service.publish_progress_async("s1", ProgressEventType.TASK_PROGRESS, "half", 50, task_id="t1")
+
+        assert service.client.executed == []
+        assert service.flush_progress() == 2
+
+        assert len(service.client.executed) == 1
+        published = [
+            json.loads(args[1])["event_id"]
+            for name, args in service.client.executed[0] if name == "publish"
+        ]
+        assert published == [first, second]
+
+    def test_flush_with_nothing_queued_sends_nothing(self, service):
+        """Flushing an empty queue does not touch Redis"""
+        assert service.flush_progress() == 0
+        assert service.client.executed == []
+
+    def test_publish_progress_is_one_round_trip(self, service):
+        """A synchronous event is stored, published and logged in a single pipeline"""
+        event_id = service.publish_progress("s1", ProgressEventType.TASK_FAILED, "boom", task_id="t1")
+
+        assert len(service.client.executed) == 1
+        commands = [name for name, _ in service.client.executed[0]]
+        assert commands == ["setex", "publish", "lpush", "ltrim", "expire"]
+        assert service.client.executed[0][0][1][0].endswith(event_id)
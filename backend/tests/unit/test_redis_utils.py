@@ -0,0 +1,35 @@
+from datetime import datetime, timezone, timedelta
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.lib.redis import chunked, utc_now_iso
+
+
+class TestRedisUtils:
+    """Unit tests for Redis helper utilities"""
+
+    def test_utc_now_iso_matches_datetime_isoformat(self):
+        """Timestamp parses as an aware UTC datetime close to now"""
+        before = datetime.now(timezone.utc)
+        timestamp = utc_now_iso()
+        after = datetime.now(timezone.utc)
+
+        parsed = datetime.fromisoformat(timestamp)
+
+        assert parsed.tzinfo is not None
+        assert parsed.utcoffset() == timedelta(0)
+        assert before - timedelta(seconds=1) <= parsed <= after
+        assert timestamp.endswith("+00:00")
+
+    def test_utc_now_iso_is_monotonic_within_second(self):
+        """Cached second prefix never produces timestamps going backwards"""
+        timestamps = [utc_now_iso() for _ in range(1000)]
+
+        assert timestamps == sorted(timestamps)
+        assert all(len(ts) == len("2025-01-01T00:00:00.000000+00:00") for ts in timestamps)
+
+    def test_chunked_splits_into_fixed_size_batches(self):
+        """Batches keep order and the final batch holds the remainder"""
+        assert list(chunked(iter(range(7)), 3)) == [[0, 1, 2], [3, 4, 5], [6]]
+        assert list(chunked([], 3)) == []
@@ -0,0 +1,40 @@
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.storage_manager import StorageManager
+
+
+class TestExpiredFileCleanup:
+    """Unit tests for expired file removal in a storage directory"""
+
+    @pytest.fixture
+    def manager(self, tmp_path):
+        return StorageManager(base_path=tmp_path / "media")
+
+    def test_only_expired_files_are_removed(self, manager, tmp_path):
+        """Files past the policy age are unlinked and counted; recent ones stay"""
+        directory = tmp_path / "videos"
+        (directory / "nested").mkdir(parents=True)
+        for name in ("old_a.mp4", "nested/old_b.mp4", "new.mp4"):
+            (directory / name).write_bytes(b"x" * 8)
+        for name in ("old_a.mp4", "nested/old_b.mp4"):
+            os.utime(directory / name, (0, 0))
+
+        storage = MagicMock(cleanup_policy={"max_age_days": 1}, directory_path=str(directory))
+        result = manager._cleanup_storage_directory(storage)
+
+        assert result == {"files_removed": 2, "bytes_freed": 16}
+        assert sorted(p.name for p in directory.rglob("*") if p.is_file()) == ["new.mp4"]
+
+    def test_bulk_unlink_skips_missing_files(self, manager, tmp_path):
+        """Files already gone are not counted as removed"""
+        present = tmp_path / "present.bin"
+        present.write_bytes(b"x" * 4)
+
+        removed = manager._bulk_unlink([(present, 4), (tmp_path / "missing.bin", 9)])
+
+        assert removed == (1, 4)
+        assert not present.exists()
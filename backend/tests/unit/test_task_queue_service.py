@@ -0,0 +1,49 @@
+import pytest
+import json
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.task_queue_service import TaskQueueService
+
+
+class TestTaskQueueService:
+    """Unit tests for task record encoding"""
+
+    @pytest.fixture
+    def large_result(self):
+        return {
+            "assets": [
+                {"file_path": f"/media/images/scene_{i:03d}.png", "prompt": "A detailed scene prompt " * 4}
+                for i in range(40)
+            ]
+        }
+
+    def test_small_payloads_stored_as_plain_json(self):
+        """Records under the threshold are stored unchanged"""
+        record = {"task_id": "t1", "status": "pending", "input_data": {"theme": "cats"}, "result": None}
+
+        raw = TaskQueueService._serialize_json(record)
+
+        assert json.loads(raw) == record
+        assert TaskQueueService._deserialize_json(raw) == record
+
+    def test_large_payloads_round_trip_compressed(self, large_result):
+        """Oversized payload fields are compressed but keep filterable fields readable"""
+        record = {"task_id": "t2", "status": "completed", "input_data": {}, "result": large_result}
+
+        raw = TaskQueueService._serialize_json(record)
+        stored = json.loads(raw)
+
+        assert len(raw) < len(json.dumps(record))
+        assert stored["status"] == "completed"
+        assert "__zstd__" in stored["result"]
+        assert TaskQueueService._deserialize_json(raw) == record
+
+    def test_serialize_does_not_mutate_record(self, large_result):
+        """Compression works on a copy of the record"""
+        record = {"task_id": "t3", "status": "completed", "result": large_result}
+
+        TaskQueueService._serialize_json(record)
+
+        assert record["result"] is large_result
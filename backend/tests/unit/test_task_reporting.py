@@ -0,0 +1,97 @@
+import pytest
+import sys
+import os
+from unittest.mock import MagicMock, patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+import src.tasks.reporting as reporting
+from src.services.progress_service import ProgressEventType
+
+
+class TestTaskRun:
+    """Unit tests for the shared task start/finish reporting"""
+
+    @pytest.fixture
+    def services(self):
+        progress_service = MagicMock()
+        task_queue = MagicMock()
+        calls = MagicMock()
+        calls.attach_mock(progress_service.publish_progress_async, "publish")
+        calls.attach_mock(task_queue.mark_completed, "mark_completed")
+        with patch.object(reporting, "get_progress_service", return_value=progress_service), \
+             patch.object(reporting, "get_task_queue_service", return_value=task_queue):
+            yield progress_service, task_queue, calls
+
+    def _run(self, **options):
+        return reporting.task_run(
+            MagicMock(request=MagicMock(id="task-1")), "session-1",
+            start_message="Starting",
+            failure_prefix="Step failed",
+            service_error=KeyError,
+            service_failure_prefix="Service failed",
+            **options
+        )
+
+    def test_completion_event_follows_stored_result(self, services):
+        """The result is stored before the completion event is queued, and everything is flushed"""
+        progress_service, task_queue, calls = services
+
+        with self._run() as run:
+            run.progress(50, "Halfway")
+            run.complete({"status": "success"}, "Done")
+
+        event_types = [
+            call_kwargs["event_type"] for name, _, call_kwargs in calls.mock_calls if name == "publish"
+        ]
+        assert event_types == [
+            ProgressEventType.TASK_STARTED, ProgressEventType.TASK_PROGRESS, ProgressEventType.TASK_COMPLETED
+        ]
+        assert [name for name, _, _ in calls.mock_calls][-2:] == ["mark_completed", "publish"]
+        progress_service.flush_progress.assert_called()
+
+    def test_failure_is_recorded_and_reraised(self, services):
+        """Errors mark the task failed with the task's prefix and propagate"""
+        progress_service, task_queue, _ = services
+
+        with pytest.raises(RuntimeError):
+            with self._run():
+                raise RuntimeError("boom")
+
+        task_queue.mark_failed.assert_called_once_with("task-1", error_message="Step failed: boom")
+        task_queue.mark_completed.assert_not_called()
+
+    def test_service_errors_use_service_prefix(self, services):
+        """Exceptions of the service error type are reported with the service prefix"""
+        _, task_queue, _ = services
+
+        with pytest.raises(KeyError):
+            with self._run():
+                raise KeyError("missing")
+
+        task_queue.mark_failed.assert_called_once_with("task-1", error_message="Service failed: 'missing'")
+
+    def test_mark_running_before_start_event(self, services):
+        """With mark_running the task record is set running before the start event"""
+        _, task_queue, calls = services
+        calls.attach_mock(task_queue.mark_running, "mark_running")
+
+        with self._run(mark_running=True):
+            pass
+
+        assert [name for name, _, _ in calls.mock_calls][:2] == ["mark_running", "publish"]
+        task_queue.mark_running.assert_called_once_with("task-1", progress=0)
+
+    def test_untracked_task_only_publishes_events(self, services):
+        """Untracked tasks publish progress but never touch a task record"""
+        progress_service, task_queue, _ = services
+
+        with self._run(tracked=False) as run:
+            run.complete({"status": "success"}, "Done")
+
+        with pytest.raises(RuntimeError):
+            with self._run(tracked=False):
+                raise RuntimeError("boom")
+
+        task_queue.mark_completed.assert_not_called()
+        task_queue.mark_failed.assert_not_called()
+        progress_service.publish_progress.assert_called_once()
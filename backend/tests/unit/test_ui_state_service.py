@@ -0,0 +1,85 @@
+import pytest
+import sys
+import os
+import json
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.ui_state_service import UIStateService
+
+
+class FakePipeline:
+    """Runs reads immediately and buffers writes until execute, like a WATCHed pipeline"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def get(self, key):
+        return self.client.data.get(key)
+
+    def multi(self):
+        pass
+
+    def setex(self, key, ttl, value):
+        self.commands.append(lambda: self.client.data.__setitem__(key, value) or True)
+
+    def sadd(self, key, member):
+        self.commands.append(lambda: self.client.sets.setdefault(key, set()).add(member) or 1)
+
+    def expire(self, key, ttl):
+        self.commands.append(lambda: True)
+
+    def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeClient:
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+
+    def transaction(self, func, *watches):
+        pipe = FakePipeline(self)
+        func(pipe)
+        return pipe.execute()
+
+
+class TestSaveFormData:
+    """Unit tests for form data autosave"""
+
+    @pytest.fixture
+    def service(self):
+        with patch("src.lib.redis.get_redis_client", return_value=FakeClient()):
+            yield UIStateService()
+
+    def test_autosave_leaves_other_state_untouched(self, service):
+        """Merging form fields keeps empty arrays and large integers elsewhere in the record"""
+        key = service._make_key("s1:editor")
+        service.client.data[key] = json.dumps({
+            "session_id": "s1",
+            "component_name": "editor",
+            "state_data": {"selected": [], "revision": 12345678901234567},
+            "form_data": {"title": "old", "tags": []},
+            "metadata": {"history": []},
+            "created_at": "2026-01-01T00:00:00+00:00",
+            "updated_at": "2026-01-01T00:00:00+00:00"
+        })
+
+        assert service.save_form_data("s1", "editor", {"title": "new"})
+
+        stored = json.loads(service.client.data[key])
+        assert stored["state_data"] == {"selected": [], "revision": 12345678901234567}
+        assert stored["form_data"] == {"title": "new", "tags": []}
+        assert stored["metadata"] == {"history": []}
+        assert stored["created_at"] == "2026-01-01T00:00:00+00:00"
+        assert '"selected": []' in service.client.data[key]
+
+    def test_autosave_creates_missing_state(self, service):
+        """A first autosave stores a new record and registers it in the session index"""
+        assert service.save_form_data("s1", "editor", {"title": "draft"})
+
+        stored = json.loads(service.client.data[service._make_key("s1:editor")])
+        assert stored["form_data"] == {"title": "draft"}
+        assert stored["state_data"] == {}
+        assert service.client.sets[service._session_index_key("s1")] == {"editor"}
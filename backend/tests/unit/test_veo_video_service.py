@@ -0,0 +1,190 @@
+import pytest
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.veo_video_service import VeoResultCache, VeoVideoService, _ProgressDispatcher
+
+
+class TestVeoResultCache:
+    """Unit tests for the Veo generation result cache"""
+
+    @pytest.fixture
+    def config(self):
+        return {"model": "veo-3.0-generate-preview", "aspectRatio": "16:9",
+                "personGeneration": "allow_adult", "negativePrompt": None}
+
+    @pytest.fixture
+    def video_result(self, tmp_path):
+        video_path = tmp_path / "veo3_abc.mp4"
+        video_path.write_bytes(b"video")
+        return {"video_path": str(video_path), "status": "completed", "generation_metadata": {"estimated_cost": 1.60}}
+
+    def test_repeated_prompt_hits_cache(self, tmp_path, config, video_result):
+        """Prompts differing only in case, punctuation and spacing reuse the stored result"""
+        cache = VeoResultCache(tmp_path)
+        cache.store("A red fox running through a snowy forest at dawn", config, video_result)
+
+        hit = cache.lookup("  a red fox running through a snowy forest, at dawn.", config)
+
+        assert hit == video_result
+        assert hit is not video_result
+
+    def test_different_prompt_or_config_misses(self, tmp_path, config, video_result):
+        """Dissimilar prompts and mismatched configs are not served from cache"""
+        cache = VeoResultCache(tmp_path)
+        cache.store("A red fox running through a snowy forest at dawn", config, video_result)
+
+        assert cache.lookup("A city skyline timelapse at night", config) is None
+        assert cache.lookup("A red fox running through a snowy forest at dawn",
+                            {**config, "aspectRatio": "9:16"}) is None
+
+    def test_reworded_prompt_misses(self, tmp_path, config, video_result):
+        """Swapped or changed words are different videos and never hit the cache"""
+        cache = VeoResultCache(tmp_path)
+        cache.store("a dog chasing a cat", config, video_result)
+        cache.store("A lone sailboat drifting across a calm turquoise bay "
+                    "under a vivid orange sunset sky", config, video_result)
+
+        assert cache.lookup("a cat chasing a dog", config) is None
+        assert cache.lookup("A lone sailboat drifting across a calm turquoise bay "
+                            "under a vivid orange sunrise sky", config) is None
+
+    def test_missing_video_file_is_dropped(self, tmp_path, config, video_result):
+        """Entries whose video was deleted are evicted on lookup"""
+        cache = VeoResultCache(tmp_path)
+        cache.store("A red fox in the snow", config, video_result)
+        os.remove(video_result["video_path"])
+
+        assert cache.lookup("A red fox in the snow", config) is None
+        assert VeoResultCache(tmp_path).lookup("A red fox in the snow", config) is None
+
+    def test_evicts_least_recently_used(self, tmp_path, config, video_result):
+        """Cache keeps at most max_entries, dropping the least recently used"""
+        cache = VeoResultCache(tmp_path, max_entries=2)
+        cache.store("first prompt about mountains", config, video_result)
+        cache.store("second prompt about oceans", config, video_result)
+        cache.lookup("first prompt about mountains", config)
+        cache.store("third prompt about deserts", config, video_result)
+
+        reloaded = VeoResultCache(tmp_path, max_entries=2)
+        assert reloaded.lookup("first prompt about mountains", config) is not None
+        assert reloaded.lookup("second prompt about oceans", config) is None
+        assert reloaded.lookup("third prompt about deserts", config) is not None
+
+    def test_separate_instances_keep_each_others_entries(self, tmp_path, config, video_result):
+        """Caches opened by different workers on one directory do not overwrite each other"""
+        first = VeoResultCache(tmp_path)
+        second = VeoResultCache(tmp_path)
+        first.lookup("warm up before the other worker writes", config)
+
+        second.store("A red fox in the snow", config, video_result)
+        first.store("A city skyline timelapse at night", config, video_result)
+        first.lookup("A city skyline timelapse at night", config)
+
+        assert first.lookup("A red fox in the snow", config) == video_result
+        assert second.lookup("A city skyline timelapse at night", config) == video_result
+        assert not list(tmp_path.glob("*.tmp"))
+
+
+class TestVeoVideoServiceMockMode:
+    """Unit tests for mock-mode generation"""
+
+    def test_mock_generation_skips_simulated_latency_under_pytest(self):
+        """Mock generation returns immediately in tests instead of sleeping ~20s"""
+        service = VeoVideoService(api_key="test-key")
+
+        start = time.monotonic()
+        result = service.generate_video({"prompt": "A cat surfing a wave", "duration": 8})
+
+        assert time.monotonic() - start < 1
+        assert result["status"] == "completed"
+        assert result["generation_metadata"]["provider"] == "google_veo_mock"
+
+
+class TestVeoVideoServiceBatch:
+    """Unit tests for concurrent Veo generation"""
+
+    @pytest.mark.asyncio
+    async def test_generate_videos_batch_runs_concurrently_in_order(self):
+        """Batch results keep request order and respect max_concurrency"""
+        service = VeoVideoService(api_key="real-key")
+        in_flight = {"now": 0, "peak": 0}
+
+        async def fake_call(generation_request):
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return {"video_path": f"/videos/{generation_request['prompt']}.mp4", "status": "completed"}
+
+        with patch.object(service, "_call_veo_api_async", side_effect=fake_call):
+            results = await service.generate_videos_batch(
+                [{"prompt": f"scene{i}", "duration": 8} for i in range(6)], max_concurrency=3
+            )
+
+        assert [r["video_path"] for r in results] == [f"/videos/scene{i}.mp4" for i in range(6)]
+        assert in_flight["peak"] == 3
+
+
+class TestProgressDispatcher:
+    """Unit tests for background progress delivery"""
+
+    def test_delivers_events_in_order_despite_failing_callback(self):
+        """Events reach callbacks in submission order; a raising callback does not stop delivery"""
+        dispatcher = _ProgressDispatcher()
+        received = []
+        done = threading.Event()
+
+        def record(event):
+            received.append(event["stage"])
+            if len(received) == 12:
+                done.set()
+
+        def fail(event):
+            raise RuntimeError("callback down")
+
+        for i in range(6):
+            dispatcher.submit(record, {"stage": f"s{i}"})
+        dispatcher.submit(fail, {"stage": "broken"})
+        for i in range(6, 12):
+            dispatcher.submit(record, {"stage": f"s{i}"})
+
+        assert done.wait(timeout=2)
+        assert received == [f"s{i}" for i in range(12)]
+
+    def test_flush_delivers_pending_events_before_returning(self):
+        """flush hands every queued event to its callback on the calling thread"""
+        dispatcher = _ProgressDispatcher()
+        received = []
+
+        for i in range(3):
+            dispatcher.submit(received.append, {"stage": f"s{i}"})
+        dispatcher.flush()
+
+        assert [event["stage"] for event in received] == ["s0", "s1", "s2"]
+
+    def test_full_queue_is_delivered_not_dropped(self):
+        """Submitting past max_pending delivers the backlog instead of discarding old events"""
+        dispatcher = _ProgressDispatcher(max_pending=5)
+        received = []
+
+        for i in range(20):
+            dispatcher.submit(received.append, {"stage": f"s{i}"})
+        dispatcher.flush()
+
+        assert [event["stage"] for event in received] == [f"s{i}" for i in range(20)]
+
+    def test_generate_video_delivers_progress_before_returning(self):
+        """Every progress event has reached the callback when generate_video returns"""
+        service = VeoVideoService(api_key="test-key")
+        stages = []
+
+        service.generate_video({"prompt": "A cat surfing a wave", "duration": 8},
+                               progress_callback=lambda event: stages.append(event["stage"]))
+
+        assert stages == ["initializing_video_generation", "processing_video_prompt", "generating_video"]
@@ -0,0 +1,58 @@
+import pytest
+import sys
+import os
+import uuid
+from unittest.mock import patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.video_composer import VideoComposer
+
+
+class FakeClient:
+    """Key/value store standing in for the Redis instance shared by worker and API"""
+
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, ex=None, xx=False):
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def delete(self, key):
+        return int(self.data.pop(key, None) is not None)
+
+
+class TestCompositionProgress:
+    """Unit tests for composition progress shared through Redis"""
+
+    @pytest.fixture
+    def client(self):
+        client = FakeClient()
+        with patch("src.lib.redis.get_redis_client", return_value=client), \
+                patch("src.services.video_composer.StorageManager"):
+            yield client
+
+    def test_progress_is_visible_to_another_composer(self, client):
+        """Stats reported by the worker's composer are read by a separate instance"""
+        job_id = uuid.uuid4()
+        report = VideoComposer()._progress_reporter(job_id, 10.0, "Rendering visual track")
+
+        report({"out_time_us": 2_500_000, "speed": 2.0, "progress": "continue"})
+
+        progress = VideoComposer().get_composition_progress(job_id)
+        assert progress["progress_percentage"] == 25
+        assert progress["current_operation"] == "Rendering visual track"
+        assert progress["estimated_completion"] is not None
+
+    def test_unknown_job_reports_default_progress(self, client):
+        """A job without published stats reports the composition stage at 0%"""
+        progress = VideoComposer().get_composition_progress(uuid.uuid4())
+        assert progress["progress_percentage"] == 0
+        assert progress["estimated_completion"] is None
+
+    def test_no_reporter_without_job(self, client):
+        """Untracked compositions get no progress callback"""
+        assert VideoComposer()._progress_reporter(None, 10.0, "Rendering") is None
@@ -0,0 +1,86 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.video_compositor import VideoCompositor, VideoCompositorError, _StderrTail
+
+
+def python_cmd(script):
+    """Stand-in for an ffmpeg invocation that writes the given script's output."""
+    return [sys.executable, "-c", script]
+
+
+class TestVideoCompositorExecution:
+    """Unit tests for FFmpeg process execution"""
+
+    @pytest.fixture
+    def compositor(self):
+        return VideoCompositor()
+
+    def test_progress_lines_reported_in_seconds(self, compositor):
+        """out_time values are parsed from the progress stream and not kept as log output"""
+        script = (
+            "import sys\n"
+            "sys.stderr.write('Input #0, image2\\n')\n"
+            "sys.stderr.write('out_time_ms=1500000\\n')\n"
+            "sys.stderr.write('out_time_us=3000000\\n')\n"
+        )
+        reported = []
+
+        result = compositor._execute_ffmpeg(python_cmd(script), reported.append)
+
+        assert reported == [1.5, 3.0]
+        assert result["out_time"] == 3.0
+        assert result["stderr"] == "Input #0, image2\n"
+
+    def test_failure_reports_stderr_tail(self, compositor):
+        """Non-zero exit raises with the captured stderr"""
+        script = "import sys\nsys.stderr.write('Invalid data found\\n')\nsys.exit(1)\n"
+
+        with pytest.raises(VideoCompositorError, match="Invalid data found"):
+            compositor._execute_ffmpeg(python_cmd(script))
+
+    def test_stderr_tail_is_bounded(self):
+        """Only the most recent output is kept once the limit is exceeded"""
+        tail = _StderrTail(max_chars=10)
+
+        for i in range(100):
+            tail.append(f"line {i}\n")
+
+        assert tail.text() == "line 99\n"
+
+    def test_video_info_skips_probe_when_duration_known(self, compositor, tmp_path, monkeypatch):
+        """Size comes from stat() and ffprobe is not spawned when ffmpeg reported duration"""
+        video = tmp_path / "out.mp4"
+        video.write_bytes(b"\0" * 1024 * 1024)
+        monkeypatch.setattr("subprocess.run", lambda *a, **k: pytest.fail("ffprobe should not run"))
+
+        info = compositor._get_video_info(str(video), duration=12.5)
+
+        assert info == {"duration": 12.5, "size_mb": 1.0, "format": "mp4"}
+
+    def test_generated_scenes_read_from_lavfi_source(self, compositor):
+        """Generator-backed scenes render at the target size and rate, capped at the scene duration"""
+        timeline, counts = compositor._create_timeline({"assets": {"videos": [{"id": "v1", "duration": 4}]}})
+
+        cmd = compositor._build_segment_command(timeline[0], "seg.ts", "1280x720", 30)
+
+        assert counts["video"] == 1
+        assert cmd[cmd.index("-i") - 4:cmd.index("-i") + 2] == [
+            "-f", "lavfi", "-t", "4", "-i", f"{timeline[0].path}=size=1280x720:rate=30"
+        ]
+        assert "-vf" not in cmd
+
+    def test_timeline_is_built_in_start_time_order(self, compositor, monkeypatch):
+        """Scenes are laid out back to back, so no sort is needed after construction"""
+        monkeypatch.setattr(VideoCompositor, "mock_image_path", property(lambda self: "image.jpg"))
+        plan = {"assets": {
+            "images": [{"id": f"i{n}", "duration": 2.5} for n in range(3)],
+            "videos": [{"id": f"v{n}", "duration": 4} for n in range(2)]
+        }}
+
+        timeline, _ = compositor._create_timeline(plan)
+
+        assert [scene.id for scene in timeline] == ["i0", "i1", "i2", "v0", "v1"]
+        assert [scene.start_time for scene in timeline] == [0.0, 2.5, 5.0, 7.5, 11.5]
@@ -0,0 +1,89 @@
+import pytest
+import sys
+import os
+import uuid
+from datetime import datetime
+from unittest.mock import MagicMock
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from src.services.workflow_engine import WorkflowEngine
+from src.models.workflow import Workflow, WorkflowModeEnum, WorkflowStatusEnum
+
+
+class FakeCache:
+    """In-memory stand-in for the Redis progress cache"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get_json(self, key):
+        return self.store.get(key)
+
+    def set_json(self, key, data, ttl=None):
+        self.store[key] = data
+        return True
+
+
+class TestWorkflowProgressCache:
+    """Unit tests for versioned workflow progress caching"""
+
+    @pytest.fixture
+    def workflow(self):
+        return Workflow(
+            id=uuid.uuid4(),
+            mode=WorkflowModeEnum.GENERATE,
+            status=WorkflowStatusEnum.MODE_SELECTED,
+            skip_research=False,
+            skip_generation=False,
+            created_at=datetime(2025, 1, 1),
+            updated_at=datetime(2025, 1, 2)
+        )
+
+    @pytest.fixture
+    def engine(self, workflow):
+        session = MagicMock()
+        session.execute.return_value.first.return_value = (workflow.updated_at, None)
+        engine = WorkflowEngine(session)
+        engine._progress_cache = FakeCache()
+        engine.workflow_service.get_workflow = MagicMock(return_value=workflow)
+        return engine
+
+    def test_repeated_polls_are_served_from_cache(self, engine, workflow):
+        """Only the first poll loads the workflow while its version is unchanged"""
+        first = engine.get_workflow_progress(str(workflow.id))
+        second = engine.get_workflow_progress(str(workflow.id))
+
+        assert engine.workflow_service.get_workflow.call_count == 1
+        assert second == first
+
+    def test_new_version_misses_cache(self, engine, workflow):
+        """A changed updated_at stamp produces a new key, so the workflow is reloaded"""
+        engine.get_workflow_progress(str(workflow.id))
+        engine.db_session.execute.return_value.first.return_value = (datetime(2025, 1, 3), None)
+
+        engine.get_workflow_progress(str(workflow.id))
+
+        assert engine.workflow_service.get_workflow.call_count == 2
+
+    def test_missing_workflow_skips_load(self, engine):
+        """The version read alone reports a missing workflow"""
+        engine.db_session.execute.return_value.first.return_value = None
+
+        result = engine.get_workflow_progress(str(uuid.uuid4()))
+
+        assert result == {"success": False, "error": "Workflow not found"}
+        engine.workflow_service.get_workflow.assert_not_called()
+
+
+class TestWorkflowStepDispatch:
+    """Unit tests for workflow step dispatch"""
+
+    def test_unknown_step_rejected_without_loading_workflow(self):
+        """Steps no mode handles are refused before any database read"""
+        engine = WorkflowEngine(MagicMock())
+        engine.workflow_service.get_workflow = MagicMock()
+
+        result = engine.process_workflow_step(str(uuid.uuid4()), "not_a_step")
+
+        assert result == {"success": False, "error": "Unknown workflow step: not_a_step"}
+        engine.workflow_service.get_workflow.assert_not_called()
@@ -5,6 +5,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
+from src.services import youtube_service as youtube_service_module
 from src.services.youtube_service import YouTubeService
 
 
@@ -13,6 +14,7 @@ class TestYouTubeService:
 
     @pytest.fixture
     def youtube_service(self):
+        youtube_service_module._categories_cache.clear()
         return YouTubeService(api_key="test-api-key")
 
     @pytest.fixture
@@ -81,6 +83,47 @@ class TestYouTubeService:
                 assert 'view_count' in video
                 assert isinstance(video['view_count'], int)
 
+    async def test_category_fetch_failure_skips_only_that_category(self, youtube_service, mock_youtube_client):
+        """A failing category is dropped while the others are still returned in category order"""
+        from googleapiclient.errors import HttpError
+        good_response = mock_youtube_client.videos.return_value.list.return_value.execute.return_value
+
+        def execute_for(**kwargs):
+            request = Mock()
+            if kwargs['videoCategoryId'] == '10':
+                request.execute.side_effect = HttpError(Mock(status=403), b'quota')
+            else:
+                request.execute.return_value = good_response
+            return request
+
+        mock_youtube_client.videos.return_value.list.side_effect = execute_for
+        youtube_service.youtube = mock_youtube_client
+
+        result = await youtube_service.get_trending_videos_by_categories(max_results_per_category=2)
+
+        assert list(result) == ['Film & Animation', 'People & Blogs', 'Entertainment', 'News & Politics']
+        assert [video['id'] for video in result['Entertainment']] == ['video1', 'video2']
+        assert result['Entertainment'][1]['_tokens'] == ['another', 'test', 'video', 'another', 'test']
+
+    async def test_categories_cached_across_instances(self, youtube_service, mock_youtube_client):
+        """The category list is fetched once per region and reused until it expires"""
+        youtube_service.youtube = mock_youtube_client
+        other_service = YouTubeService(api_key="other-api-key")
+        other_service.youtube = mock_youtube_client
+
+        await youtube_service.get_trending_videos_by_categories(max_results_per_category=2)
+        await other_service.get_trending_videos_by_categories(max_results_per_category=2)
+
+        assert mock_youtube_client.videoCategories.return_value.list.call_count == 1
+
+        fetched_at, categories = youtube_service_module._categories_cache['US']
+        youtube_service_module._categories_cache['US'] = (
+            fetched_at - youtube_service_module.CATEGORIES_CACHE_TTL, categories
+        )
+        await youtube_service.get_trending_videos_by_categories(max_results_per_category=2)
+
+        assert mock_youtube_client.videoCategories.return_value.list.call_count == 2
+
     async def test_extract_themes_from_videos(self, youtube_service):
         """Test theme extraction from videos"""
         videos_by_category = {
@@ -139,6 +182,21 @@ class TestYouTubeService:
 
         assert result is False
 
+    async def test_theme_extraction_skips_filler_words(self, youtube_service):
+        """Common filler words never become themes, even when they are the most frequent"""
+        videos_by_category = {
+            'Gaming': [
+                {'id': f'video{i}', 'title': f'What happens with this speedrun {i}', 'tags': ['speedrun', 'minecraft']}
+                for i in range(3)
+            ]
+        }
+
+        result = await youtube_service.extract_themes_from_videos(videos_by_category)
+
+        themes = result['Gaming']
+        assert [theme['name'] for theme in themes] == ['Speedrun', 'Happens', 'Minecraft']
+        assert themes[0]['mention_count'] == 6
+
     async def test_empty_videos_handling(self, youtube_service):
         """Test handling of empty video lists"""
         empty_videos = {}